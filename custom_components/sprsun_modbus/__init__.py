@@ -1,62 +1,159 @@
 """SPRSUN Heat Pump Modbus Integration."""
+import asyncio
+import contextlib
 import logging
+import math
+import os
+import threading
+import time
 from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_NAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_NAME, Platform
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from pymodbus.client import ModbusTcpClient
 from pymodbus.exceptions import ModbusException
 
+from .codec import WORD_ORDER_BIG
+from .connection import CircuitBreaker, ModbusConnection, create_client, describe_endpoint
 from .const import (
     DOMAIN,
+    EVENT_FAULT,
     CONF_DEVICE_ADDRESS,
     CONF_SCAN_INTERVAL,
     CONF_CONTROLLER_TYPE,
+    CONF_WORD_ORDER,
+    CONF_IO_WORKER,
+    CONF_SNAPSHOT_FILE,
+    CONF_HISTORY_LOG,
+    CONF_STATISTICS_IMPORT,
+    CONF_DEADBAND,
+    DETECTED_DATA,
+    LIVE_OPTIONS,
+    BACKUP_DIR,
+    HISTORY_DIR,
     DEFAULT_SCAN_INTERVAL,
+    KEEPALIVE_IDLE,
+    KEEPALIVE_INTERVAL,
+    KEEPALIVE_ADDRESS,
+    STATE_MAX_GAP_POLLS,
+    STATE_SAVE_DELAY,
+    STATE_STORAGE_VERSION,
     PLATFORMS,
-    REGISTERS_READ_ONLY,
-    REGISTERS_NUMBER,
-    REGISTERS_SELECT,
-    REGISTERS_SWITCH,
-    REGISTERS_BUTTON,
-    BINARY_SENSOR_BITS,
+    READ_COALESCE_WINDOW,
 )
+from .analytics import OperationAnalytics
+from .faults import FaultTracker
+from .history import HistoryWriter
+from .metrics import MetricsEngine
+from .planner import plan_writes
+from .polling import PollSchedule, group_intervals, internal_keys, poll_keys
+from .publish import PublishFilter
+from .reconciler import merge_steps, plan_reconcile
+from .services import async_setup_services, async_unload_services
+from .snapshot import SnapshotLayout, SnapshotWriter, snapshot_path
+from .statistics import StatisticsImporter, statistics_keys
+from .timeseries import TimeSeriesStore
+from .worker import IOWorker
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up SPRSUN Heat Pump from a config entry."""
-    host = entry.data[CONF_HOST]
-    port = entry.data[CONF_PORT]
     device_address = entry.data[CONF_DEVICE_ADDRESS]
     scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     controller_type = entry.data.get(CONF_CONTROLLER_TYPE, "chico")  # Default to CHICO for backwards compatibility
     
     _LOGGER.info(
-        "Setting up SPRSUN Heat Pump (%s controller) at %s:%s (device %s, scan interval %ss)",
-        controller_type.upper(), host, port, device_address, scan_interval
+        "Setting up SPRSUN Heat Pump (%s controller) at %s (device %s, scan interval %ss)",
+        controller_type.upper(), describe_endpoint(entry.data), device_address, scan_interval
     )
     
     coordinator = SPRSUNDataUpdateCoordinator(
-        hass, host, port, device_address, scan_interval, controller_type
+        hass, dict(entry.data), device_address, scan_interval, controller_type,
+        snapshot_path(entry.entry_id) if entry.data.get(CONF_SNAPSHOT_FILE) else None,
+        hass.config.path(BACKUP_DIR, HISTORY_DIR, entry.entry_id) if entry.data.get(CONF_HISTORY_LOG) else None,
     )
     
+    # Energy and cycle counters survive restarts
+    await coordinator.async_restore_state(entry.entry_id)
+    
     # Fetch initial data
     await coordinator.async_config_entry_first_refresh()
     
+    # Keep gateway socket alive between slow polls (Elfin drops idle sockets)
+    coordinator.async_start_keepalive()
+    
+    @callback
+    def _async_store_word_order() -> None:
+        """Persist detected word order so it isn't re-detected on every start."""
+        word_order = coordinator.controller.word_order
+        if word_order is not None and entry.data.get(CONF_WORD_ORDER) != word_order:
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_WORD_ORDER: word_order}
+            )
+    
+    _async_store_word_order()
+    entry.async_on_unload(coordinator.async_add_listener(_async_store_word_order))
+    
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
     
     # Forward setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
+    # Poll only registers of enabled entities (the first refresh above read all of them)
+    coordinator.async_update_poll_scope()
+    
+    @callback
+    def _async_entity_registry_updated(event: Event) -> None:
+        """Re-plan reads when an entity is enabled, disabled, added or removed."""
+        if event.data["action"] == "update" and "disabled_by" not in event.data.get("changes", {}):
+            return
+        coordinator.async_update_poll_scope()
+    
+    entry.async_on_unload(
+        hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, _async_entity_registry_updated)
+    )
+    
+    # Hourly statistics of the high-rate sensors (their states are thinned out)
+    if coordinator.statistics_keys:
+        entry.async_on_unload(StatisticsImporter(hass, entry, coordinator).async_start())
+    
+    # Options are applied in place, only connection changes reload the entry
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    
+    async_setup_services(hass)
+    
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed entry data to the running coordinator, reload if the connection changed."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    previous = coordinator.connection_config
+    changed = {
+        key for key in previous.keys() | entry.data.keys()
+        if previous.get(key) != entry.data.get(key)
+    } - DETECTED_DATA
+    coordinator.connection_config = dict(entry.data)
+    if not changed:
+        return
+    
+    if changed <= LIVE_OPTIONS:
+        coordinator.async_apply_options(entry.data)
+        return
+    
+    _LOGGER.info("Reloading %s: %s changed", coordinator.endpoint, ", ".join(sorted(changed - LIVE_OPTIONS)))
+    hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -64,6 +161,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok:
         coordinator = hass.data[DOMAIN].pop(entry.entry_id)
         await coordinator.async_shutdown()
+        async_unload_services(hass)
     
     return unload_ok
 
@@ -74,28 +172,106 @@ class SPRSUNDataUpdateCoordinator(DataUpdateCoordinator):
     def __init__(
         self,
         hass: HomeAssistant,
-        host: str,
-        port: int,
+        connection_config: dict,
         device_address: int,
         scan_interval: int,
         controller_type: str,
+        snapshot_path: str | None = None,
+        history_dir: str | None = None,
     ) -> None:
-        """Initialize."""
+        """Initialize.
+        
+        Args:
+            connection_config: Config entry data with transport settings
+                (host/port for TCP, serial port/line settings for serial)
+            snapshot_path: Publish raw registers to this snapshot file (None = don't)
+            history_dir: Append every poll to the register history in this directory (None = don't)
+        """
         from .controllers import get_controller
         
-        self.host = host
-        self.port = port
+        self.connection_config = connection_config
+        self.endpoint = describe_endpoint(connection_config)
         self.device_address = device_address
         
-        # Single persistent connection for both read and write operations
-        self.client = self._create_modbus_client(host, port)
+        # Serializes socket access between polls, writes and keepalives
+        self._io_lock = threading.Lock()
+        
+        # Back off while gateway is unreachable instead of reconnecting every interval
+        self.breaker = CircuitBreaker()
+        
+        # Connection statistics (exposed via diagnostic sensor)
+        self.keepalive_count = 0
+        self._last_io = 0.0  # time.monotonic() of last successful transaction
+        self._keepalive_unsub = None
+        
+        # On-demand reads collected for the next coalesced batch: (addresses, future, flush timer)
+        self._read_batch: tuple[set[int], asyncio.Future, asyncio.TimerHandle] | None = None
         
         self.controller_type = controller_type
         self.controller = get_controller(controller_type)
+        self.controller.word_order = connection_config.get(CONF_WORD_ORDER)
+        
+        # Optional worker process owning the connection (I/O stalls stay out of HA)
+        self.worker = None
+        if connection_config.get(CONF_IO_WORKER):
+            self.worker = IOWorker(
+                connection_config, controller_type, device_address,
+                self.controller.register_map, self.controller.word_order, snapshot_path
+            )
+        
+        # Single persistent connection for both read and write operations
+        self.client = self._create_modbus_client(connection_config)
+        
+        # Raw register snapshot for local consumers and the history log
+        # (in worker mode the worker writes it, otherwise it is staged in-process)
+        register_map = self.controller.register_map
+        self.snapshot_path = snapshot_path
+        self.snapshot_writer = None
+        if self.worker is None and snapshot_path is not None:
+            self.snapshot_writer = SnapshotWriter.open(
+                snapshot_path, SnapshotLayout.for_map(register_map), register_map.controller
+            )
+        elif self.worker is None and history_dir is not None:
+            self.snapshot_writer = SnapshotWriter(None, SnapshotLayout.for_map(register_map), register_map.controller)
+        if self.snapshot_writer is not None:
+            self.client.recorder = self.snapshot_writer
+        
+        # Compact binary log of every poll
+        self.history = HistoryWriter(history_dir, register_map) if history_dir is not None else None
+        
+        # Register groups polled at their own intervals, the coordinator ticks at the shortest
+        self.schedule = PollSchedule(register_map, scan_interval, group_intervals(connection_config))
+        self.poll_scope: frozenset[str] | None = None  # Registers of the enabled entities (None = all)
+        self._values: dict = {}  # Last decoded values, held for groups that are not due
+        tick = self.schedule.tick
+        
+        # Recent measurements with min/max/mean downsampling (fixed memory)
+        self.timeseries = TimeSeriesStore.for_map(register_map, tick)
+        
+        # Sensor jitter within the deadband is not handed to the entities
+        self.publish_filter = PublishFilter(register_map) if connection_config.get(CONF_DEADBAND, True) else None
+        
+        # Sensors whose long-term statistics are imported from the time series
+        self.statistics_keys = (
+            statistics_keys(register_map) if connection_config.get(CONF_STATISTICS_IMPORT) else set()
+        )
+        
+        # Power, energy, SCOP, cycle counters and fault log derived from every poll
+        # (persisted once async_restore_state attached the stores)
+        self.metrics = MetricsEngine(register_map, tick * STATE_MAX_GAP_POLLS)
+        self.analytics = OperationAnalytics(register_map, tick * STATE_MAX_GAP_POLLS)
+        self.faults = FaultTracker(register_map)
+        self.entry_id: str | None = None
+        self._stores: dict = {}
+        
+        # Registers polled even if every entity reading them is disabled
+        self._internal_keys = internal_keys(register_map, self.metrics, self.analytics, self.faults)
+        self._events: list[tuple[str, dict]] = []  # Collected in the executor, fired after the poll
         
         # Cache staleness window: Skip re-reading recently written registers
         # Set to 2x scan_interval to prevent revert glitches
         self.cache_staleness_seconds = scan_interval * 2
+        self.scan_interval = scan_interval
         
         _LOGGER.info(
             "Using %s controller (cache staleness: %ds)",
@@ -107,21 +283,24 @@ class SPRSUNDataUpdateCoordinator(DataUpdateCoordinator):
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=scan_interval),
+            update_interval=timedelta(seconds=tick),
         )
     
-    def _create_modbus_client(self, host: str, port: int) -> ModbusTcpClient:
-        """Create Modbus TCP client with optimal settings."""
-        return ModbusTcpClient(
-            host=host,
-            port=port,
-            timeout=10,  # Longer timeout to prevent premature disconnects
-        )
+    def _create_modbus_client(self, connection_config: dict) -> ModbusConnection:
+        """Create Modbus client (TCP or serial) with adaptive timeout and retry budget."""
+        if self.worker is not None:
+            return self.worker.client
+        return create_client(connection_config)
     
-    def _ensure_connection(self, client: ModbusTcpClient, name: str = "client") -> bool:
+    @property
+    def reconnect_count(self) -> int:
+        """Return number of reconnects since integration start."""
+        return self.client.reconnect_count if self.client else 0
+    
+    def _ensure_connection(self, client: ModbusConnection, name: str = "client") -> bool:
         """Ensure client is connected, reconnect if needed."""
         if not client.connected:
-            _LOGGER.debug("Reconnecting %s to %s:%s", name, self.host, self.port)
+            _LOGGER.debug("Reconnecting %s to %s", name, self.endpoint)
             try:
                 if client.connect():
                     _LOGGER.debug("%s connected successfully", name)
@@ -134,7 +313,7 @@ class SPRSUNDataUpdateCoordinator(DataUpdateCoordinator):
                 return False
         return True
     
-    def _verify_connection(self, client: ModbusTcpClient, test_address: int = 0x0000) -> bool:
+    def _verify_connection(self, client: ModbusConnection, test_address: int = 0x0000) -> bool:
         """Verify connection is actually working by test read.
         
         Returns True if connection works, False if need to reconnect.
@@ -158,26 +337,127 @@ class SPRSUNDataUpdateCoordinator(DataUpdateCoordinator):
     async def _async_update_data(self):
         """Fetch data from Modbus."""
         try:
-            return await self.hass.async_add_executor_job(self._sync_update)
+            data = await self.hass.async_add_executor_job(self._sync_update)
         except ModbusException as err:
             raise UpdateFailed(f"Error communicating with Modbus: {err}") from err
+        finally:
+            events, self._events = self._events, []
+            for event_type, event_data in events:
+                self.hass.bus.async_fire(event_type, {"entry_id": self.entry_id, **event_data})
+        for engine, store in self._stores.items():
+            store.async_delay_save(engine.as_dict, STATE_SAVE_DELAY)
+        return data
+    
+    async def async_restore_state(self, entry_id: str) -> None:
+        """Load persisted counters (metrics, analytics, fault log) and save them from now on."""
+        self.entry_id = entry_id
+        self._stores = {
+            self.metrics: Store(self.hass, STATE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.metrics"),
+            self.analytics: Store(self.hass, STATE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.analytics"),
+            self.faults: Store(self.hass, STATE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.faults"),
+        }
+        for engine, store in self._stores.items():
+            engine.restore(await store.async_load() or {})
+    
+    @callback
+    def async_update_poll_scope(self) -> None:
+        """Restrict polling to the registers of the enabled entities (see polling.py)."""
+        register_map = self.controller.register_map
+        keys = poll_keys(er.async_get(self.hass), self.entry_id, register_map, self._internal_keys)
+        if keys == self.poll_scope:
+            return
+        self.poll_scope = keys
+        polled = [register.key for register in register_map.registers if register.tier is not None]
+        _LOGGER.info(
+            "Polling %d of %d registers (entity registry)",
+            len(polled) if keys is None else sum(key in keys for key in polled), len(polled)
+        )
+    
+    @callback
+    def async_set_scan_intervals(self, scan_interval: int, intervals: dict[str, int]) -> None:
+        """Apply new scan intervals to the running coordinator (next poll, no reload)."""
+        self.schedule.configure(scan_interval, intervals)
+        tick = self.schedule.tick
+        self.scan_interval = scan_interval
+        self.cache_staleness_seconds = scan_interval * 2
+        self.metrics.max_gap = self.analytics.max_gap = tick * STATE_MAX_GAP_POLLS
+        self.update_interval = timedelta(seconds=tick)
+        
+        if self._keepalive_unsub is not None and tick < KEEPALIVE_IDLE:
+            self._keepalive_unsub()
+            self._keepalive_unsub = None
+        self.async_start_keepalive()
+        
+        _LOGGER.info(
+            "Scan intervals changed: %ds, groups %s (polling every %ds)",
+            scan_interval, {group: seconds for group, seconds in self.schedule.intervals.items() if group}, tick
+        )
+    
+    @callback
+    def async_apply_options(self, config: dict) -> None:
+        """Apply options that keep the connection (LIVE_OPTIONS) in place, effective next poll."""
+        self.async_set_scan_intervals(
+            config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL), group_intervals(config)
+        )
+        if config.get(CONF_DEADBAND, True) != (self.publish_filter is not None):
+            self.publish_filter = PublishFilter(self.controller.register_map) if config.get(CONF_DEADBAND, True) else None
+        self.hass.async_create_task(self.async_request_refresh())
     
     def _sync_update(self):
         """Synchronous update (runs in executor)."""
-        import time
+        with self._io_lock:
+            return self._sync_update_locked()
+    
+    def _sync_update_locked(self):
+        """Read all registers and merge with cache (caller holds _io_lock)."""
+        # Gateway recently unreachable - don't touch the socket until backoff expires
+        if not self.breaker.allow():
+            raise UpdateFailed(
+                f"Modbus gateway unreachable, next attempt in {self.breaker.retry_in:.0f}s"
+            )
         
         # Ensure client is connected
         if not self._ensure_connection(self.client, "client"):
+            self.breaker.record_failure()
             raise UpdateFailed("Failed to connect to Modbus device")
         
+        # Fresh retry budget shared by all transactions of this cycle
+        self.client.begin_cycle()
+        
+        # Groups due in this poll, within the registers of the enabled entities
+        started = time.time()
+        due = self.schedule.due(started)
+        self.controller.poll_keys = self.schedule.poll_keys(due, self.poll_scope)
+        
         # Use controller-specific implementation to read registers
         try:
             # Read all registers (RO + RW)
-            fresh_data = self.controller.read_all_registers(
-                self.client,
-                self.device_address,
-                initial_read=True  # Always read RW now
-            )
+            if self.worker is not None:
+                # Worker polls and publishes a snapshot, decoded here without copying
+                fresh_data = self.worker.read_all_registers(initial_read=True, poll_keys=self.controller.poll_keys)
+                self.controller.word_order = self.worker.word_order
+            else:
+                fresh_data = self.controller.read_all_registers(
+                    self.client,
+                    self.device_address,
+                    initial_read=True  # Always read RW now
+                )
+                self._publish_snapshot()
+            self._last_io = time.monotonic()
+            self.breaker.record_success()
+            self.schedule.mark(due, started)
+            self._append_history()
+            self.timeseries.add(time.time(), fresh_data)
+            
+            # Derived values see the last value of registers whose group wasn't due
+            held = {
+                key: value for key, value in self._values.items()
+                if key not in fresh_data and self.schedule.groups.get(key) not in due
+            }
+            self._values = {**held, **fresh_data}
+            self.metrics.update(time.time(), self._values, dt_util.now().date().toordinal())
+            self._events.extend(self.analytics.update(time.time(), self._values))
+            self._events.extend((EVENT_FAULT, entry) for entry in self.faults.update(time.time(), self._values))
             
             # Phase 2: Migrate to timestamp-based cache
             # Merge fresh data with cache, respecting timestamps
@@ -190,8 +470,8 @@ class SPRSUNDataUpdateCoordinator(DataUpdateCoordinator):
                 
                 # Handle both old format (float) and new format (dict with timestamp)
                 if isinstance(cached, dict) and "updated_at" in cached:
-                    # New format: respect timestamp
-                    if (now - cached["updated_at"]) < self.cache_staleness_seconds:
+                    # New format: only written entries are protected (on-demand reads are not)
+                    if (now - cached.get("written_at", -math.inf)) < self.cache_staleness_seconds:
                         # Cache is fresh (recently written), preserve it
                         updated_data[key] = cached
                     else:
@@ -201,12 +481,36 @@ class SPRSUNDataUpdateCoordinator(DataUpdateCoordinator):
                     # Old format or no cache: use fresh value
                     updated_data[key] = {"value": value, "updated_at": now}
             
-            return updated_data
+            # Groups not due keep their cache entries
+            if isinstance(self.data, dict):
+                for key in held:
+                    if key in self.data:
+                        updated_data[key] = self.data[key]
             
+            if self.publish_filter is not None:
+                self.publish_filter.apply(updated_data, now)
+            return updated_data
+        
         except Exception as err:
+            self.breaker.record_failure()
             _LOGGER.error("Error reading %s registers: %s", self.controller.name, err)
             raise UpdateFailed(f"Register read failed: {err}") from err
     
+    def _publish_snapshot(self) -> None:
+        """Publish reads recorded since the last publish (caller holds _io_lock)."""
+        if self.snapshot_writer is not None:
+            self.snapshot_writer.publish(self.controller.word_order)
+    
+    def _append_history(self) -> None:
+        """Append the published poll to the history log (caller holds _io_lock)."""
+        if self.history is None:
+            return
+        snapshot = self.worker.snapshot if self.worker is not None else self.snapshot_writer.view()
+        try:
+            self.history.append(snapshot)
+        except OSError as err:
+            _LOGGER.warning("Cannot append to register history: %s", err)
+    
     def write_register(self, address: int, value: int) -> bool:
         """Write a single register (synchronous, runs in executor) - LEGACY.
         
@@ -216,11 +520,7 @@ class SPRSUNDataUpdateCoordinator(DataUpdateCoordinator):
             if not self.client.connect():
                 raise ConnectionError("Cannot connect to Modbus device")
         
-        result = self.client.write_register(
-            address=address,
-            value=value,
-            device_id=self.device_address
-        )
+        result = self._write_words(address, value)
         
         if result.isError():
             raise ValueError(f"Modbus write error: {result}")
@@ -239,7 +539,65 @@ class SPRSUNDataUpdateCoordinator(DataUpdateCoordinator):
         Returns:
             True if write succeeded
         """
-        import time
+        with self._io_lock:
+            self._write_register_locked(address, value)
+            self._last_io = time.monotonic()
+        
+        # Success - update cache immediately with timestamp (prevents revert glitch)
+        now = time.time()
+        self.data[key] = {
+            "value": value / scale if scale != 1 else float(value),
+            "updated_at": now,
+            "written_at": now,
+        }
+        
+        _LOGGER.debug(
+            "Wrote register 0x%04X = %d, cached as %s = %.2f",
+            address, value, key, self.data[key]["value"]
+        )
+        
+        return True
+    
+    def write_bit(self, address: int, bit: int, value: bool, key: str | None = None) -> tuple[int, int]:
+        """Set or clear one bit of a control word in one locked read-modify-write (runs in executor).
+        
+        The word is read fresh under _io_lock, so concurrent writers of other
+        bits of the same word (switches, buttons) can't overwrite each other.
+        
+        Args:
+            address: Register address of the control word
+            bit: Bit number (0-15)
+            value: New bit state
+            key: Cache key to update with the written word (None = not cached)
+        
+        Returns:
+            (word before, word after) - equal if the bit already had the value
+        """
+        with self._io_lock:
+            self.client.begin_cycle()
+            if not self._ensure_connection(self.client, "client"):
+                raise ConnectionError("Cannot connect to Modbus device")
+            result = self.client.read_holding_registers(
+                address=address,
+                count=1,
+                device_id=self.device_address
+            )
+            if result.isError():
+                raise ValueError(f"Modbus read error at 0x{address:04X}: {result}")
+            current = result.registers[0]
+            new = current | (1 << bit) if value else current & ~(1 << bit)
+            if new != current:
+                self._write_register_locked(address, new)
+            self._last_io = time.monotonic()
+        
+        if key is not None:
+            now = time.time()
+            self.data[key] = {"value": float(new), "updated_at": now, "written_at": now}
+        return current, new
+    
+    def _write_register_locked(self, address: int, value: int) -> None:
+        """Write register with one reconnect-and-retry (caller holds _io_lock)."""
+        self.client.begin_cycle()
         
         # Ensure client is connected (check flag)
         if not self._ensure_connection(self.client, "client"):
@@ -253,11 +611,7 @@ class SPRSUNDataUpdateCoordinator(DataUpdateCoordinator):
                 raise ConnectionError("Cannot reconnect to Modbus device")
         
         # Write register
-        result = self.client.write_register(
-            address=address,
-            value=value,
-            device_id=self.device_address
-        )
+        result = self._write_words(address, value)
         
         if result.isError():
             # Check if it's a connection error
@@ -270,31 +624,317 @@ class SPRSUNDataUpdateCoordinator(DataUpdateCoordinator):
                     raise ConnectionError("Cannot reconnect to Modbus device")
                 
                 # Retry write once
-                result = self.client.write_register(
-                    address=address,
-                    value=value,
-                    device_id=self.device_address
-                )
+                result = self._write_words(address, value)
                 
                 if result.isError():
                     raise ValueError(f"Modbus write error after reconnect: {result}")
             else:
                 # Modbus protocol error (CRC, illegal address, etc) - fail immediately
                 raise ValueError(f"Modbus write error: {result}")
+    
+    def _write_words(self, address: int, value: int):
+        """Write value encoded by the controller (FC06 for one word, FC16 for more)."""
+        values = self.controller.encode_register(address, value)
+        if len(values) == 1:
+            return self.client.write_register(
+                address=address,
+                value=values[0],
+                device_id=self.device_address
+            )
+        return self.client.write_registers(
+            address=address,
+            values=values,
+            device_id=self.device_address
+        )
+    
+    def read_raw_values(self, keys) -> dict:
+        """Read registers by cache key in planned batches (runs in executor).
         
-        # Success - update cache immediately with timestamp (prevents revert glitch)
-        self.data[key] = {
-            "value": value / scale if scale != 1 else float(value),
-            "updated_at": time.time()
-        }
+        Returns unscaled values decoded with the register's data type.
+        """
+        controller = self.controller
+        max_gap = min(controller.max_read_gap, self.client.cost_model.max_gap())
+        layouts = controller.register_map.key_plan(frozenset(keys), max_gap)
+        word_order = controller.word_order or WORD_ORDER_BIG
         
-        _LOGGER.debug(
-            "Wrote register 0x%04X = %d, cached as %s = %.2f",
-            address, value, key, self.data[key]["value"]
-        )
+        values = {}
+        with self._io_lock:
+            self.client.begin_cycle()
+            if not self._ensure_connection(self.client, "client"):
+                raise ConnectionError("Cannot connect to Modbus device")
+            
+            for layout in layouts:
+                result = self.client.read_holding_registers(
+                    address=layout.start,
+                    count=layout.count,
+                    device_id=self.device_address
+                )
+                if result.isError():
+                    raise ValueError(f"Modbus read error at 0x{layout.start:04X}: {result}")
+                values.update(layout.decode(result.registers, word_order))
+            self._last_io = time.monotonic()
+            self._publish_snapshot()
+        
+        return values
+    
+    async def async_read_registers(self, addresses, max_age: float = 0.0) -> dict:
+        """Read registers on demand, coalescing concurrent requests.
+        
+        Values cached less than max_age seconds ago are served without a
+        transaction. All other addresses requested within
+        READ_COALESCE_WINDOW are read together in one planned batch read,
+        and every caller is answered from that response.
+        
+        Args:
+            addresses: Register addresses (as declared in the register map)
+            max_age: Accept cached values up to this age in seconds (0 = always read)
+        
+        Returns:
+            Raw (unscaled) values by address
+        """
+        register_map = self.controller.register_map
+        now = time.time()
+        values = {}
+        missing = set()
+        for address in addresses:
+            key = register_map.by_address[address].key
+            cached = self.data.get(key) if isinstance(self.data, dict) else None
+            if isinstance(cached, dict) and now - cached["updated_at"] <= max_age:
+                values[address] = register_map.raw_value(key, cached["value"])
+            else:
+                missing.add(address)
+        
+        if not missing:
+            return values
+        
+        if self._read_batch is None:
+            timer = self.hass.loop.call_later(READ_COALESCE_WINDOW, self._async_flush_reads)
+            self._read_batch = (set(), self.hass.loop.create_future(), timer)
+        pending, future, _ = self._read_batch
+        pending.update(missing)
+        
+        batch = await asyncio.shield(future)
+        values.update({address: batch[address] for address in missing})
+        return values
+    
+    @callback
+    def _async_flush_reads(self) -> None:
+        """Start the batch read of all on-demand reads collected so far."""
+        addresses, future, timer = self._read_batch
+        self._read_batch = None
+        timer.cancel()  # Started early (async_flush) - the timer must not flush the next batch
+        self.hass.async_create_task(self._async_read_batch(addresses, future))
+    
+    async def _async_read_batch(self, addresses: set[int], future: asyncio.Future) -> None:
+        """Read collected addresses in one planned batch and answer all waiting callers."""
+        register_map = self.controller.register_map
+        keys = {register_map.by_address[address].key: address for address in addresses}
+        try:
+            raw_values = await self.hass.async_add_executor_job(self.read_raw_values, keys)
+        except Exception as err:
+            future.set_exception(err)
+            return
+        
+        now = time.time()
+        for key, value in raw_values.items():
+            self.data[key] = {"value": register_map.scale_value(key, value), "updated_at": now}
+        
+        _LOGGER.debug("Coalesced on-demand read of %d registers", len(addresses))
+        future.set_result({keys[key]: value for key, value in raw_values.items()})
+    
+    def write_block_with_cache(self, values: dict) -> dict:
+        """Write raw values by cache key with as few FC16 requests as possible.
+        
+        Adjacent registers are written in one request. Afterwards all written
+        registers are read back in one planned read and the cache is updated
+        from the read-back values.
+        
+        Args:
+            values: Cache key: raw integer value (already scaled)
+        
+        Returns:
+            Read-back raw values by cache key
+        
+        Raises:
+            ValueError: Write failed or the device did not keep a value
+        """
+        register_map = self.controller.register_map
+        words = {}
+        for key, value in values.items():
+            address = register_map.by_key[key].address
+            words[address] = self.controller.encode_register(address, value)
+        
+        with self._io_lock:
+            self.client.begin_cycle()
+            if not self._ensure_connection(self.client, "client"):
+                raise ConnectionError("Cannot connect to Modbus device")
+            
+            for start, block in plan_writes(words):
+                self._write_run(start, block)
+                _LOGGER.debug("Wrote %d registers at 0x%04X", len(block), start)
+            self._last_io = time.monotonic()
+        
+        readback = self.read_raw_values(values)
+        
+        now = time.time()
+        for key, value in readback.items():
+            self.data[key] = {"value": register_map.scale_value(key, value), "updated_at": now, "written_at": now}
+        
+        rejected = [
+            key for key, value in values.items()
+            if key not in readback
+            or self.controller.encode_register(register_map.by_key[key].address, readback[key])
+            != words[register_map.by_key[key].address]
+        ]
+        if rejected:
+            raise ValueError(f"Device did not keep written values: {', '.join(rejected)}")
+        
+        return readback
+    
+    async def async_write_block(self, values: dict) -> dict:
+        """Async wrapper for write_block_with_cache."""
+        readback = await self.hass.async_add_executor_job(self.write_block_with_cache, values)
+        self.async_update_listeners()
+        return readback
+    
+    def reconcile_with_cache(self, desired: dict) -> int:
+        """Bring the device into a desired state with the fewest writes (runs in executor).
+        
+        The register diff is computed against the cached state (see
+        reconciler.plan_reconcile). All writes go out in one locked sequence;
+        if one fails, the registers already written are restored in reverse
+        order before the error is raised.
+        
+        Args:
+            desired: Engineering values by register key, bools by switch key
+        
+        Returns:
+            Number of registers written (0 if the device is already there)
+        """
+        register_map = self.controller.register_map
+        
+        current = {}
+        unknown = set()
+        for key in desired:
+            if key in register_map.switch_registers:
+                key = register_map.by_address[register_map.switch_registers[key][0]].key
+            cached = self.data.get(key) if isinstance(self.data, dict) else None
+            if isinstance(cached, dict):
+                current[key] = register_map.raw_value(key, cached["value"])
+            else:
+                unknown.add(key)
+        if unknown:
+            current.update(self.read_raw_values(unknown))
+        
+        steps = plan_reconcile(register_map, current, desired, self.controller.encode_register)
+        if not steps:
+            _LOGGER.debug("Desired state %s already reached, nothing to write", desired)
+            return 0
+        
+        _LOGGER.debug("Reconciling %s: %s", desired, steps)
+        
+        with self._io_lock:
+            self.client.begin_cycle()
+            if not self._ensure_connection(self.client, "client"):
+                raise ConnectionError("Cannot connect to Modbus device")
+            
+            written = []
+            try:
+                for group in merge_steps(steps):
+                    self._write_run(group[0].address, [word for step in group for word in step.words])
+                    written.extend(group)
+            except Exception as err:
+                _LOGGER.warning(
+                    "Reconcile failed after %d of %d writes, rolling back: %s",
+                    len(written), len(steps), err
+                )
+                for step in reversed(written):
+                    try:
+                        self._write_run(step.address, step.old_words)
+                    except Exception as rollback_err:
+                        _LOGGER.error("Rollback of %s failed: %s", step.key, rollback_err)
+                raise
+            finally:
+                self._last_io = time.monotonic()
+        
+        now = time.time()
+        for step in steps:
+            self.data[step.key] = {
+                "value": register_map.scale_value(step.key, step.new), "updated_at": now, "written_at": now
+            }
+        
+        return len(steps)
+    
+    async def async_reconcile(self, desired: dict) -> int:
+        """Async wrapper for reconcile_with_cache."""
+        written = await self.hass.async_add_executor_job(self.reconcile_with_cache, desired)
+        if written:
+            self.async_update_listeners()
+        return written
+    
+    def _write_run(self, address: int, words: list[int]) -> None:
+        """Write adjacent register words (FC06 for one word, FC16 for more, caller holds _io_lock)."""
+        if len(words) == 1:
+            result = self.client.write_register(
+                address=address,
+                value=words[0],
+                device_id=self.device_address
+            )
+        else:
+            result = self.client.write_registers(
+                address=address,
+                values=words,
+                device_id=self.device_address
+            )
+        if result.isError():
+            raise ValueError(f"Modbus write error at 0x{address:04X}: {result}")
+    
+    def write_coil_with_cache(self, address: int, value: bool, key: str | None = None) -> bool:
+        """Write single coil (FC05) and update cache.
+        
+        Args:
+            address: Coil address
+            value: New coil state
+            key: Cache key to update (None for momentary coils)
+        
+        Returns:
+            True if write succeeded
+        """
+        with self._io_lock:
+            self.client.begin_cycle()
+            if not self._ensure_connection(self.client, "client"):
+                raise ConnectionError("Cannot connect to Modbus device")
+            
+            result = self.client.write_coil(
+                address=address,
+                value=value,
+                device_id=self.device_address
+            )
+            if result.isError():
+                raise ValueError(f"Modbus coil write error: {result}")
+            self._last_io = time.monotonic()
+        
+        if key is not None:
+            now = time.time()
+            self.data[key] = {"value": value, "updated_at": now, "written_at": now}
+        
+        _LOGGER.debug("Wrote coil %d = %s", address, value)
         
         return True
     
+    async def async_write_coil(self, address: int, value: bool, key: str | None = None) -> None:
+        """Async wrapper for write_coil_with_cache."""
+        await self.hass.async_add_executor_job(
+            self.write_coil_with_cache,
+            address,
+            value,
+            key
+        )
+    
+    async def async_write_bit(self, address: int, bit: int, value: bool, key: str | None = None) -> tuple[int, int]:
+        """Async wrapper for write_bit."""
+        return await self.hass.async_add_executor_job(self.write_bit, address, bit, value, key)
+    
     async def async_write_register(self, address: int, value: float, key: str, scale: float = 1) -> None:
         """Async wrapper for write_register_with_cache (Phase 4).
         
@@ -315,8 +955,106 @@ class SPRSUNDataUpdateCoordinator(DataUpdateCoordinator):
             scale
         )
     
+    @callback
+    def async_start_keepalive(self) -> None:
+        """Schedule keepalive transactions when polls alone would let the socket idle out.
+        
+        Elfin drops sockets idle for DEFAULT_TIMEOUT (30s). With scan intervals
+        below KEEPALIVE_IDLE the regular poll already keeps the socket busy.
+        """
+        if self.schedule.tick < KEEPALIVE_IDLE or self._keepalive_unsub is not None:
+            return
+        # Serial links have no idle timeout
+        if not self.client.needs_keepalive:
+            return
+        
+        _LOGGER.debug(
+            "Poll interval %ds exceeds keepalive idle %ds, scheduling keepalives",
+            self.schedule.tick, KEEPALIVE_IDLE
+        )
+        self._keepalive_unsub = async_track_time_interval(
+            self.hass, self._async_keepalive, timedelta(seconds=KEEPALIVE_INTERVAL)
+        )
+    
+    async def _async_keepalive(self, _now=None) -> None:
+        """Send keepalive if socket has been idle too long."""
+        if self.client is None or time.monotonic() - self._last_io < KEEPALIVE_IDLE:
+            return
+        await self.hass.async_add_executor_job(self._sync_keepalive)
+    
+    def _sync_keepalive(self) -> None:
+        """Cheap 1-register read to keep gateway socket open (runs in executor)."""
+        # Poll or write in progress - socket is busy anyway
+        if not self._io_lock.acquire(blocking=False):
+            return
+        try:
+            # Gateway down - let the breaker decide when to try again
+            if not self.breaker.allow():
+                return
+            if not self._ensure_connection(self.client, "client"):
+                return
+            self.client.begin_cycle(budget=0)
+            result = self.client.read_holding_registers(
+                address=KEEPALIVE_ADDRESS,
+                count=1,
+                device_id=self.device_address
+            )
+            if result.isError():
+                _LOGGER.debug("Keepalive read returned error: %s", result)
+                return
+            self._last_io = time.monotonic()
+            self.keepalive_count += 1
+        except Exception as err:
+            # Dead socket - drop it so next poll reconnects cleanly
+            _LOGGER.debug("Keepalive failed, closing connection: %s", err)
+            self.client.close()
+        finally:
+            self._io_lock.release()
+    
+    async def async_flush(self) -> None:
+        """Complete pending I/O before the connection is closed or handed over.
+        
+        On-demand reads still collecting are read now, and a write or
+        reconcile sequence in progress finishes before this returns.
+        """
+        if self._read_batch is not None:
+            future = self._read_batch[1]
+            self._async_flush_reads()
+            with contextlib.suppress(Exception):
+                await asyncio.shield(future)
+        await self.hass.async_add_executor_job(self._sync_flush)
+    
+    def _sync_flush(self) -> None:
+        """Wait for the transaction sequence holding the socket (runs in executor)."""
+        with self._io_lock:
+            pass
+    
     async def async_shutdown(self):
         """Shutdown coordinator."""
-        if self.client:
+        await self.async_flush()
+        if self._keepalive_unsub is not None:
+            self._keepalive_unsub()
+            self._keepalive_unsub = None
+        if self.worker is not None:
+            await self.hass.async_add_executor_job(self.worker.stop)
+            self.worker = None
+        elif self.client:
             await self.hass.async_add_executor_job(self.client.close)
-            self.client = None
+        self.client = None
+        if self.history is not None:
+            await self.hass.async_add_executor_job(self.history.close)
+        for engine, store in self._stores.items():
+            await store.async_save(engine.as_dict())
+        if self.snapshot_writer is not None:
+            await self.hass.async_add_executor_job(self._remove_snapshot)
+    
+    def _remove_snapshot(self) -> None:
+        """Unmap and delete the published snapshot (readers keep their mapping until they close it)."""
+        self.snapshot_writer.close()
+        self.snapshot_writer = None
+        if self.snapshot_path is None:
+            return
+        try:
+            os.unlink(self.snapshot_path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,195 @@
+"""Operating analytics of SPRSUN Heat Pump: defrost and compressor cycles.
+
+Fed with every poll, the status bits of defrost and compressor are turned
+into episodes (start, end, duration) and counters, in constant time per
+poll. Transitions are timed at the first poll that shows them, so
+durations have poll resolution. After a gap longer than max_gap (failed
+polls, restarts) the start of the current episode is unknown and its
+duration is not reported.
+
+A compressor run shorter than SHORT_CYCLE_MIN_RUN, or more than
+SHORT_CYCLE_MAX_STARTS starts within an hour, is reported as short cycling.
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+from .const import (
+    EVENT_DEFROST_ENDED,
+    EVENT_SHORT_CYCLING,
+    SHORT_CYCLE_MAX_STARTS,
+    SHORT_CYCLE_MIN_RUN,
+)
+from .register_map import RegisterMap
+
+STATE_VERSION = 1  # Bumped when as_dict() changes incompatibly
+
+DEFROST_KEY = "defrost_active"
+COMPRESSOR_KEY = "compressor_running"
+
+
+class Episodes:
+    """On/off episodes of one status bit."""
+    
+    def __init__(self) -> None:
+        """Initialize."""
+        self.state: bool | None = None
+        self.since: float | None = None  # Start of the current episode (None = unknown)
+        self.seen: float | None = None  # Time of the last poll with the bit
+        self.count = 0  # Number of on-episodes started
+        self.last_duration: float | None = None  # Seconds of the last completed on-episode
+    
+    def update(self, timestamp: float, state: bool, max_gap: float) -> tuple[bool, float | None] | None:
+        """Add one poll, return (new state, duration of the ended episode) on a transition."""
+        gap = self.seen is not None and timestamp - self.seen > max_gap
+        if gap:
+            self.since = None
+        self.seen = timestamp
+        previous, self.state = self.state, state
+        if previous is None or previous == state:
+            return None
+        
+        duration = timestamp - self.since if self.since is not None else None
+        self.since = None if gap else timestamp
+        if state:
+            self.count += 1
+        elif duration is not None:
+            self.last_duration = duration
+        return state, duration
+    
+    def as_dict(self) -> dict:
+        """Return persistent state."""
+        return {
+            "state": self.state,
+            "since": self.since,
+            "seen": self.seen,
+            "count": self.count,
+            "last_duration": self.last_duration,
+        }
+    
+    def restore(self, state: dict) -> None:
+        """Restore state saved by as_dict()."""
+        self.state = state["state"]
+        self.since = state["since"]
+        self.seen = state["seen"]
+        self.count = state["count"]
+        self.last_duration = state["last_duration"]
+
+
+class OperationAnalytics:
+    """Defrost and compressor cycle counters of one heat pump."""
+    
+    def __init__(self, register_map: RegisterMap, max_gap: float) -> None:
+        """Initialize.
+        
+        Args:
+            max_gap: Longest interval between polls (seconds) that keeps episode timing
+        """
+        self._sources = {
+            key: source for key in (DEFROST_KEY, COMPRESSOR_KEY)
+            if (source := self._source(register_map, key)) is not None
+        }
+        self.defrost = Episodes() if DEFROST_KEY in self._sources else None
+        self.compressor = Episodes() if COMPRESSOR_KEY in self._sources else None
+        self.max_gap = max_gap
+        self._lock = threading.Lock()  # Polls update in the executor, the store saves from the event loop
+        
+        self._starts: deque[float] = deque()  # Compressor start times of the last hour
+        self.short_cycles = 0
+    
+    @staticmethod
+    def _source(register_map: RegisterMap, key: str) -> tuple[str, int | None] | None:
+        """Return (cache key, bit) holding a status bit entity (bit None = boolean value)."""
+        if key in register_map.binary_sensor_bits:
+            address, bit, _ = register_map.binary_sensor_bits[key]
+            return register_map.bit_registers[address], bit
+        if key in register_map.discrete_inputs:
+            return key, None
+        return None
+    
+    @property
+    def input_keys(self) -> set[str]:
+        """Return cache keys read by update()."""
+        return {cache_key for cache_key, _ in self._sources.values()}
+    
+    def _state(self, data: dict, key: str) -> bool | None:
+        """Return a status bit from decoded poll values (None if not read)."""
+        cache_key, bit = self._sources[key]
+        value = data.get(cache_key)
+        if value is None:
+            return None
+        return bool(value) if bit is None else bool(int(value) >> bit & 1)
+    
+    def update(self, timestamp: float, data: dict) -> list[tuple[str, dict]]:
+        """Add one poll, return (event type, event data) of the episodes it completed."""
+        events = []
+        with self._lock:
+            while self._starts and self._starts[0] <= timestamp - 3600:
+                self._starts.popleft()
+            
+            state = self._state(data, DEFROST_KEY) if self.defrost is not None else None
+            if state is not None:
+                transition = self.defrost.update(timestamp, state, self.max_gap)
+                if transition is not None and not transition[0]:
+                    events.append((EVENT_DEFROST_ENDED, {"duration": transition[1], "count": self.defrost.count}))
+            
+            state = self._state(data, COMPRESSOR_KEY) if self.compressor is not None else None
+            if state is not None:
+                transition = self.compressor.update(timestamp, state, self.max_gap)
+                if transition is not None and transition[0]:
+                    self._starts.append(timestamp)
+                    if len(self._starts) == SHORT_CYCLE_MAX_STARTS + 1:
+                        events.append((EVENT_SHORT_CYCLING, {"reason": "starts_per_hour", "starts": len(self._starts)}))
+                elif transition is not None and transition[1] is not None and transition[1] < SHORT_CYCLE_MIN_RUN:
+                    self.short_cycles += 1
+                    events.append((EVENT_SHORT_CYCLING, {"reason": "short_run", "duration": transition[1]}))
+        return events
+    
+    @property
+    def defrost_count(self) -> int:
+        """Return number of defrosts started."""
+        return self.defrost.count
+    
+    @property
+    def defrost_last_duration(self) -> float | None:
+        """Return seconds of the last completed defrost."""
+        return self.defrost.last_duration
+    
+    @property
+    def compressor_starts(self) -> int:
+        """Return number of compressor starts."""
+        return self.compressor.count
+    
+    @property
+    def compressor_starts_hour(self) -> int:
+        """Return number of compressor starts within the last hour (as of the last poll)."""
+        return len(self._starts)
+    
+    @property
+    def compressor_last_run(self) -> float | None:
+        """Return seconds of the last completed compressor run."""
+        return self.compressor.last_duration
+    
+    def as_dict(self) -> dict:
+        """Return persistent state (JSON serializable)."""
+        with self._lock:
+            return {
+                "version": STATE_VERSION,
+                "defrost": self.defrost.as_dict() if self.defrost is not None else None,
+                "compressor": self.compressor.as_dict() if self.compressor is not None else None,
+                "starts": list(self._starts),
+                "short_cycles": self.short_cycles,
+            }
+    
+    def restore(self, state: dict) -> None:
+        """Restore state saved by as_dict() (ignored if the layout differs)."""
+        if not state or state.get("version") != STATE_VERSION:
+            return
+        with self._lock:
+            if self.defrost is not None and state.get("defrost"):
+                self.defrost.restore(state["defrost"])
+            if self.compressor is not None and state.get("compressor"):
+                self.compressor.restore(state["compressor"])
+            self._starts = deque(state["starts"])
+            self.short_cycles = state["short_cycles"]
@@ -11,7 +11,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, BINARY_SENSOR_BITS
+from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,17 +24,35 @@ async def async_setup_entry(
     """Set up SPRSUN binary sensors."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
     
+    controller = coordinator.controller
+    
     entities = []
-    for key, (address, bit, name) in BINARY_SENSOR_BITS.items():
+    for key, (address, bit, name) in controller.binary_sensor_bits.items():
         entities.append(
             SPRSUNBinarySensor(
                 coordinator,
                 config_entry,
                 key,
                 name,
+                controller.bit_registers[address],
+                bit,
+            )
+        )
+    
+    # Controllers with discrete inputs (CAREL) - one bit per input
+    for key, (address, name) in controller.discrete_inputs.items():
+        entities.append(
+            SPRSUNDiscreteInputSensor(
+                coordinator,
+                config_entry,
+                key,
+                name,
             )
         )
     
+    if controller.alarm_inputs:
+        entities.append(SPRSUNAlarmSensor(coordinator, config_entry, controller.alarm_inputs))
+    
     async_add_entities(entities)
 
 
@@ -47,11 +65,15 @@ class SPRSUNBinarySensor(CoordinatorEntity, BinarySensorEntity):
         config_entry: ConfigEntry,
         key: str,
         name: str,
+        register_key: str,
+        bit: int,
     ) -> None:
         """Initialize the binary sensor."""
         super().__init__(coordinator)
         
         self._key = key
+        self._register_key = register_key  # Cache key of the bitfield register
+        self._bit = bit
         self._attr_name = f"{config_entry.data[CONF_NAME]} {name}"
         self._attr_unique_id = f"{config_entry.entry_id}_{key}"
         # No device_class - will show as simple On/Off
@@ -67,32 +89,7 @@ class SPRSUNBinarySensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
-        # Get the source address for this sensor
-        source_address, bit, _ = BINARY_SENSOR_BITS[self._key]
-        
-        # Read from the appropriate register
-        # The coordinator stores these as "working_status_register", etc.
-        # Map address to data key
-        address_to_key = {
-            0x0002: "switching_input_symbol",
-            0x0003: "working_status_register",  # Special name for backward compatibility
-            0x0004: "output_symbol_1",
-            0x0005: "output_symbol_2",
-            0x0006: "output_symbol_3",
-            0x0007: "failure_symbol_1",
-            0x0008: "failure_symbol_2",
-            0x0009: "failure_symbol_3",
-            0x000A: "failure_symbol_4",
-            0x000B: "failure_symbol_5",
-            0x000C: "failure_symbol_6",
-            0x000D: "failure_symbol_7",
-        }
-        
-        register_key = address_to_key.get(source_address)
-        if not register_key:
-            return False
-        
-        cache_entry = self.coordinator.data.get(register_key)
+        cache_entry = self.coordinator.data.get(self._register_key)
         if cache_entry:
             # Handle new format (dict with value/timestamp)
             if isinstance(cache_entry, dict):
@@ -104,31 +101,111 @@ class SPRSUNBinarySensor(CoordinatorEntity, BinarySensorEntity):
             register_value = 0
         
         # Check if bit is set
-        return bool(register_value & (1 << bit))
+        return bool(register_value & (1 << self._bit))
     
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        # Get source address for availability check
-        source_address, _, _ = BINARY_SENSOR_BITS[self._key]
+        return (
+            self.coordinator.last_update_success
+            and self._register_key in self.coordinator.data
+        )
+
+
+class SPRSUNDiscreteInputSensor(CoordinatorEntity, BinarySensorEntity):
+    """Representation of a SPRSUN binary sensor (discrete input)."""
+    
+    def __init__(
+        self,
+        coordinator,
+        config_entry: ConfigEntry,
+        key: str,
+        name: str,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator)
+        
+        self._key = key
+        self._attr_name = f"{config_entry.data[CONF_NAME]} {name}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{key}"
         
-        address_to_key = {
-            0x0002: "switching_input_symbol",
-            0x0003: "working_status_register",
-            0x0004: "output_symbol_1",
-            0x0005: "output_symbol_2",
-            0x0006: "output_symbol_3",
-            0x0007: "failure_symbol_1",
-            0x0008: "failure_symbol_2",
-            0x0009: "failure_symbol_3",
-            0x000A: "failure_symbol_4",
-            0x000B: "failure_symbol_5",
-            0x000C: "failure_symbol_6",
-            0x000D: "failure_symbol_7",
+        # Device info
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": config_entry.data[CONF_NAME],
+            "manufacturer": "SPRSUN",
+            "model": "Heat Pump",
         }
+    
+    @property
+    def is_on(self) -> bool:
+        """Return true if the input is set."""
+        cache_entry = self.coordinator.data.get(self._key)
+        if isinstance(cache_entry, dict):
+            return bool(cache_entry.get("value"))
+        return bool(cache_entry)
+    
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return (
+            self.coordinator.last_update_success
+            and self._key in self.coordinator.data
+        )
+
+
+class SPRSUNAlarmSensor(CoordinatorEntity, BinarySensorEntity):
+    """Problem sensor summarizing all controller alarms (CAREL AL001-AL177)."""
+    
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    
+    def __init__(
+        self,
+        coordinator,
+        config_entry: ConfigEntry,
+        alarms: dict[int, tuple[str, str]],
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator)
         
-        register_key = address_to_key.get(source_address)
+        self._alarm_names = {code: name for code, name in alarms.values()}
+        self._attr_name = f"{config_entry.data[CONF_NAME]} Alarm"
+        self._attr_unique_id = f"{config_entry.entry_id}_alarm"
+        
+        # Device info
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": config_entry.data[CONF_NAME],
+            "manufacturer": "SPRSUN",
+            "model": "Heat Pump",
+        }
+    
+    def _active_alarms(self) -> list[str]:
+        """Return codes of active alarms from cache."""
+        cache_entry = self.coordinator.data.get("active_alarms")
+        if isinstance(cache_entry, dict):
+            return cache_entry.get("value") or []
+        return cache_entry or []
+    
+    @property
+    def is_on(self) -> bool:
+        """Return true if any alarm is active."""
+        return bool(self._active_alarms())
+    
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return active alarm codes with descriptions."""
+        return {
+            "active_alarms": [
+                f"{code} {self._alarm_names.get(code, '')}".strip()
+                for code in self._active_alarms()
+            ],
+        }
+    
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
         return (
             self.coordinator.last_update_success
-            and register_key in self.coordinator.data
+            and "active_alarms" in self.coordinator.data
         )
@@ -8,7 +8,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, REGISTERS_BUTTON
+from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,8 +21,10 @@ async def async_setup_entry(
     """Set up SPRSUN buttons."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
     
+    controller = coordinator.controller
+    
     entities = []
-    for key, (address, bit, name, description) in REGISTERS_BUTTON.items():
+    for key, (address, bit, name, description) in controller.button_registers.items():
         entities.append(
             SPRSUNButton(
                 coordinator,
@@ -35,6 +37,19 @@ async def async_setup_entry(
             )
         )
     
+    # Controllers with coils (CAREL) - coil set to 1, cleared by the controller
+    for key, (address, name, description) in controller.coil_buttons.items():
+        entities.append(
+            SPRSUNCoilButton(
+                coordinator,
+                config_entry,
+                key,
+                name,
+                address,
+                description,
+            )
+        )
+    
     async_add_entities(entities)
 
 
@@ -80,43 +95,54 @@ class SPRSUNButton(CoordinatorEntity, ButtonEntity):
     
     async def _async_trigger_bit(self) -> None:
         """Trigger momentary bit action (read-modify-write, then clear)."""
-        def _trigger():
-            client = self.coordinator.client
-            if client is None or not client.connected:
-                if not client.connect():
-                    raise ConnectionError("Cannot connect to Modbus device")
-            
-            # Read current register value
-            result = client.read_holding_registers(
-                address=self._address,
-                count=1,
-                device_id=self.coordinator.device_address
-            )
-            
-            if result.isError():
-                raise ValueError(f"Modbus read error: {result}")
-            
-            current_value = result.registers[0]
-            
-            # Set the bit (trigger action)
-            trigger_value = current_value | (1 << self._bit)
-            
-            # Write trigger value
-            result = client.write_register(
-                address=self._address,
-                value=trigger_value,
-                device_id=self.coordinator.device_address
-            )
-            
-            if result.isError():
-                raise ValueError(f"Modbus write error: {result}")
-            
-            _LOGGER.info(
-                "Triggered bit %d on register 0x%04X (was 0x%04X, triggered 0x%04X)",
-                self._bit, self._address, current_value, trigger_value
-            )
-            
-            # Note: Bit automatically clears after device processes action
-            # No need to manually clear or update cache
+        # Command register is not polled - read fresh, set the bit and write in one locked sequence
+        current_value, trigger_value = await self.coordinator.async_write_bit(self._address, self._bit, True)
+        
+        _LOGGER.info(
+            "Triggered bit %d on register 0x%04X (was 0x%04X, triggered 0x%04X)",
+            self._bit, self._address, current_value, trigger_value
+        )
+        
+        # Note: Bit automatically clears after device processes action
+        # No need to manually clear or update cache
+
+
+class SPRSUNCoilButton(CoordinatorEntity, ButtonEntity):
+    """Representation of a SPRSUN button backed by a momentary coil."""
+    
+    def __init__(
+        self,
+        coordinator,
+        config_entry: ConfigEntry,
+        key: str,
+        name: str,
+        address: int,
+        description: str,
+    ) -> None:
+        """Initialize the button."""
+        super().__init__(coordinator)
         
-        await self.hass.async_add_executor_job(_trigger)
+        self._key = key
+        self._address = address
+        self._attr_name = f"{config_entry.data[CONF_NAME]} {name}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{key}"
+        self._attr_entity_description = description
+        
+        # Device info
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": config_entry.data[CONF_NAME],
+            "manufacturer": "SPRSUN",
+            "model": "Heat Pump",
+        }
+    
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self.coordinator.last_update_success
+    
+    async def async_press(self) -> None:
+        """Handle the button press."""
+        # Momentary coil - controller clears it, nothing to cache
+        await self.coordinator.async_write_coil(self._address, True)
+        _LOGGER.info("Triggered coil %d (%s)", self._address, self._key)
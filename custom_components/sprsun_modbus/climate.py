@@ -203,45 +203,26 @@ class SPRSUNClimate(CoordinatorEntity, ClimateEntity):
     
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set HVAC mode."""
-        if hvac_mode == HVACMode.OFF:
-            # Turn off power switch (register 0x0032, bit 0)
-            await self._write_power(False)
+        # Keep +DHW if present in unit mode (P06)
+        current_mode = int(self._get_cache_value("unit_mode", 1))
+        with_dhw = current_mode in [3, 4]
         
+        if hvac_mode == HVACMode.OFF:
+            # Power switch (register 0x0032 bit 0)
+            desired = {"power_switch": False}
         elif hvac_mode == HVACMode.HEAT:
-            # Turn on power, set to heating mode
-            await self._write_power(True)
-            # Disable auto mode
-            await self.coordinator.async_write_register(
-                address=0x0191, value=0, key="mode_control_enable", scale=1
-            )
-            # Set unit mode to heating (preserve DHW if currently enabled)
-            current_mode = int(self._get_cache_value("unit_mode", 1))
-            new_mode = 3 if current_mode in [3, 4] else 1  # Keep +DHW if present
-            await self.coordinator.async_write_register(
-                address=0x00C6, value=new_mode, key="unit_mode", scale=1
-            )
-        
+            # Disable auto mode (G09), heating unit mode, power on
+            desired = {"mode_control_enable": 0, "unit_mode": 3 if with_dhw else 1, "power_switch": True}
         elif hvac_mode == HVACMode.COOL:
-            # Turn on power, set to cooling mode
-            await self._write_power(True)
-            # Disable auto mode
-            await self.coordinator.async_write_register(
-                address=0x0191, value=0, key="mode_control_enable", scale=1
-            )
-            # Set unit mode to cooling (preserve DHW if currently enabled)
-            current_mode = int(self._get_cache_value("unit_mode", 1))
-            new_mode = 4 if current_mode in [3, 4] else 2  # Keep +DHW if present
-            await self.coordinator.async_write_register(
-                address=0x00C6, value=new_mode, key="unit_mode", scale=1
-            )
-        
+            # Disable auto mode (G09), cooling unit mode, power on
+            desired = {"mode_control_enable": 0, "unit_mode": 4 if with_dhw else 2, "power_switch": True}
         elif hvac_mode == HVACMode.HEAT_COOL:
-            # Turn on power, enable auto mode (G09)
-            await self._write_power(True)
-            await self.coordinator.async_write_register(
-                address=0x0191, value=1, key="mode_control_enable", scale=1
-            )
+            # Enable auto mode (G09), power on
+            desired = {"mode_control_enable": 1, "power_switch": True}
+        else:
+            return
         
+        await self.coordinator.async_reconcile(desired)
         self.async_write_ha_state()
     
     async def async_set_temperature(self, **kwargs) -> None:
@@ -250,26 +231,11 @@ class SPRSUNClimate(CoordinatorEntity, ClimateEntity):
         if temperature is None:
             return
         
-        # Determine which setpoint to write based on current mode
+        # Heating setpoint (P01) or cooling setpoint (P02) depending on current mode
         unit_mode = int(self._get_cache_value("unit_mode", 1))
+        key = "heating_setpoint" if unit_mode in [1, 3] else "cooling_setpoint"
         
-        if unit_mode in [1, 3]:  # Heating or Heating+DHW
-            # Write heating setpoint (P01 at 0x00CC, scale 0.5)
-            await self.coordinator.async_write_register(
-                address=0x00CC,
-                value=temperature,
-                key="heating_setpoint",
-                scale=2  # 0.5°C scale means multiply by 2
-            )
-        else:  # Cooling
-            # Write cooling setpoint (P02 at 0x00CB, scale 0.5)
-            await self.coordinator.async_write_register(
-                address=0x00CB,
-                value=temperature,
-                key="cooling_setpoint",
-                scale=2
-            )
-        
+        await self.coordinator.async_reconcile({key: temperature})
         self.async_write_ha_state()
     
     async def async_set_fan_mode(self, fan_mode: str) -> None:
@@ -283,87 +249,23 @@ class SPRSUNClimate(CoordinatorEntity, ClimateEntity):
         
         value = fan_mode_map.get(fan_mode)
         if value is not None:
-            await self.coordinator.async_write_register(
-                address=0x018B,  # P07 Fan Mode
-                value=value,
-                key="fan_mode",
-                scale=1
-            )
+            await self.coordinator.async_reconcile({"fan_mode": value})
             self.async_write_ha_state()
     
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set preset mode."""
         if preset_mode == PRESET_ECO:
             # Enable automatic mode control (G09)
-            await self.coordinator.async_write_register(
-                address=0x0191,
-                value=1,
-                key="mode_control_enable",
-                scale=1
-            )
+            desired = {"mode_control_enable": 1}
         elif preset_mode == PRESET_BOOST:
-            # Set fan mode to normal (max capacity)
-            await self.async_set_fan_mode("normal")
+            # Fan mode normal (max capacity)
+            desired = {"fan_mode": 0}
         else:  # PRESET_NONE
             # Disable automatic mode control
-            await self.coordinator.async_write_register(
-                address=0x0191,
-                value=0,
-                key="mode_control_enable",
-                scale=1
-            )
+            desired = {"mode_control_enable": 0}
         
+        await self.coordinator.async_reconcile(desired)
         self.async_write_ha_state()
-    
-    async def _write_power(self, state: bool) -> None:
-        """Write power switch state (bit 0 of register 0x0032)."""
-        import time
-        
-        def _write():
-            client = self.coordinator.client
-            
-            # Ensure connection (auto-reconnect if needed)
-            self.coordinator._ensure_connection(client, "client")
-            
-            # Read current register value
-            result = client.read_holding_registers(
-                address=0x0032,
-                count=1,
-                device_id=self.coordinator.device_address
-            )
-            
-            if result.isError():
-                raise ValueError(f"Modbus read error: {result}")
-            
-            current_value = result.registers[0]
-            
-            # Modify bit 0 (power switch)
-            if state:
-                new_value = current_value | 1  # Set bit 0
-            else:
-                new_value = current_value & ~1  # Clear bit 0
-            
-            # Write back if changed
-            if new_value != current_value:
-                result = client.write_register(
-                    address=0x0032,
-                    value=new_value,
-                    device_id=self.coordinator.device_address
-                )
-                
-                if result.isError():
-                    raise ValueError(f"Modbus write error: {result}")
-                
-                _LOGGER.info("Set power to %s (register 0x0032: 0x%04X -> 0x%04X)", state, current_value, new_value)
-            
-            # Update cache with timestamp using register-based key
-            reg_key = "_control_0032"
-            self.coordinator.data[reg_key] = {
-                "value": new_value,
-                "updated_at": time.time()
-            }
-        
-        await self.hass.async_add_executor_job(_write)
 
 
 class SPRSUNDHWClimate(CoordinatorEntity, ClimateEntity):
@@ -485,43 +387,30 @@ class SPRSUNDHWClimate(CoordinatorEntity, ClimateEntity):
         
         if hvac_mode == HVACMode.OFF:
             # Disable DHW in unit mode
-            if current_mode == 0:  # DHW only
-                # Turn off power
-                await self._write_power(False)
-            elif current_mode == 3:  # Heat+DHW
-                # Switch to heating only
-                await self.coordinator.async_write_register(
-                    address=0x00C6, value=1, key="unit_mode", scale=1
-                )
-            elif current_mode == 4:  # Cool+DHW
-                # Switch to cooling only
-                await self.coordinator.async_write_register(
-                    address=0x00C6, value=2, key="unit_mode", scale=1
-                )
+            if current_mode == 0:  # DHW only - turn off power
+                desired = {"power_switch": False}
+            elif current_mode == 3:  # Heat+DHW - heating only
+                desired = {"unit_mode": 1}
+            elif current_mode == 4:  # Cool+DHW - cooling only
+                desired = {"unit_mode": 2}
+            else:
+                return
         
         elif hvac_mode == HVACMode.HEAT:
-            # Enable DHW in unit mode
-            await self._write_power(True)
-            
-            if current_mode == 1:  # Heating only
-                # Switch to Heat+DHW
-                await self.coordinator.async_write_register(
-                    address=0x00C6, value=3, key="unit_mode", scale=1
-                )
-            elif current_mode == 2:  # Cooling only
-                # Switch to Cool+DHW
-                await self.coordinator.async_write_register(
-                    address=0x00C6, value=4, key="unit_mode", scale=1
-                )
-            elif current_mode in [0, 3, 4]:
-                # DHW already enabled, just ensure power is on
-                pass
-            else:
-                # Default: DHW only
-                await self.coordinator.async_write_register(
-                    address=0x00C6, value=0, key="unit_mode", scale=1
-                )
+            # Enable DHW in unit mode, power on
+            if current_mode == 1:  # Heating only - Heat+DHW
+                desired = {"unit_mode": 3, "power_switch": True}
+            elif current_mode == 2:  # Cooling only - Cool+DHW
+                desired = {"unit_mode": 4, "power_switch": True}
+            elif current_mode in [0, 3, 4]:  # DHW already enabled
+                desired = {"power_switch": True}
+            else:  # Default: DHW only
+                desired = {"unit_mode": 0, "power_switch": True}
+        
+        else:
+            return
         
+        await self.coordinator.async_reconcile(desired)
         self.async_write_ha_state()
     
     async def async_set_temperature(self, **kwargs) -> None:
@@ -530,62 +419,6 @@ class SPRSUNDHWClimate(CoordinatorEntity, ClimateEntity):
         if temperature is None:
             return
         
-        # Write hot water setpoint (P04 at 0x00CA, scale 0.5)
-        await self.coordinator.async_write_register(
-            address=0x00CA,
-            value=temperature,
-            key="hotwater_setpoint",
-            scale=2  # 0.5°C scale means multiply by 2
-        )
-        
+        # Hot water setpoint (P04)
+        await self.coordinator.async_reconcile({"hotwater_setpoint": temperature})
         self.async_write_ha_state()
-    
-    async def _write_power(self, state: bool) -> None:
-        """Write power switch state (bit 0 of register 0x0032)."""
-        import time
-        
-        def _write():
-            client = self.coordinator.client
-            
-            # Ensure connection (auto-reconnect if needed)
-            self.coordinator._ensure_connection(client, "client")
-            
-            # Read current register value
-            result = client.read_holding_registers(
-                address=0x0032,
-                count=1,
-                device_id=self.coordinator.device_address
-            )
-            
-            if result.isError():
-                raise ValueError(f"Modbus read error: {result}")
-            
-            current_value = result.registers[0]
-            
-            # Modify bit 0 (power switch)
-            if state:
-                new_value = current_value | 1  # Set bit 0
-            else:
-                new_value = current_value & ~1  # Clear bit 0
-            
-            # Write back if changed
-            if new_value != current_value:
-                result = client.write_register(
-                    address=0x0032,
-                    value=new_value,
-                    device_id=self.coordinator.device_address
-                )
-                
-                if result.isError():
-                    raise ValueError(f"Modbus write error: {result}")
-                
-                _LOGGER.info("Set DHW power to %s (register 0x0032: 0x%04X -> 0x%04X)", state, current_value, new_value)
-            
-            # Update cache with timestamp using register-based key
-            reg_key = "_control_0032"
-            self.coordinator.data[reg_key] = {
-                "value": new_value,
-                "updated_at": time.time()
-            }
-        
-        await self.hass.async_add_executor_job(_write)
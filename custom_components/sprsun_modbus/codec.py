@@ -0,0 +1,158 @@
+"""Register data type codec for SPRSUN Heat Pump.
+
+Decodes whole read batches in one pass: the registers of a batch are packed
+back into the big-endian frame payload and unpacked with a single compiled
+struct layout. 32-bit values can be stored high word first ("big", Modbus
+convention) or low word first ("little", some gateways and controllers).
+"""
+from __future__ import annotations
+
+import math
+import struct
+from collections.abc import Iterable
+
+WORD_ORDER_BIG = "big"  # High word first
+WORD_ORDER_LITTLE = "little"  # Low word first
+
+# struct format character and width in registers per data type
+DATA_TYPES = {
+    "int16": ("h", 1),
+    "uint16": ("H", 1),
+    "int32": ("i", 2),
+    "uint32": ("I", 2),
+    "float32": ("f", 2),
+}
+
+
+def type_width(data_type: str) -> int:
+    """Return number of registers occupied by a data type."""
+    return DATA_TYPES[data_type][1]
+
+
+def registers_to_payload(registers: list[int]) -> bytes:
+    """Pack register values into the raw (big-endian) frame payload."""
+    return struct.pack(f">{len(registers)}H", *registers)
+
+
+def _swap_words(payload: bytes, byte_offsets: Iterable[int]) -> bytes:
+    """Swap the two words of each 32-bit value starting at given byte offsets."""
+    buffer = bytearray(payload)
+    for offset in byte_offsets:
+        buffer[offset:offset + 4] = buffer[offset + 2:offset + 4] + buffer[offset:offset + 2]
+    return bytes(buffer)
+
+
+def decode_value(
+    registers: list[int],
+    data_type: str,
+    word_order: str = WORD_ORDER_BIG,
+) -> int | float:
+    """Decode a single value from its registers."""
+    fmt, width = DATA_TYPES[data_type]
+    payload = registers_to_payload(registers[:width])
+    if width == 2 and word_order == WORD_ORDER_LITTLE:
+        payload = _swap_words(payload, (0,))
+    return struct.unpack(f">{fmt}", payload)[0]
+
+
+def encode_value(
+    value: int | float,
+    data_type: str,
+    word_order: str = WORD_ORDER_BIG,
+) -> list[int]:
+    """Encode a value into register words for writing.
+    
+    Integer types wrap like the controller does (negative int16 -> two's complement).
+    """
+    fmt, width = DATA_TYPES[data_type]
+    if fmt == "f":
+        payload = struct.pack(">f", float(value))
+    else:
+        bits = 16 * width
+        payload = struct.pack(f">{fmt.upper()}", int(value) & ((1 << bits) - 1))
+    if width == 2 and word_order == WORD_ORDER_LITTLE:
+        payload = _swap_words(payload, (0,))
+    return list(struct.unpack(f">{width}H", payload))
+
+
+class BatchLayout:
+    """Compiled decode layout of one read batch.
+    
+    Fields are (key, address, data_type). Several keys may share an address
+    (decoded once). Unused registers between fields become struct pad bytes,
+    so the whole batch is decoded with one unpack_from call.
+    """
+    
+    def __init__(self, start: int, count: int, fields: Iterable[tuple[str, int, str]]) -> None:
+        """Initialize."""
+        self.start = start
+        self.count = count
+        
+        # address -> (data_type, [keys])
+        slots: dict[int, tuple[str, list[str]]] = {}
+        for key, address, data_type in fields:
+            if address in slots:
+                slots[address][1].append(key)
+            else:
+                slots[address] = (data_type, [key])
+        
+        fmt = ">"
+        position = start
+        self._keys: list[list[str]] = []
+        self._swap_offsets: list[int] = []
+        for address in sorted(slots):
+            data_type, keys = slots[address]
+            char, width = DATA_TYPES[data_type]
+            if address < position or address + width > start + count:
+                raise ValueError(f"Field {keys[0]} at {address} does not fit batch {start}+{count}")
+            fmt += "x" * (2 * (address - position)) + char
+            if width == 2:
+                self._swap_offsets.append(2 * (address - start))
+            self._keys.append(keys)
+            position = address + width
+        
+        self._struct = struct.Struct(fmt)
+    
+    def decode(self, registers: list[int], word_order: str = WORD_ORDER_BIG) -> dict[str, int | float]:
+        """Decode all fields of the batch from its registers."""
+        return self.decode_payload(registers_to_payload(registers), word_order)
+    
+    def decode_payload(self, payload: bytes | memoryview, word_order: str = WORD_ORDER_BIG) -> dict[str, int | float]:
+        """Decode all fields of the batch from its raw (big-endian) payload without copying it."""
+        if word_order == WORD_ORDER_LITTLE and self._swap_offsets:
+            payload = _swap_words(payload, self._swap_offsets)
+        
+        data = {}
+        for keys, value in zip(self._keys, self._struct.unpack_from(payload)):
+            for key in keys:
+                data[key] = value
+        return data
+
+
+def detect_word_order(
+    words: dict[int, int],
+    probes: dict[int, tuple[str, float, float]],
+) -> str | None:
+    """Pick the word order under which known 32-bit values look plausible.
+    
+    Args:
+        words: Raw register values by address
+        probes: address: (data_type, min, max) of values with a known range
+    
+    Returns:
+        Detected word order, or None if the values can't tell (e.g. all zero)
+    """
+    scores = {WORD_ORDER_BIG: 0, WORD_ORDER_LITTLE: 0}
+    for address, (data_type, low, high) in probes.items():
+        registers = [words.get(address), words.get(address + 1)]
+        # Zero (or symmetric) words decode identically in both orders - no evidence
+        if None in registers or registers[0] == registers[1]:
+            continue
+        for word_order in scores:
+            value = decode_value(registers, data_type, word_order)
+            if not math.isnan(value) and low <= value <= high:
+                scores[word_order] += 1
+    
+    if scores[WORD_ORDER_BIG] == scores[WORD_ORDER_LITTLE]:
+        return None
+    return max(scores, key=scores.get)
@@ -6,11 +6,10 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_NAME
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.data_entry_flow import FlowResult
+from homeassistant.data_entry_flow import AbortFlow, FlowResult
 import homeassistant.helpers.config_validation as cv
 
-from pymodbus.client import ModbusTcpClient
-
+from .connection import create_client, describe_endpoint
 from .const import (
     DOMAIN,
     DEFAULT_NAME,
@@ -18,55 +17,125 @@ from .const import (
     DEFAULT_DEVICE_ADDRESS,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_TIMEOUT,
+    DEFAULT_SERIAL_PORT,
+    DEFAULT_BAUDRATE,
+    DEFAULT_PARITY,
+    DEFAULT_STOPBITS,
+    BAUDRATES,
+    PARITIES,
     CONF_DEVICE_ADDRESS,
     CONF_SCAN_INTERVAL,
     CONF_CONTROLLER_TYPE,
+    CONF_IO_WORKER,
+    CONF_SNAPSHOT_FILE,
+    CONF_HISTORY_LOG,
+    CONF_STATISTICS_IMPORT,
+    CONF_DEADBAND,
+    CONF_GROUP_INTERVALS,
+    CONF_FIRMWARE,
+    CONF_TRANSPORT,
+    CONF_SERIAL_PORT,
+    CONF_BAUDRATE,
+    CONF_PARITY,
+    CONF_STOPBITS,
+    CONF_FRAMER,
+    FRAMER_AUTO,
+    FRAMER_SOCKET,
+    FRAMER_RTU,
+    FRAMERS,
+    FRAMER_PROBE_SAMPLES,
+    TRANSPORT_TCP,
+    TRANSPORT_SERIAL,
+    TRANSPORT_UDP,
+    MAX_GROUP_INTERVAL,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _probe_latency(config: dict[str, Any]) -> float | None:
+    """Measure average response time with given transport settings (runs in executor).
+    
+    Returns smoothed latency in seconds, or None if the device did not answer.
+    """
+    client = create_client(config, name=f"probe-{config.get(CONF_FRAMER)}")
+    client.begin_cycle(budget=0)  # Wrong framer just times out - don't retry it
+    try:
+        if not client.connect():
+            return None
+        for _ in range(FRAMER_PROBE_SAMPLES):
+            result = client.read_holding_registers(
+                address=0x0000,
+                count=1,
+                device_id=config[CONF_DEVICE_ADDRESS]
+            )
+            if result.isError():
+                return None
+        return client.latency.srtt
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Probe with framer %s failed: %s", config.get(CONF_FRAMER), err)
+        return None
+    finally:
+        client.close()
+
+
+def _detect_framer(config: dict[str, Any]) -> str:
+    """Pick the framer the gateway answers to, preferring the lower latency one.
+    
+    Gateway mode (MBAP) and transparent mode (raw RTU) can't be told apart
+    from outside, so both are probed and their latency compared.
+    """
+    latencies = {}
+    for framer in (FRAMER_SOCKET, FRAMER_RTU):
+        latency = _probe_latency({**config, CONF_FRAMER: framer})
+        if latency is not None:
+            latencies[framer] = latency
+            _LOGGER.info("Framer %s: %.0fms average response", framer, latency * 1000)
+        else:
+            _LOGGER.info("Framer %s: no response", framer)
+    
+    if not latencies:
+        raise ConnectionError("Device did not answer with Modbus TCP or RTU over TCP framing")
+    
+    return min(latencies, key=latencies.get)
+
+
 async def validate_connection(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
-    host = data[CONF_HOST]
-    port = data[CONF_PORT]
     device_address = data[CONF_DEVICE_ADDRESS]
     
     def _test_connection_and_detect():
         """Test connection and detect controller type in executor."""
         from .controllers import detect_controller_type
         
-        client = ModbusTcpClient(host=host, port=port, timeout=5)
+        config = dict(data)
+        if config.get(CONF_TRANSPORT) == TRANSPORT_TCP and config.get(CONF_FRAMER) == FRAMER_AUTO:
+            config[CONF_FRAMER] = _detect_framer(config)
+        
+        # Adaptive timeout: probe reads after the first one use learned latency
+        client = create_client(config, name="setup")
+        client.begin_cycle()
         try:
             if not client.connect():
                 raise ConnectionError("Cannot connect to Modbus device")
             
-            # Try to read first register as test
-            result = client.read_holding_registers(
-                address=0x0000,
-                count=1,
-                device_id=device_address
-            )
-            
-            if result.isError():
-                raise ConnectionError(f"Modbus read error: {result}")
-            
-            # Auto-detect controller type
-            controller_type = detect_controller_type(client, device_address)
+            # One combined signature probe - also proves the device answers
+            detected = detect_controller_type(client, device_address)
             
-            if controller_type is None:
+            if detected is None:
                 _LOGGER.warning(
                     "Could not auto-detect controller type, defaulting to CHICO"
                 )
-                controller_type = "chico"
-            
-            return controller_type
+                detected = ("chico", None)
             
+            controller_type, firmware = detected
+            return controller_type, firmware, config.get(CONF_FRAMER)
+        
         finally:
             client.close()
     
     try:
-        controller_type = await hass.async_add_executor_job(_test_connection_and_detect)
+        controller_type, firmware, framer = await hass.async_add_executor_job(_test_connection_and_detect)
     except Exception as err:
         _LOGGER.error("Connection test failed: %s", err)
         raise ConnectionError(f"Cannot connect: {err}") from err
@@ -74,6 +143,8 @@ async def validate_connection(hass: HomeAssistant, data: dict[str, Any]) -> dict
     return {
         "title": data[CONF_NAME],
         "controller_type": controller_type,
+        "firmware": firmware,
+        "framer": framer,
     }
 
 
@@ -85,42 +156,32 @@ class SPRSUNConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the initial step."""
+        """Handle the initial step - choose transport."""
+        return self.async_show_menu(
+            step_id="user",
+            menu_options=[TRANSPORT_TCP, TRANSPORT_UDP, TRANSPORT_SERIAL],
+        )
+    
+    async def async_step_tcp(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle Modbus TCP (Elfin gateway) connection."""
         errors = {}
         
         if user_input is not None:
-            try:
-                info = await validate_connection(self.hass, user_input)
-                
-                # Check if already configured
-                await self.async_set_unique_id(
-                    f"{user_input[CONF_HOST]}:{user_input[CONF_PORT]}"
-                )
-                self._abort_if_unique_id_configured()
-                
-                # Add controller type to user input
-                user_input[CONF_CONTROLLER_TYPE] = info["controller_type"]
-                
-                _LOGGER.info(
-                    "Detected %s controller at %s:%s",
-                    info["controller_type"].upper(),
-                    user_input[CONF_HOST],
-                    user_input[CONF_PORT]
-                )
-                
-                return self.async_create_entry(title=info["title"], data=user_input)
-                
-            except ConnectionError:
-                errors["base"] = "cannot_connect"
-            except Exception:  # pylint: disable=broad-except
-                _LOGGER.exception("Unexpected exception")
-                errors["base"] = "unknown"
+            user_input[CONF_TRANSPORT] = TRANSPORT_TCP
+            result = await self._async_create_entry(
+                user_input, f"{user_input[CONF_HOST]}:{user_input[CONF_PORT]}", errors
+            )
+            if result is not None:
+                return result
         
         data_schema = vol.Schema(
             {
                 vol.Required(CONF_NAME, default=DEFAULT_NAME): str,
                 vol.Required(CONF_HOST): str,
                 vol.Required(CONF_PORT, default=DEFAULT_PORT): cv.port,
+                vol.Required(CONF_FRAMER, default=FRAMER_AUTO): vol.In(FRAMERS),
                 vol.Required(CONF_DEVICE_ADDRESS, default=DEFAULT_DEVICE_ADDRESS): vol.All(
                     vol.Coerce(int), vol.Range(min=1, max=247)
                 ),
@@ -131,7 +192,7 @@ class SPRSUNConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
         
         return self.async_show_form(
-            step_id="user",
+            step_id="tcp",
             data_schema=data_schema,
             errors=errors,
             description_placeholders={
@@ -140,6 +201,126 @@ class SPRSUNConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }
         )
     
+    async def async_step_udp(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle Modbus UDP (gateway) connection."""
+        errors = {}
+        
+        if user_input is not None:
+            user_input[CONF_TRANSPORT] = TRANSPORT_UDP
+            result = await self._async_create_entry(
+                user_input, f"{user_input[CONF_HOST]}:{user_input[CONF_PORT]}", errors
+            )
+            if result is not None:
+                return result
+        
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_NAME, default=DEFAULT_NAME): str,
+                vol.Required(CONF_HOST): str,
+                vol.Required(CONF_PORT, default=DEFAULT_PORT): cv.port,
+                vol.Required(CONF_DEVICE_ADDRESS, default=DEFAULT_DEVICE_ADDRESS): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=247)
+                ),
+                vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+                    vol.Coerce(int), vol.Range(min=5, max=300)
+                ),
+            }
+        )
+        
+        return self.async_show_form(
+            step_id="udp",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders={
+                "recommended_scan": str(DEFAULT_SCAN_INTERVAL),
+            }
+        )
+    
+    async def async_step_serial(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle direct Modbus RTU (USB-RS485 adapter) connection."""
+        errors = {}
+        
+        if user_input is not None:
+            user_input[CONF_TRANSPORT] = TRANSPORT_SERIAL
+            user_input[CONF_BAUDRATE] = int(user_input[CONF_BAUDRATE])
+            user_input[CONF_STOPBITS] = int(user_input[CONF_STOPBITS])
+            result = await self._async_create_entry(
+                user_input,
+                f"{user_input[CONF_SERIAL_PORT]}:{user_input[CONF_DEVICE_ADDRESS]}",
+                errors,
+            )
+            if result is not None:
+                return result
+        
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_NAME, default=DEFAULT_NAME): str,
+                vol.Required(CONF_SERIAL_PORT, default=DEFAULT_SERIAL_PORT): str,
+                vol.Required(CONF_BAUDRATE, default=str(DEFAULT_BAUDRATE)): vol.In(
+                    [str(baudrate) for baudrate in BAUDRATES]
+                ),
+                vol.Required(CONF_PARITY, default=DEFAULT_PARITY): vol.In(PARITIES),
+                vol.Required(CONF_STOPBITS, default=str(DEFAULT_STOPBITS)): vol.In(["1", "2"]),
+                vol.Required(CONF_DEVICE_ADDRESS, default=DEFAULT_DEVICE_ADDRESS): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=247)
+                ),
+                vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+                    vol.Coerce(int), vol.Range(min=5, max=300)
+                ),
+            }
+        )
+        
+        return self.async_show_form(
+            step_id="serial",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders={
+                "recommended_scan": str(DEFAULT_SCAN_INTERVAL),
+            }
+        )
+    
+    async def _async_create_entry(
+        self, user_input: dict[str, Any], unique_id: str, errors: dict[str, str]
+    ) -> FlowResult | None:
+        """Validate connection and create entry, filling errors on failure."""
+        try:
+            info = await validate_connection(self.hass, user_input)
+            
+            # Check if already configured
+            await self.async_set_unique_id(unique_id)
+            self._abort_if_unique_id_configured()
+            
+            # Add controller type, firmware (and detected framer for TCP) to user input
+            # so setup never has to detect again
+            user_input[CONF_CONTROLLER_TYPE] = info["controller_type"]
+            if info["firmware"] is not None:
+                user_input[CONF_FIRMWARE] = info["firmware"]
+            if info["framer"] is not None:
+                user_input[CONF_FRAMER] = info["framer"]
+            
+            _LOGGER.info(
+                "Detected %s controller (firmware %s) at %s",
+                info["controller_type"].upper(),
+                info["firmware"],
+                describe_endpoint(user_input)
+            )
+            
+            return self.async_create_entry(title=info["title"], data=user_input)
+        
+        except AbortFlow:
+            raise
+        except ConnectionError:
+            errors["base"] = "cannot_connect"
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected exception")
+            errors["base"] = "unknown"
+        
+        return None
+    
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -153,29 +334,57 @@ class SPRSUNOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
         self.config_entry = config_entry
+        self._options: dict[str, Any] = {}
+    
+    def _current(self) -> dict[str, Any]:
+        """Return current option values (defaults for options the entry predates)."""
+        data = self.config_entry.data
+        current = {
+            CONF_SCAN_INTERVAL: data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            CONF_IO_WORKER: data.get(CONF_IO_WORKER, False),
+            CONF_SNAPSHOT_FILE: data.get(CONF_SNAPSHOT_FILE, False),
+            CONF_HISTORY_LOG: data.get(CONF_HISTORY_LOG, False),
+            CONF_STATISTICS_IMPORT: data.get(CONF_STATISTICS_IMPORT, False),
+            CONF_DEADBAND: data.get(CONF_DEADBAND, True),
+        }
+        current.update((option, data.get(option, 0)) for option in CONF_GROUP_INTERVALS.values())
+        return current
     
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
         if user_input is not None:
-            # Update config entry data (not options, for simplicity)
-            self.hass.config_entries.async_update_entry(
-                self.config_entry,
-                data={**self.config_entry.data, **user_input}
-            )
-            # Reload the integration to apply changes
-            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
-            return self.async_create_entry(title="", data={})
+            self._options.update(user_input)
+            return await self.async_step_scan_intervals()
         
+        current = self._current()
         data_schema = vol.Schema(
             {
                 vol.Optional(
                     CONF_SCAN_INTERVAL,
-                    default=self.config_entry.data.get(
-                        CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-                    ),
+                    default=current[CONF_SCAN_INTERVAL],
                 ): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+                vol.Optional(
+                    CONF_IO_WORKER,
+                    default=current[CONF_IO_WORKER],
+                ): bool,
+                vol.Optional(
+                    CONF_SNAPSHOT_FILE,
+                    default=current[CONF_SNAPSHOT_FILE],
+                ): bool,
+                vol.Optional(
+                    CONF_HISTORY_LOG,
+                    default=current[CONF_HISTORY_LOG],
+                ): bool,
+                vol.Optional(
+                    CONF_STATISTICS_IMPORT,
+                    default=current[CONF_STATISTICS_IMPORT],
+                ): bool,
+                vol.Optional(
+                    CONF_DEADBAND,
+                    default=current[CONF_DEADBAND],
+                ): bool,
             }
         )
         
@@ -184,6 +393,51 @@ class SPRSUNOptionsFlowHandler(config_entries.OptionsFlow):
             data_schema=data_schema,
             description_placeholders={
                 "elfin_timeout": str(DEFAULT_TIMEOUT),
-                "current_interval": str(self.config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)),
+                "current_interval": str(current[CONF_SCAN_INTERVAL]),
             }
         )
+    
+    async def async_step_scan_intervals(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage scan intervals per register group (0 = scan interval)."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            for option, seconds in user_input.items():
+                if 0 < seconds < 5:
+                    errors[option] = "interval_too_short"
+            if not errors:
+                self._options.update(user_input)
+                self._store_options()
+                return self.async_create_entry(title="", data={})
+        
+        current = {**self._current(), **(user_input or {})}
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    option,
+                    default=current[option],
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_GROUP_INTERVAL))
+                for option in CONF_GROUP_INTERVALS.values()
+            }
+        )
+        
+        return self.async_show_form(
+            step_id="scan_intervals",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders={
+                "scan_interval": str(self._options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)),
+            }
+        )
+    
+    def _store_options(self) -> None:
+        """Store changed options (the entry's update listener applies them)."""
+        current = self._current()
+        changed = {option: value for option, value in self._options.items() if current.get(option) != value}
+        if changed:
+            # Update config entry data (not options, for simplicity)
+            self.hass.config_entries.async_update_entry(
+                self.config_entry,
+                data={**self.config_entry.data, **changed}
+            )
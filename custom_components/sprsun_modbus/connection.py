@@ -0,0 +1,385 @@
+"""Modbus connection management for SPRSUN Heat Pump.
+
+Wraps the pymodbus synchronous client with:
+- Adaptive timeouts learned from observed latency (TCP RTO style)
+- A bounded retry budget per poll cycle
+- A circuit breaker that backs off with jitter while the gateway is down
+"""
+from __future__ import annotations
+
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from pymodbus.client import ModbusSerialClient, ModbusTcpClient, ModbusUdpClient
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+from pymodbus.framer import FramerType
+
+from .const import (
+    CONF_TRANSPORT,
+    CONF_SERIAL_PORT,
+    CONF_BAUDRATE,
+    CONF_PARITY,
+    CONF_STOPBITS,
+    CONF_FRAMER,
+    FRAMER_SOCKET,
+    FRAMER_RTU,
+    TRANSPORT_TCP,
+    TRANSPORT_SERIAL,
+    TRANSPORT_UDP,
+    DEFAULT_BAUDRATE,
+    DEFAULT_PARITY,
+    DEFAULT_STOPBITS,
+    GATEWAY_OVERHEAD,
+    TIMEOUT_INITIAL,
+    TIMEOUT_MIN,
+    TIMEOUT_MAX,
+    RETRY_BUDGET,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_BASE_DELAY,
+    BREAKER_MAX_DELAY,
+)
+from .planner import BatchCostModel
+from .snapshot import AREA_COILS, AREA_DISCRETE
+
+if TYPE_CHECKING:
+    from pymodbus.client.base import ModbusBaseSyncClient
+    
+    from .snapshot import SnapshotWriter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LatencyEstimator:
+    """Smoothed round-trip time estimate and derived timeout (RFC 6298).
+    
+    timeout = srtt + k * rttvar, clamped to [min_timeout, max_timeout].
+    Each timeout doubles the current value until a fresh sample arrives.
+    """
+    
+    ALPHA = 1 / 8  # srtt gain
+    BETA = 1 / 4  # rttvar gain
+    K = 4  # deviation multiplier
+    
+    def __init__(
+        self,
+        initial_timeout: float = TIMEOUT_INITIAL,
+        min_timeout: float = TIMEOUT_MIN,
+        max_timeout: float = TIMEOUT_MAX,
+    ) -> None:
+        """Initialize."""
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self._timeout = initial_timeout
+    
+    @property
+    def timeout(self) -> float:
+        """Return current timeout in seconds."""
+        return self._timeout
+    
+    def add_sample(self, rtt: float) -> None:
+        """Update estimate with a measured transaction round-trip time."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        
+        self._timeout = min(
+            self.max_timeout,
+            max(self.min_timeout, self.srtt + self.K * self.rttvar),
+        )
+    
+    def on_timeout(self) -> None:
+        """Back off after a timeout (lost frame or slow gateway)."""
+        self._timeout = min(self.max_timeout, self._timeout * 2)
+
+
+class CircuitBreaker:
+    """Stop hammering a dead gateway with reconnects.
+    
+    After `failure_threshold` consecutive failed cycles the breaker opens and
+    rejects attempts for an exponentially growing delay with full jitter.
+    Once the delay passes one trial attempt is allowed (half-open).
+    """
+    
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        base_delay: float = BREAKER_BASE_DELAY,
+        max_delay: float = BREAKER_MAX_DELAY,
+    ) -> None:
+        """Initialize."""
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failures = 0
+        self._open_until = 0.0
+    
+    @property
+    def is_open(self) -> bool:
+        """Return True if attempts are currently rejected."""
+        return time.monotonic() < self._open_until
+    
+    @property
+    def retry_in(self) -> float:
+        """Return seconds until next attempt is allowed."""
+        return max(0.0, self._open_until - time.monotonic())
+    
+    def allow(self) -> bool:
+        """Return True if an attempt may be made now."""
+        return not self.is_open
+    
+    def record_success(self) -> None:
+        """Close the breaker."""
+        if self.failures >= self.failure_threshold:
+            _LOGGER.info("Gateway reachable again, closing circuit breaker")
+        self.failures = 0
+        self._open_until = 0.0
+    
+    def record_failure(self) -> None:
+        """Count a failure, open the breaker once threshold is reached."""
+        self.failures += 1
+        if self.failures < self.failure_threshold:
+            return
+        
+        exponent = self.failures - self.failure_threshold
+        ceiling = min(self.max_delay, self.base_delay * (2 ** exponent))
+        delay = random.uniform(self.base_delay / 2, ceiling)  # Jitter spreads reconnects
+        self._open_until = time.monotonic() + delay
+        _LOGGER.warning(
+            "Gateway unreachable (%d consecutive failures), backing off %.0fs",
+            self.failures, delay
+        )
+
+
+class ModbusConnection:
+    """pymodbus sync client wrapper with adaptive timeout and retry budget.
+    
+    Exposes the subset of the pymodbus client API used by the integration,
+    so controllers and entities can use it as a drop-in client.
+    The wrapped client must be created with retries=0 - retries are
+    handled here against the per-cycle budget.
+    """
+    
+    def __init__(
+        self,
+        client: ModbusBaseSyncClient,
+        name: str = "client",
+        transport: str = TRANSPORT_TCP,
+        cost_model: BatchCostModel | None = None,
+        framer: str = FRAMER_SOCKET,
+    ) -> None:
+        """Initialize."""
+        self._client = client
+        self.name = name
+        self.transport = transport
+        self.framer = framer
+        self.cost_model = cost_model or BatchCostModel.from_serial(
+            DEFAULT_BAUDRATE, 8, DEFAULT_PARITY, DEFAULT_STOPBITS, overhead=GATEWAY_OVERHEAD
+        )
+        self.latency = LatencyEstimator()
+        self.reconnect_count = 0
+        self.timeout_count = 0
+        self._has_connected = False
+        self._budget = RETRY_BUDGET
+        self._exhausted = False
+        # Stages every successful read for the next published snapshot (worker mode)
+        self.recorder: SnapshotWriter | None = None
+        self._apply_timeout()
+    
+    @property
+    def needs_keepalive(self) -> bool:
+        """Return True if the link is dropped by the gateway when idle."""
+        return self.transport == TRANSPORT_TCP
+    
+    @property
+    def connected(self) -> bool:
+        """Return True if underlying socket is open."""
+        return self._client.connected
+    
+    def connect(self) -> bool:
+        """Connect (or reconnect) the underlying client."""
+        if self._client.connected:
+            return True
+        self._apply_timeout()
+        if not self._client.connect():
+            return False
+        if self._has_connected:
+            self.reconnect_count += 1
+        self._has_connected = True
+        return True
+    
+    def close(self) -> None:
+        """Close the underlying client."""
+        self._client.close()
+    
+    def begin_cycle(self, budget: int = RETRY_BUDGET) -> None:
+        """Reset retry budget at the start of a poll cycle or write."""
+        self._budget = budget
+        self._exhausted = False
+    
+    def read_holding_registers(self, address: int, count: int = 1, device_id: int = 1):
+        """Read holding registers (FC03)."""
+        result = self._execute(
+            self._client.read_holding_registers, address, count=count, device_id=device_id
+        )
+        if self.recorder is not None and not result.isError():
+            self.recorder.store_words(address, result.registers)
+        return result
+    
+    def read_input_registers(self, address: int, count: int = 1, device_id: int = 1):
+        """Read input registers (FC04)."""
+        return self._execute(
+            self._client.read_input_registers, address, count=count, device_id=device_id
+        )
+    
+    def read_coils(self, address: int, count: int = 1, device_id: int = 1):
+        """Read coils (FC01)."""
+        result = self._execute(
+            self._client.read_coils, address, count=count, device_id=device_id
+        )
+        if self.recorder is not None and not result.isError():
+            self.recorder.store_bits(AREA_COILS, address, result.bits[:count])
+        return result
+    
+    def read_discrete_inputs(self, address: int, count: int = 1, device_id: int = 1):
+        """Read discrete inputs (FC02)."""
+        result = self._execute(
+            self._client.read_discrete_inputs, address, count=count, device_id=device_id
+        )
+        if self.recorder is not None and not result.isError():
+            self.recorder.store_bits(AREA_DISCRETE, address, result.bits[:count])
+        return result
+    
+    def write_register(self, address: int, value: int, device_id: int = 1):
+        """Write single register (FC06)."""
+        return self._execute(
+            self._client.write_register, address, value, device_id=device_id
+        )
+    
+    def write_registers(self, address: int, values: list[int], device_id: int = 1):
+        """Write multiple registers (FC16)."""
+        return self._execute(
+            self._client.write_registers, address, values, device_id=device_id
+        )
+    
+    def write_coil(self, address: int, value: bool, device_id: int = 1):
+        """Write single coil (FC05)."""
+        return self._execute(
+            self._client.write_coil, address, value, device_id=device_id
+        )
+    
+    def _apply_timeout(self) -> None:
+        """Push current adaptive timeout to the client (read on every recv)."""
+        self._client.comm_params.timeout_connect = self.latency.timeout
+        if self.transport == TRANSPORT_UDP and self._client.socket is not None:
+            # UDP client only applies the timeout when the socket is created
+            self._client.socket.settimeout(self.latency.timeout)
+    
+    def _execute(self, method, *args, **kwargs):
+        """Run one transaction, timing it and retrying timeouts within budget."""
+        if self._exhausted:
+            # Gateway already failed this cycle - fail fast instead of waiting again
+            raise ModbusIOException("Retry budget exhausted for this cycle")
+        
+        while True:
+            self._apply_timeout()
+            start = time.monotonic()
+            try:
+                result = method(*args, **kwargs)
+            except ModbusIOException:
+                self.timeout_count += 1
+                self.latency.on_timeout()
+                if self._budget <= 0:
+                    self._exhausted = True
+                    raise
+                self._budget -= 1
+                _LOGGER.debug(
+                    "%s: timeout, retrying with %.2fs (budget left %d)",
+                    self.name, self.latency.timeout, self._budget
+                )
+                continue
+            except ConnectionException:
+                # Socket dropped (gateway idle timeout, restart) - reconnect within budget
+                self._client.close()
+                if self._budget <= 0:
+                    self._exhausted = True
+                    raise
+                self._budget -= 1
+                if not self.connect():
+                    self._exhausted = True
+                    raise
+                continue
+            
+            # Exception responses are real round-trips too
+            self.latency.add_sample(time.monotonic() - start)
+            return result
+
+
+def create_client(config: dict[str, Any], name: str = "client") -> ModbusConnection:
+    """Create connection for a config entry's transport settings.
+    
+    TCP and UDP go through the Elfin gateway (gateway line settings unknown,
+    SPRSUN defaults assumed for the cost model). Serial talks RTU directly to
+    the heat pump over a USB-RS485 adapter.
+    """
+    transport = config.get(CONF_TRANSPORT, TRANSPORT_TCP)
+    
+    if transport == TRANSPORT_SERIAL:
+        baudrate = config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE)
+        parity = config.get(CONF_PARITY, DEFAULT_PARITY)
+        stopbits = config.get(CONF_STOPBITS, DEFAULT_STOPBITS)
+        client = ModbusSerialClient(
+            port=config[CONF_SERIAL_PORT],
+            baudrate=baudrate,
+            bytesize=8,
+            parity=parity,
+            stopbits=stopbits,
+            timeout=TIMEOUT_INITIAL,
+            retries=0,  # Retries handled by ModbusConnection retry budget
+        )
+        cost_model = BatchCostModel.from_serial(baudrate, 8, parity, stopbits)
+        return ModbusConnection(client, name, TRANSPORT_SERIAL, cost_model)
+    
+    if transport == TRANSPORT_UDP:
+        # Responses matched to requests by MBAP transaction id (late datagrams are skipped),
+        # lost datagrams are retransmitted by ModbusConnection within the retry budget
+        client = ModbusUdpClient(
+            host=config[CONF_HOST],
+            port=config[CONF_PORT],
+            timeout=TIMEOUT_INITIAL,
+            retries=0,
+        )
+        return ModbusConnection(client, name, TRANSPORT_UDP)
+    
+    # RTU over TCP: gateway in transparent mode forwards raw RTU frames (no MBAP conversion)
+    framer = config.get(CONF_FRAMER, FRAMER_SOCKET)
+    client = ModbusTcpClient(
+        host=config[CONF_HOST],
+        port=config[CONF_PORT],
+        framer=FramerType.RTU if framer == FRAMER_RTU else FramerType.SOCKET,
+        timeout=TIMEOUT_INITIAL,  # Adapted to observed latency after first replies
+        retries=0,  # Retries handled by ModbusConnection retry budget
+    )
+    return ModbusConnection(client, name, TRANSPORT_TCP, framer=framer)
+
+
+def describe_endpoint(config: dict[str, Any]) -> str:
+    """Return human readable endpoint for logs."""
+    if config.get(CONF_TRANSPORT, TRANSPORT_TCP) == TRANSPORT_SERIAL:
+        return (
+            f"{config[CONF_SERIAL_PORT]} "
+            f"({config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE)} "
+            f"8{config.get(CONF_PARITY, DEFAULT_PARITY)}{config.get(CONF_STOPBITS, DEFAULT_STOPBITS)})"
+        )
+    if config.get(CONF_TRANSPORT) == TRANSPORT_UDP:
+        return f"{config[CONF_HOST]}:{config[CONF_PORT]} (UDP)"
+    if config.get(CONF_FRAMER, FRAMER_SOCKET) == FRAMER_RTU:
+        return f"{config[CONF_HOST]}:{config[CONF_PORT]} (RTU over TCP)"
+    return f"{config[CONF_HOST]}:{config[CONF_PORT]}"
@@ -1,16 +1,54 @@
 """Controller abstraction for different heat pump controller types."""
 from __future__ import annotations
 
+import logging
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
+from pymodbus.pdu import ExceptionResponse
+
+from ..codec import WORD_ORDER_BIG, decode_value, encode_value
+from ..const import DETECT_MAX_GAP
+from ..planner import plan_batches
+
 if TYPE_CHECKING:
     from pymodbus.client import ModbusTcpClient
+    
+    from ..register_map import RegisterMap
+
+_LOGGER = logging.getLogger(__name__)
 
 
 class ControllerBase(ABC):
     """Base class for heat pump controllers."""
     
+    # Declarative register map (registers/<model>.json), None for hand-written controllers
+    register_map: RegisterMap | None = None
+    
+    # Entity tables used by the platforms (compiled from the register map).
+    # Register bitfield tables are CHICO style, coil/discrete input tables CAREL style.
+    sensor_registers: dict = {}  # address: (key, name, scale, unit, device_class)
+    binary_sensor_bits: dict = {}  # key: (address, bit, name)
+    bit_registers: dict = {}  # address: cache key of the bitfield register
+    discrete_inputs: dict = {}  # key: (address, name)
+    alarm_inputs: dict = {}  # address: (code, name)
+    number_registers: dict = {}  # address: (key, name, scale, unit, min, max, step, device_class)
+    select_registers: dict = {}  # address: (key, name, options)
+    switch_registers: dict = {}  # key: (address, bit, name, coil)
+    coil_switches: dict = {}  # key: (address, name)
+    button_registers: dict = {}  # key: (address, bit, name, description)
+    coil_buttons: dict = {}  # key: (address, name, description)
+    curves: dict = {}  # key: (name, input key, ambient keys, target keys)
+    
+    # Largest run of unused registers worth reading as padding between batches
+    max_read_gap: int = 0
+    
+    # Word order of 32-bit values ("big"/"little"), None until known for the device
+    word_order: str | None = None
+    
+    # Cache keys to poll (None = every register of the map), see polling.py
+    poll_keys: frozenset[str] | None = None
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -35,11 +73,21 @@ class ControllerBase(ABC):
             client: Modbus client
             device_address: Device address (1-247)
             initial_read: True if this is the first read (include RW registers)
-            
+        
         Returns:
             Dictionary of register values keyed by register name
         """
     
+    def read_plan(self, tiers: tuple[str, ...], max_gap: int) -> list:
+        """Return batch layouts of the holding registers to poll in the given tiers."""
+        if self.poll_keys is None:
+            return self.register_map.read_plan(tiers, max_gap)
+        keys = frozenset(
+            register.key for register in self.register_map.registers
+            if register.tier in tiers and register.key in self.poll_keys
+        )
+        return self.register_map.key_plan(keys, max_gap)
+    
     @abstractmethod
     def write_register(
         self,
@@ -56,11 +104,47 @@ class ControllerBase(ABC):
             device_address: Device address
             address: Register address
             value: Value to write
-            
+        
         Returns:
             True if successful
         """
     
+    def encode_register(self, address: int, value: int) -> list[int]:
+        """
+        Encode a raw (already scaled) value into register words for writing.
+        
+        Uses the register's data type from the register map (default: single
+        16-bit register, negative values as two's complement).
+        
+        Args:
+            address: Register address
+            value: Raw integer value
+        
+        Returns:
+            Register words (one word = FC06, more = FC16)
+        """
+        if self.register_map is None:
+            return [value & 0xFFFF]
+        return encode_value(
+            value,
+            self.register_map.data_type(address),
+            self.word_order or WORD_ORDER_BIG,
+        )
+    
+    def decode_register(self, address: int, registers: list[int]) -> int | float:
+        """
+        Decode register words read from address into a raw (unscaled) value.
+        
+        Args:
+            address: Register address
+            registers: Register words starting at address
+        
+        Returns:
+            Raw value according to the register's data type
+        """
+        data_type = self.register_map.data_type(address) if self.register_map else "uint16"
+        return decode_value(registers, data_type, self.word_order or WORD_ORDER_BIG)
+    
     @abstractmethod
     def get_platforms(self) -> list[str]:
         """Return list of supported platforms for this controller."""
@@ -69,47 +153,107 @@ class ControllerBase(ABC):
     def get_device_info(self, entry_id: str) -> dict:
         """Return device info dict for Home Assistant."""
     
+    # Signature registers read by the combined auto-detection probe
+    signature_addresses: tuple[int, ...] = ()
+    
+    # Breaks equal detection scores (higher wins)
+    signature_priority: int = 0
+    
     @classmethod
     @abstractmethod
-    def detect(cls, client: ModbusTcpClient, device_address: int) -> bool:
+    def score_signature(cls, words: dict[int, int]) -> tuple[int, str | None]:
         """
-        Detect if this controller type is present.
+        Score how well the signature register values match this controller.
         
         Args:
-            client: Modbus client
-            device_address: Device address to check
-            
+            words: Raw register values by address (absent if the read failed)
+        
         Returns:
-            True if this controller is detected
+            (score, firmware version) - score 0 means no evidence for this controller
         """
 
 
 def detect_controller_type(
     client: ModbusTcpClient, 
     device_address: int
-) -> str | None:
+) -> tuple[str, str | None] | None:
     """
-    Auto-detect controller type by reading identification registers.
+    Auto-detect controller type with one combined signature probe.
+    
+    Signature registers of all controllers are merged into as few reads as
+    possible (no retries - a register the device doesn't have should not
+    cost a retry), then every controller scores the response.
+    A device that answers any probe read is reachable, so no separate
+    connection test read is needed.
     
     Args:
         client: Modbus client
         device_address: Device address
-        
+    
     Returns:
-        Controller type string ("chico" or "carel") or None if detection failed
+        (controller type, firmware version) or None if no controller matched
+    
+    Raises:
+        ConnectionError: If the device answered none of the probe reads
     """
     from .chico import ChicoController
     from .carel import CarelController
     
-    # Try detection in order
-    for controller_class in [ChicoController, CarelController]:
+    controller_classes = [ChicoController, CarelController]
+    
+    addresses = set()
+    for controller_class in controller_classes:
+        addresses.update(controller_class.signature_addresses)
+    
+    words = {}
+    answered = False
+    for start_addr, count in plan_batches(addresses, DETECT_MAX_GAP):
+        # A silent "no such register" must not exhaust the probe of the other controller
+        client.begin_cycle(budget=0)
         try:
-            if controller_class.detect(client, device_address):
-                return controller_class().name.lower()
-        except Exception:
+            result = client.read_holding_registers(
+                address=start_addr,
+                count=count,
+                device_id=device_address
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Detection probe %d+%d failed: %s", start_addr, count, err)
+            continue
+        
+        if isinstance(result, ExceptionResponse):
+            # Device is there, it just doesn't have these registers
+            answered = True
+            _LOGGER.debug("Detection probe %d+%d rejected: %s", start_addr, count, result)
+            continue
+        if result.isError():
+            _LOGGER.debug("Detection probe %d+%d failed: %s", start_addr, count, result)
             continue
+        
+        answered = True
+        for i, word in enumerate(result.registers[:count]):
+            words[start_addr + i] = word
+    
+    if not answered:
+        raise ConnectionError("Device did not answer the detection probe")
     
-    return None
+    best = None
+    for controller_class in controller_classes:
+        score, firmware = controller_class.score_signature(words)
+        _LOGGER.debug("Detection score %s: %d (firmware %s)", controller_class.__name__, score, firmware)
+        if score <= 0:
+            continue
+        # Equal scores go to the more specific signature (signature_priority), not list order
+        rank = (score, controller_class.signature_priority)
+        if best is None or rank > best[0]:
+            best = (rank, controller_class, firmware)
+    
+    if best is None:
+        return None
+    
+    (score, _), controller_class, firmware = best
+    controller_type = controller_class().name.lower()
+    _LOGGER.info("%s controller detected (firmware %s, score %d)", controller_type.upper(), firmware, score)
+    return controller_type, firmware
 
 
 def get_controller(controller_type: str) -> ControllerBase:
@@ -118,10 +262,10 @@ def get_controller(controller_type: str) -> ControllerBase:
     
     Args:
         controller_type: Controller type string ("chico" or "carel")
-        
+    
     Returns:
         Controller instance
-        
+    
     Raises:
         ValueError: If controller type is unknown
     """
@@ -5,6 +5,10 @@ import logging
 from typing import TYPE_CHECKING
 
 from . import ControllerBase
+from ..codec import WORD_ORDER_BIG, detect_word_order
+from ..const import CAREL_MAX_READ_BITS
+from ..planner import estimate_plan_time, plan_batches
+from ..register_map import TIER_FAST, TIER_SLOW, load_register_map
 
 if TYPE_CHECKING:
     from pymodbus.client import ModbusTcpClient
@@ -15,6 +19,24 @@ _LOGGER = logging.getLogger(__name__)
 class CarelController(ControllerBase):
     """CAREL controller (alternative SPRSUN controller)."""
     
+    # pCO exposes a contiguous holding map - unused indexes in a padded read return 0
+    max_read_gap = 32
+    
+    # GeneralMng.CurrVer.X/Y/Z
+    signature_addresses = (325, 326, 327)
+    
+    # Version registers lie outside the CHICO map, so they win a tie
+    signature_priority = 1
+    
+    register_map = load_register_map("carel")
+    sensor_registers = register_map.sensor_registers
+    discrete_inputs = register_map.discrete_inputs
+    alarm_inputs = register_map.alarm_inputs
+    number_registers = register_map.number_registers
+    select_registers = register_map.select_registers
+    coil_switches = register_map.coil_switches
+    coil_buttons = register_map.coil_buttons
+    
     @property
     def name(self) -> str:
         """Return controller type name."""
@@ -26,18 +48,132 @@ class CarelController(ControllerBase):
         return "SPRSUN (CAREL Controller)"
     
     def read_all_registers(
-        self, 
-        client: ModbusTcpClient, 
+        self,
+        client: ModbusTcpClient,
         device_address: int,
         initial_read: bool = False
     ) -> dict:
-        """Read all CAREL registers."""
-        # TODO: Implement CAREL register reading
-        # CAREL uses different address space (40001-based)
-        # Reference: docs/CAREL_MODBUS_REFERENCE.md
+        """Read all CAREL registers.
+        
+        Holding registers (sensors, plus numbers and selects on a full read)
+        are read in planned FC03 batches, discrete inputs (status + alarms) and
+        coils in one FC02/FC01 request each.
+        """
+        data = {}
+        
+        cost_model = client.cost_model
+        max_gap = min(self.max_read_gap, cost_model.max_gap())
+        tiers = (TIER_FAST, TIER_SLOW) if initial_read else (TIER_FAST,)
+        holding_layouts = self.read_plan(tiers, max_gap)
+        
+        _LOGGER.debug(
+            "CAREL: Holding read plan %d batches (max gap %d, est. bus time %.0fms)",
+            len(holding_layouts), max_gap,
+            estimate_plan_time([(l.start, l.count) for l in holding_layouts], cost_model) * 1000
+        )
+        
+        batches = []
+        for layout in holding_layouts:
+            description = f"{layout.start}+{layout.count}"
+            try:
+                result = client.read_holding_registers(
+                    address=layout.start,
+                    count=layout.count,
+                    device_id=device_address
+                )
+                
+                if result.isError():
+                    _LOGGER.warning("CAREL: Error reading batch %s: %s", description, result)
+                    continue
+                
+                if len(result.registers) != layout.count:
+                    _LOGGER.error(
+                        "CAREL: Batch size mismatch for %s! Expected %d, got %d registers",
+                        description, layout.count, len(result.registers)
+                    )
+                    continue
+                
+                batches.append((layout, result.registers))
+                
+                _LOGGER.debug("CAREL: Read batch %s (%d registers)", description, layout.count)
+            
+            except Exception as err:
+                _LOGGER.error("CAREL: Exception reading batch %s: %s", description, err)
+        
+        if holding_layouts and not batches:
+            raise ValueError("CAREL: No holding register batch could be read")
+        
+        # Word order of 32-bit values differs between boards/gateways - detect once per device
+        if self.word_order is None:
+            words = {}
+            for layout, registers in batches:
+                for i, word in enumerate(registers):
+                    words[layout.start + i] = word
+            self.word_order = detect_word_order(words, self.register_map.word_order_probes)
+            if self.word_order is not None:
+                _LOGGER.info("CAREL: Detected %s word order for 32-bit values", self.word_order)
+        
+        word_order = self.word_order or WORD_ORDER_BIG
+        for layout, registers in batches:
+            data.update(self.register_map.decode(layout, registers, word_order))
+        
+        # Discrete inputs: status flags and alarms (FC02)
+        input_addresses = {
+            addr for key, (addr, _) in self.discrete_inputs.items()
+            if self.poll_keys is None or key in self.poll_keys
+        }
+        input_addresses.update(self.alarm_inputs)
+        bits = self._read_bits(client.read_discrete_inputs, input_addresses, device_address, "discrete inputs")
+        
+        for key, (addr, name) in self.discrete_inputs.items():
+            if addr in bits and (self.poll_keys is None or key in self.poll_keys):
+                data[key] = bits[addr]
+        
+        if all(addr in bits for addr in self.alarm_inputs):
+            data["active_alarms"] = [
+                self.alarm_inputs[addr][0] for addr in sorted(self.alarm_inputs) if bits[addr]
+            ]
         
-        _LOGGER.warning("CAREL controller support is not yet implemented")
-        return {}
+        # Coils: switch states (FC01)
+        coil_addresses = {
+            addr for key, (addr, _) in self.coil_switches.items()
+            if self.poll_keys is None or key in self.poll_keys
+        }
+        bits = self._read_bits(client.read_coils, coil_addresses, device_address, "coils")
+        
+        for key, (addr, name) in self.coil_switches.items():
+            if addr in bits and (self.poll_keys is None or key in self.poll_keys):
+                data[key] = bits[addr]
+        
+        _LOGGER.debug("CAREL: Read %d values", len(data))
+        
+        return data
+    
+    @staticmethod
+    def _read_bits(read_method, addresses: set[int], device_address: int, description: str) -> dict[int, bool]:
+        """Read bit addresses with as few FC01/FC02 requests as possible."""
+        bits = {}
+        # Padding bits cost 1/8 byte each - one request covers the whole space
+        for start_addr, count in plan_batches(addresses, CAREL_MAX_READ_BITS, CAREL_MAX_READ_BITS):
+            try:
+                result = read_method(
+                    address=start_addr,
+                    count=count,
+                    device_id=device_address
+                )
+                
+                if result.isError():
+                    _LOGGER.warning("CAREL: Error reading %s %d+%d: %s", description, start_addr, count, result)
+                    continue
+                
+                # pymodbus pads bits to a multiple of 8
+                for i in range(count):
+                    bits[start_addr + i] = bool(result.bits[i])
+            
+            except Exception as err:
+                _LOGGER.error("CAREL: Exception reading %s %d+%d: %s", description, start_addr, count, err)
+        
+        return bits
     
     def write_register(
         self,
@@ -46,15 +182,33 @@ class CarelController(ControllerBase):
         address: int,
         value: int,
     ) -> bool:
-        """Write a CAREL register."""
-        # TODO: Implement CAREL register writing
-        _LOGGER.warning("CAREL controller write not yet implemented")
-        return False
+        """Write a CAREL register (FC06, or FC16 for 32-bit values)."""
+        if not client.connected:
+            if not client.connect():
+                raise ConnectionError("Cannot connect to Modbus device")
+        
+        values = self.encode_register(address, value)
+        if len(values) == 1:
+            result = client.write_register(
+                address=address,
+                value=values[0],
+                device_id=device_address
+            )
+        else:
+            result = client.write_registers(
+                address=address,
+                values=values,
+                device_id=device_address
+            )
+        
+        if result.isError():
+            raise ValueError(f"Modbus write error: {result}")
+        
+        return True
     
     def get_platforms(self) -> list[str]:
         """Return supported platforms for CAREL."""
-        # TODO: May differ from CHICO
-        return ["sensor", "binary_sensor", "number", "select", "switch"]
+        return ["sensor", "binary_sensor", "number", "select", "switch", "button"]
     
     def get_device_info(self, entry_id: str) -> dict:
         """Return device info for CAREL controller."""
@@ -66,40 +220,17 @@ class CarelController(ControllerBase):
         }
     
     @classmethod
-    def detect(cls, client: ModbusTcpClient, device_address: int) -> bool:
+    def score_signature(cls, words: dict[int, int]) -> tuple[int, str | None]:
         """
-        Detect CAREL controller by reading signature registers.
+        Score CAREL signature registers.
         
-        CAREL has version registers at different addresses (40326-40328).
-        In Modbus holding register terms: 325-327 (0-based).
+        CAREL has version registers GeneralMng.CurrVer.X/Y/Z (40326-40328),
+        in Modbus holding register terms 325-327 (0-based). CHICO has nothing
+        mapped there, so a sane non-zero version is strong evidence.
         """
-        try:
-            # Try to read CAREL version registers
-            # GeneralMng.CurrVer.X/Y/Z at addresses 325-327
-            result = client.read_holding_registers(
-                address=325,
-                count=3,
-                device_id=device_address
-            )
-            
-            if result.isError():
-                return False
-            
-            # If we can read these, check if they look like version numbers
-            if len(result.registers) == 3:
-                ver_x = result.registers[0]
-                ver_y = result.registers[1]
-                ver_z = result.registers[2]
-                
-                # Version components should be reasonable (0-99)
-                if 0 <= ver_x <= 99 and 0 <= ver_y <= 99 and 0 <= ver_z <= 99:
-                    _LOGGER.info(
-                        "CAREL controller detected (Version %d.%d.%d)",
-                        ver_x, ver_y, ver_z
-                    )
-                    return True
-        
-        except Exception as err:
-            _LOGGER.debug("CAREL detection failed: %s", err)
-        
-        return False
+        version = [words.get(addr) for addr in cls.signature_addresses]
+        if None in version or not any(version):
+            return 0, None
+        if not all(0 <= part <= 99 for part in version):
+            return 0, None
+        return 3, "{}.{}.{}".format(*version)
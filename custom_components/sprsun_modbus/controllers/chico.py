@@ -5,6 +5,9 @@ import logging
 from typing import TYPE_CHECKING
 
 from . import ControllerBase
+from ..codec import WORD_ORDER_BIG
+from ..planner import estimate_plan_time
+from ..register_map import TIER_FAST, TIER_SLOW, load_register_map
 
 if TYPE_CHECKING:
     from pymodbus.client import ModbusTcpClient
@@ -15,6 +18,22 @@ _LOGGER = logging.getLogger(__name__)
 class ChicoController(ControllerBase):
     """CHICO controller (original SPRSUN controller)."""
     
+    # Largest unused gap verified readable (0x0033, 0x0035, 0x00C7, 0x00C9, 0x018E-0x018F)
+    max_read_gap = 3
+    
+    # Software date and controller/display version (inside the read-only block)
+    signature_addresses = (0x0013, 0x0014, 0x002C, 0x002D)
+    
+    register_map = load_register_map("chico")
+    sensor_registers = register_map.sensor_registers
+    binary_sensor_bits = register_map.binary_sensor_bits
+    bit_registers = register_map.bit_registers
+    number_registers = register_map.number_registers
+    select_registers = register_map.select_registers
+    switch_registers = register_map.switch_registers
+    button_registers = register_map.button_registers
+    curves = register_map.curves
+    
     @property
     def name(self) -> str:
         """Return controller type name."""
@@ -32,127 +51,60 @@ class ChicoController(ControllerBase):
         initial_read: bool = False
     ) -> dict:
         """Read all CHICO registers."""
-        from ..const import (
-            REGISTERS_READ_ONLY,
-            REGISTERS_NUMBER,
-            REGISTERS_SELECT,
-            REGISTERS_SWITCH,
-            REGISTERS_BUTTON,
-        )
-        
         data = {}
         
-        # Registers that should be interpreted as signed int16
-        SIGNED_REGISTERS = {
-            0x0011,  # ambient_temp
-            0x0015,  # suction_gas_temp
-            0x0016,  # coil_temp
-            0x0022,  # driving_temp
-            0x0028,  # evap_temp
-        }
-        SIGNED_RW_REGISTERS = {
-            0x0169, 0x016A, 0x016B, 0x016C,  # E01-E04
-            0x016D, 0x016E, 0x016F, 0x0170,  # E05-E08
-            0x0171, 0x0172, 0x0173, 0x0174,  # E09-E12
-            0x0183, 0x0184, 0x0192,  # G05, G07, G10
-        }
+        cost_model = client.cost_model
+        max_gap = min(self.max_read_gap, cost_model.max_gap())
         
-        # Read all read-only registers in one batch (0x0000-0x0031 = 50 registers)
-        try:
-            result = client.read_holding_registers(
-                address=0x0000,
-                count=50,
-                device_id=device_address
-            )
-            
-            if result.isError():
-                raise ValueError(f"Modbus read error: {result}")
-            
-            # Parse read-only registers
-            for address, (key, name, scale, unit, device_class) in REGISTERS_READ_ONLY.items():
-                index = address - 0x0000
-                if index < len(result.registers):
-                    raw_value = result.registers[index]
-                    
-                    # Convert to signed int16 if needed
-                    if address in SIGNED_REGISTERS:
-                        if raw_value > 32767:
-                            raw_value = raw_value - 65536
-                    
-                    data[key] = raw_value * scale
-            
-            _LOGGER.debug("CHICO: Read %d read-only registers", len(data))
+        # Read all read-only and status registers (0x0000-0x0031 = 50 registers, one batch)
+        for layout in self.read_plan((TIER_FAST,), max_gap):
+            try:
+                result = client.read_holding_registers(
+                    address=layout.start,
+                    count=layout.count,
+                    device_id=device_address
+                )
+                
+                if result.isError():
+                    raise ValueError(f"Modbus read error: {result}")
+                
+                if len(result.registers) != layout.count:
+                    raise ValueError(f"Expected {layout.count} registers, got {len(result.registers)}")
+                
+                # Parse read-only and status registers in one pass
+                data.update(self.register_map.decode(layout, result.registers, WORD_ORDER_BIG))
             
-        except Exception as err:
-            _LOGGER.error("CHICO: Error reading RO registers: %s", err)
-            raise
-        
-        # Read status registers for binary sensors
-        status_register_map = {
-            0x0002: "switching_input_symbol",
-            0x0003: "working_status_register",
-            0x0004: "output_symbol_1",
-            0x0005: "output_symbol_2",
-            0x0006: "output_symbol_3",
-            0x0007: "failure_symbol_1",
-            0x0008: "failure_symbol_2",
-            0x0009: "failure_symbol_3",
-            0x000A: "failure_symbol_4",
-            0x000B: "failure_symbol_5",
-            0x000C: "failure_symbol_6",
-            0x000D: "failure_symbol_7",
-        }
+            except Exception as err:
+                _LOGGER.error("CHICO: Error reading RO registers: %s", err)
+                raise
         
-        for address, key in status_register_map.items():
-            index = address - 0x0000
-            if index < len(result.registers):
-                data[key] = result.registers[index]
+        _LOGGER.debug("CHICO: Read %d read-only registers", len(data))
         
         # Read RW registers (Phase 6: Batch RW reading for performance)
         if initial_read:
             _LOGGER.debug("CHICO: Reading RW registers in batches...")
             
-            # Build address-to-config mapping for all RW registers
-            rw_config = {}
-            for addr, config in REGISTERS_NUMBER.items():
-                key, name, scale, *_ = config
-                rw_config[addr] = (key, scale)
-            for addr, (key, name, options) in REGISTERS_SELECT.items():
-                rw_config[addr] = (key, 1)
-            
-            # Add switch registers (control marks)
-            for key, (addr, bit, name, icon) in REGISTERS_SWITCH.items():
-                # Switch entities share registers, create unique key for each register
-                reg_key = f"_control_{addr:04x}"
-                if addr not in rw_config:
-                    rw_config[addr] = (reg_key, 1)
-            
             # Note: Button register 0x0033 is NOT read - buttons do read-modify-write on-demand
             #       Reading it in batches is unnecessary (always returns 0 after auto-clear)
             
-            # Define OPTIMIZED RW register batches (accept small padding to minimize batch count)
-            # Strategy: Read continuous ranges with gaps ≤3 registers
+            # Plan RW batches from the register tables (accept small padding to minimize batch count)
+            # Gap worth padding comes from the transport cost model (character time, t3.5 gaps),
+            # capped at the gap known to be readable on CHICO.
             # Result: 5 batches instead of 17 = ~70% fewer Modbus queries
-            rw_batches = [
-                # Batch 1: Control marks + P06 (with padding: 0x0033 button, 0x0035 unused)
-                (0x0032, 5, "Control+P06"),  # 0x0032-0x0036 (3 used, 2 padding = 60% efficiency)
-                
-                # Batch 2: P parameters (with padding: 0x00C7, 0x00C9 unused)
-                (0x00C6, 7, "P03-P02"),  # 0x00C6-0x00CC (5 used, 2 padding = 71% efficiency)
-                
-                # Batch 3: ALL Economic mode parameters (no padding!)
-                (0x0169, 29, "E01-E24+G08-G03"),  # 0x0169-0x0185 (29 used, 0 padding = 100% efficiency)
-                # Contains: E01-E04, E05-E08, E09-E12, E13-E16, E17-E20, E21-E24, G08-G03
-                
-                # Batch 4: G04 + P07 + G09-G11 (with padding: 0x018E, 0x018F unused)
-                (0x018D, 7, "G04+P07+G09-G11"),  # 0x018D-0x0193 (5 used, 2 padding = 71% efficiency)
-                
-                # Batch 5: Antilegionella + G02 (no padding!)
-                (0x019A, 5, "Anti+G02"),  # 0x019A-0x019E (5 used, 0 padding = 100% efficiency)
-            ]
+            #   0x0032+5 Control+P06, 0x00C6+7 P03-P02, 0x0169+29 E01-E24+G08-G03,
+            #   0x018D+7 G04+P07+G09-G11, 0x019A+5 Anti+G02
+            rw_layouts = self.read_plan((TIER_SLOW,), max_gap)
+            
+            _LOGGER.debug(
+                "CHICO: RW read plan %d batches (max gap %d, est. bus time %.0fms)",
+                len(rw_layouts), max_gap,
+                estimate_plan_time([(l.start, l.count) for l in rw_layouts], cost_model) * 1000
+            )
             
             total_rw_read = 0
-            for start_addr, count, description in rw_batches:
+            for layout in rw_layouts:
+                start_addr, count = layout.start, layout.count
+                description = f"0x{start_addr:04X}+{count}"
                 try:
                     result = client.read_holding_registers(
                         address=start_addr,
@@ -172,26 +124,16 @@ class ChicoController(ControllerBase):
                         continue
                     
                     # Parse batch results
-                    for i in range(count):
-                        addr = start_addr + i
-                        if addr in rw_config:
-                            key, scale = rw_config[addr]
-                            raw_value = result.registers[i]
-                            
-                            # Convert signed int16 if needed
-                            if addr in SIGNED_RW_REGISTERS:
-                                if raw_value > 32767:
-                                    raw_value = raw_value - 65536
-                            
-                            data[key] = raw_value * scale
-                            total_rw_read += 1
+                    batch = self.register_map.decode(layout, result.registers, WORD_ORDER_BIG)
+                    data.update(batch)
+                    total_rw_read += len(batch)
                     
                     _LOGGER.debug("CHICO: Read batch %s (%d registers)", description, count)
-                    
+                
                 except Exception as err:
                     _LOGGER.error("CHICO: Exception reading batch %s: %s", description, err)
             
-            _LOGGER.info("CHICO: Batch RW read completed (%d registers in %d batches)", total_rw_read, len(rw_batches))
+            _LOGGER.info("CHICO: Batch RW read completed (%d registers in %d batches)", total_rw_read, len(rw_layouts))
         
         return data
     
@@ -209,7 +151,7 @@ class ChicoController(ControllerBase):
         
         result = client.write_register(
             address=address,
-            value=value,
+            value=self.encode_register(address, value)[0],
             device_id=device_address
         )
         
@@ -232,38 +174,41 @@ class ChicoController(ControllerBase):
         }
     
     @classmethod
-    def detect(cls, client: ModbusTcpClient, device_address: int) -> bool:
+    def score_signature(cls, words: dict[int, int]) -> tuple[int, str | None]:
         """
-        Detect CHICO controller by reading signature registers.
+        Score CHICO signature registers.
         
-        CHICO has controller/display version registers at 0x002C/0x002D.
+        CHICO has software date (0x0013 year, 0x0014 MMDD) and controller/display
+        version registers (0x002C/0x002D). A valid MMDD date is required - the
+        other words alone are ordinary live values on other controllers.
         """
-        try:
-            # Try to read version registers (CHICO specific)
-            result = client.read_holding_registers(
-                address=0x002C,
-                count=2,
-                device_id=device_address
-            )
-            
-            if result.isError():
-                return False
-            
-            # If we can read these registers, likely CHICO
-            # Controller and Display versions should be reasonable values (0-999)
-            if len(result.registers) == 2:
-                controller_ver = result.registers[0]
-                display_ver = result.registers[1]
-                
-                # Sanity check: versions should be 0-999
-                if 0 <= controller_ver <= 999 and 0 <= display_ver <= 999:
-                    _LOGGER.info(
-                        "CHICO controller detected (Controller v%d, Display v%d)",
-                        controller_ver, display_ver
-                    )
-                    return True
+        year = words.get(0x0013)
+        month_day = words.get(0x0014)
+        controller_ver = words.get(0x002C)
+        display_ver = words.get(0x002D)
+        
+        valid_date = (
+            month_day is not None
+            and 1 <= month_day // 100 <= 12
+            and 1 <= month_day % 100 <= 31
+        )
+        if not valid_date:
+            return 0, None
+        
+        score = 2
+        if controller_ver is not None and 1 <= controller_ver <= 999:
+            score += 1
+        if display_ver is not None and 1 <= display_ver <= 999:
+            score += 1
+        if year is not None and 1 <= year <= 99:
+            score += 1
         
-        except Exception as err:
-            _LOGGER.debug("CHICO detection failed: %s", err)
+        if controller_ver is None:
+            return score, None
         
-        return False
+        firmware = str(controller_ver)
+        if display_ver is not None:
+            firmware += f" (display {display_ver})"
+        if year is not None:
+            firmware += f" 20{year:02d}-{month_day // 100:02d}-{month_day % 100:02d}"
+        return score, firmware
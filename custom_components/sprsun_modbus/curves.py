@@ -0,0 +1,80 @@
+"""Economic mode curves for SPRSUN Heat Pump.
+
+A curve maps ambient temperature to a target water temperature through a
+fixed number of points (E01-E24 on CHICO: 4 points each for heating, hot
+water and cooling). The controller interpolates linearly between points
+and holds the end values outside them.
+"""
+from __future__ import annotations
+
+from .register_map import RegisterMap
+
+
+def curve_points(
+    data: dict,
+    ambient_keys: tuple[str, ...],
+    target_keys: tuple[str, ...],
+) -> list[tuple[float, float]] | None:
+    """Return (ambient, target) points of a curve from the coordinator cache (None if incomplete)."""
+    points = []
+    for ambient_key, target_key in zip(ambient_keys, target_keys):
+        ambient, target = data.get(ambient_key), data.get(target_key)
+        if not isinstance(ambient, dict) or not isinstance(target, dict):
+            return None
+        points.append((ambient["value"], target["value"]))
+    return points
+
+
+def interpolate(points: list[tuple[float, float]], ambient: float) -> float:
+    """Return target temperature of a curve at an ambient temperature."""
+    if ambient <= points[0][0]:
+        return points[0][1]
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if ambient <= x1:
+            if x1 == x0:
+                return y1
+            return y0 + (y1 - y0) * (ambient - x0) / (x1 - x0)
+    return points[-1][1]
+
+
+def validate_curve(
+    register_map: RegisterMap,
+    curve: str,
+    ambient_keys: tuple[str, ...],
+    target_keys: tuple[str, ...],
+    points: list[dict],
+) -> tuple[list[str], dict[str, int]]:
+    """Check a curve given as [{ambient, target}, ...] against the register map.
+    
+    Points must fit the register ranges and steps, ambient temperatures must
+    rise strictly and targets may not rise with them.
+    
+    Returns:
+        (problems, raw values by cache key) - values are only valid without problems
+    """
+    if len(points) != len(ambient_keys):
+        return [f"{curve}: expected {len(ambient_keys)} points, got {len(points)}"], {}
+    
+    problems = []
+    values = {}
+    for index, point in enumerate(points, start=1):
+        for field, key in (("ambient", ambient_keys[index - 1]), ("target", target_keys[index - 1])):
+            register = register_map.by_key[key]
+            value = point[field]
+            if (register.min is not None and value < register.min) or (
+                register.max is not None and value > register.max
+            ):
+                problems.append(f"{curve} point {index}: {field} {value} outside {register.min}..{register.max}")
+            raw = register_map.raw_value(key, value)
+            if abs(register_map.scale_value(key, raw) - value) > 1e-6:
+                problems.append(f"{curve} point {index}: {field} {value} is not a multiple of {register.scale}")
+            values[key] = raw
+    
+    for index in range(1, len(points)):
+        previous, point = points[index - 1], points[index]
+        if point["ambient"] <= previous["ambient"]:
+            problems.append(f"{curve}: ambient temperatures must rise (point {index + 1})")
+        if point["target"] > previous["target"]:
+            problems.append(f"{curve}: target temperatures may not rise with ambient (point {index + 1})")
+    
+    return problems, values
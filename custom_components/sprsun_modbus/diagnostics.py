@@ -0,0 +1,47 @@
+"""Diagnostics support for SPRSUN Heat Pump."""
+from __future__ import annotations
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_SERIAL_PORT
+
+TO_REDACT = {CONF_HOST, CONF_SERIAL_PORT}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics of a config entry: connection, fault log and derived counters."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.client
+    
+    connection = {
+        "reconnects": coordinator.reconnect_count,
+        "keepalives": coordinator.keepalive_count,
+        "breaker_open": coordinator.breaker.is_open,
+        "io_worker": coordinator.worker is not None,
+    }
+    if client is not None:
+        connection.update(
+            transport=client.transport,
+            framer=client.framer,
+            latency_s=client.latency.srtt,
+            timeout_s=client.latency.timeout,
+            timeouts=client.timeout_count,
+        )
+    
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "controller": coordinator.controller.name,
+        "word_order": coordinator.controller.word_order,
+        "connection": connection,
+        "active_faults": coordinator.faults.active,
+        "fault_log": coordinator.faults.entries(),
+        "metrics": coordinator.metrics.as_dict(),
+        "analytics": coordinator.analytics.as_dict(),
+        "timeseries_bytes": coordinator.timeseries.nbytes,
+    }
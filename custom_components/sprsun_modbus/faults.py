@@ -0,0 +1,145 @@
+"""Fault events and fault log of SPRSUN Heat Pump.
+
+Each poll, every fault status word (register map entries with "fault":
+true, CHICO 0x0007-0x000D) is XORed with its previous value, and the
+active alarm list (CAREL discrete inputs) is compared with the previous
+one. Every fault that became active or cleared produces one log entry
+with the time and a snapshot of the measurements of that poll. The
+coordinator fires each entry as an event and persists the bounded log.
+
+The previous words are persisted as well, so faults that appeared or
+cleared while Home Assistant was down are reported by the first poll
+(on the very first start, faults already active are reported as new).
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+from .const import FAULT_LOG_SIZE
+from .register_map import TIER_FAST, RegisterMap
+
+STATE_VERSION = 1  # Bumped when as_dict() changes incompatibly
+
+ALARMS_KEY = "active_alarms"
+
+# Measurements recorded with every fault entry
+TELEMETRY_DEVICE_CLASSES = {"temperature", "pressure", "current", "voltage", "frequency", "power"}
+
+
+class FaultTracker:
+    """Edge detection of fault bits and bounded fault log of one heat pump."""
+    
+    def __init__(self, register_map: RegisterMap, max_entries: int = FAULT_LOG_SIZE) -> None:
+        """Initialize."""
+        self.words = [register.key for register in register_map.registers if register.fault]
+        self.has_alarms = bool(register_map.alarm_inputs)
+        
+        # (word key, bit) -> (code, name) of the documented bits
+        self._bits = {}
+        for key, (address, bit, name) in register_map.binary_sensor_bits.items():
+            if register_map.bit_registers[address] in self.words:
+                self._bits[(register_map.bit_registers[address], bit)] = (key, name)
+        self._alarm_names = dict(register_map.alarm_inputs.values())
+        
+        self._telemetry = [
+            register.key for register in register_map.registers
+            if register.tier == TIER_FAST and register.entity == "sensor"
+            and register.device_class in TELEMETRY_DEVICE_CLASSES
+        ]
+        
+        self._lock = threading.Lock()  # Polls update in the executor, queries come from the event loop
+        self._previous: dict[str, int | list[str]] = {}  # Word key -> value, ALARMS_KEY -> codes
+        self.log: deque[dict] = deque(maxlen=max_entries)  # Oldest first
+    
+    @property
+    def input_keys(self) -> set[str]:
+        """Return cache keys read by update()."""
+        return set(self.words)
+    
+    def _describe(self, key: str, bit: int) -> tuple[str, str]:
+        """Return (code, name) of a fault bit (undocumented bits get a generic one)."""
+        return self._bits.get((key, bit), (f"{key}_bit_{bit}", f"{key} bit {bit}"))
+    
+    def _changes(self, data: dict) -> list[tuple[str, str, str | None, int | None, bool]]:
+        """Return (code, name, word, bit, active) of the faults that changed (caller holds _lock)."""
+        changes = []
+        for key in self.words:
+            value = data.get(key)
+            if value is None:
+                continue
+            value = int(value)
+            changed = value ^ self._previous.get(key, 0)
+            self._previous[key] = value
+            while changed:
+                bit = (changed & -changed).bit_length() - 1
+                changed &= changed - 1
+                code, name = self._describe(key, bit)
+                changes.append((code, name, key, bit, bool(value >> bit & 1)))
+        
+        alarms = data.get(ALARMS_KEY)
+        if self.has_alarms and alarms is not None:
+            previous = set(self._previous.get(ALARMS_KEY, []))
+            for code in sorted(previous.symmetric_difference(alarms)):
+                changes.append((code, self._alarm_names.get(code, code), None, None, code in alarms))
+            self._previous[ALARMS_KEY] = list(alarms)
+        return changes
+    
+    def update(self, timestamp: float, data: dict) -> list[dict]:
+        """Add one poll, return the new log entries (one per fault that became active or cleared)."""
+        with self._lock:
+            changes = self._changes(data)
+            if not changes:
+                return []
+            time = datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+            telemetry = {key: data[key] for key in self._telemetry if key in data}
+            entries = [
+                {
+                    "time": time,
+                    "code": code,
+                    "name": name,
+                    "register": word,
+                    "bit": bit,
+                    "active": active,
+                    "telemetry": telemetry,
+                }
+                for code, name, word, bit, active in changes
+            ]
+            self.log.extend(entries)
+            return entries
+    
+    @property
+    def active(self) -> list[str]:
+        """Return codes of the faults active in the last poll."""
+        with self._lock:
+            codes = [
+                self._describe(key, bit)[0]
+                for key in self.words
+                for bit in range(16)
+                if int(self._previous.get(key, 0)) >> bit & 1
+            ]
+            return codes + list(self._previous.get(ALARMS_KEY, []))
+    
+    def entries(self, limit: int | None = None) -> list[dict]:
+        """Return log entries, newest first."""
+        with self._lock:
+            entries = list(reversed(self.log))
+        return entries[:limit] if limit is not None else entries
+    
+    def as_dict(self) -> dict:
+        """Return persistent state (JSON serializable)."""
+        with self._lock:
+            return {
+                "version": STATE_VERSION,
+                "previous": dict(self._previous),
+                "log": list(self.log),
+            }
+    
+    def restore(self, state: dict) -> None:
+        """Restore state saved by as_dict() (ignored if the layout differs)."""
+        if not state or state.get("version") != STATE_VERSION:
+            return
+        with self._lock:
+            self._previous = dict(state["previous"])
+            self.log.extend(state["log"])
@@ -0,0 +1,368 @@
+"""Append-only binary register history for SPRSUN Heat Pump.
+
+Every poll appends one record with the raw words of all polled registers
+(plus CAREL discrete inputs and coils packed 16 per word) to the current
+segment file. Records are delta-encoded against the previous record: a
+bitmap marks the words that changed and only their differences follow as
+zigzag varints, so an unchanged parameter costs one bit per poll.
+
+Files (one directory per config entry):
+    <start>.seg  "SPRH", uint32 header length, JSON header (controller,
+                 word order, start time, channel addresses), then records
+    <start>.idx  (float64 time, uint64 offset) of every keyframe record
+
+Record: varint length, flags (bit 0 keyframe), varint milliseconds (since
+the segment start for keyframes, since the previous record otherwise),
+changed-word bitmap, zigzag varint deltas. A keyframe is encoded against
+all-zero words, so reading can start at any keyframe found in the index.
+Segments rotate daily, on every start and when the word order changes; the
+oldest are deleted once the directory exceeds its size limit.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import os
+import struct
+import time
+from collections.abc import Iterator
+
+from .const import HISTORY_KEYFRAME_INTERVAL, HISTORY_MAX_BYTES, HISTORY_SEGMENT_SECONDS
+from .register_map import TIER_FAST, TIER_SLOW, RegisterMap, load_register_map
+from .snapshot import (
+    AREA_COILS,
+    AREA_DISCRETE,
+    SnapshotLayout,
+    SnapshotReader,
+    SnapshotWriter,
+    decode_snapshot,
+)
+
+HISTORY_MAGIC = b"SPRH"
+HISTORY_VERSION = 1  # Bumped when the record encoding changes
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+
+_INDEX_ENTRY = struct.Struct("<dQ")
+_FLAG_KEYFRAME = 0x01
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Append an unsigned LEB128 varint."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> tuple[int, int]:
+    """Return (value, next position) of the varint at position."""
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _runs(addresses: list[int]) -> list[tuple[int, int, int]]:
+    """Group sorted addresses into (start address, channel index, count) runs."""
+    runs = []
+    for index, address in enumerate(addresses):
+        if runs and runs[-1][0] + runs[-1][2] == address:
+            start, first, count = runs[-1]
+            runs[-1] = (start, first, count + 1)
+        else:
+            runs.append((address, index, 1))
+    return runs
+
+
+class HistoryChannels:
+    """Registers and bits recorded per poll, in record word order."""
+    
+    def __init__(self, holding: list[int], discrete: list[int], coils: list[int]) -> None:
+        """Initialize from sorted addresses per area."""
+        self.holding = holding
+        self.discrete = discrete
+        self.coils = coils
+        self.size = len(holding) + (len(discrete) + 15) // 16 + (len(coils) + 15) // 16
+        self._holding_runs = _runs(holding)
+    
+    @classmethod
+    def for_map(cls, register_map: RegisterMap) -> HistoryChannels:
+        """Return the channels of everything a poll reads."""
+        holding = set()
+        for register in register_map.registers:
+            if register.tier in (TIER_FAST, TIER_SLOW):
+                holding.update(range(register.address, register.address + register.width))
+        discrete = {address for address, _ in register_map.discrete_inputs.values()}
+        discrete.update(register_map.alarm_inputs)
+        coils = {address for address, _ in register_map.coil_switches.values()}
+        return cls(sorted(holding), sorted(discrete), sorted(coils))
+    
+    def as_dict(self) -> dict:
+        """Return channel addresses for the segment header."""
+        return {"holding": self.holding, "discrete": self.discrete, "coils": self.coils}
+    
+    def capture(self, snapshot: SnapshotReader) -> list[int]:
+        """Return the record words of a snapshot."""
+        area = struct.unpack_from(f">{len(snapshot.holding) // 2}H", snapshot.holding)
+        words = [area[address] for address in self.holding]
+        for addresses, bits in ((self.discrete, snapshot.discrete), (self.coils, snapshot.coils)):
+            for first in range(0, len(addresses), 16):
+                word = 0
+                for bit, address in enumerate(addresses[first:first + 16]):
+                    if bits[address]:
+                        word |= 1 << bit
+                words.append(word)
+        return words
+    
+    def restore(self, words: list[int], writer: SnapshotWriter) -> None:
+        """Stage record words into a snapshot writer (for decoding with the register map)."""
+        for start, first, count in self._holding_runs:
+            writer.store_words(start, words[first:first + count])
+        position = len(self.holding)
+        for area, addresses in ((AREA_DISCRETE, self.discrete), (AREA_COILS, self.coils)):
+            for first in range(0, len(addresses), 16):
+                word = words[position]
+                position += 1
+                for bit, address in enumerate(addresses[first:first + 16]):
+                    writer.store_bits(area, address, (word >> bit & 1,))
+
+
+class HistoryWriter:
+    """Appends poll records to the segment files of one config entry (blocking, runs in executor)."""
+    
+    def __init__(
+        self,
+        directory: str,
+        register_map: RegisterMap,
+        max_bytes: int = HISTORY_MAX_BYTES,
+        segment_seconds: float = HISTORY_SEGMENT_SECONDS,
+        keyframe_interval: int = HISTORY_KEYFRAME_INTERVAL,
+    ) -> None:
+        """Initialize (the first segment is created by the first append)."""
+        self.directory = directory
+        self.register_map = register_map
+        self.channels = HistoryChannels.for_map(register_map)
+        self.max_bytes = max_bytes
+        self.segment_seconds = segment_seconds
+        self.keyframe_interval = keyframe_interval
+        self.record_count = 0
+        self._segment = None
+        self._index = None
+        self._start = 0.0
+        self._word_order: str | None = None
+        self._previous: list[int] = []
+        self._previous_ms = 0
+        self._records = 0  # Records in the current segment
+    
+    def append(self, snapshot: SnapshotReader) -> None:
+        """Append the current snapshot as one record."""
+        (words, timestamp, word_order), _ = snapshot.read(
+            lambda view: (self.channels.capture(view), view.published, view.word_order)
+        )
+        if self._segment is None or timestamp - self._start >= self.segment_seconds or word_order != self._word_order:
+            self._rotate(timestamp, word_order)
+        
+        milliseconds = max(0, round((timestamp - self._start) * 1000))
+        keyframe = self._records % self.keyframe_interval == 0
+        previous = [0] * len(words) if keyframe else self._previous
+        
+        body = bytearray((_FLAG_KEYFRAME if keyframe else 0,))
+        _write_varint(body, milliseconds if keyframe else max(0, milliseconds - self._previous_ms))
+        mask = bytearray((len(words) + 7) // 8)
+        deltas = bytearray()
+        for index, (word, old) in enumerate(zip(words, previous)):
+            if word != old:
+                mask[index >> 3] |= 1 << (index & 7)
+                delta = ((word - old + 0x8000) & 0xFFFF) - 0x8000
+                _write_varint(deltas, delta << 1 if delta >= 0 else (-delta << 1) - 1)
+        body += mask + deltas
+        
+        record = bytearray()
+        _write_varint(record, len(body))
+        offset = self._segment.tell()
+        self._segment.write(record + body)
+        self._segment.flush()
+        if keyframe:
+            self._index.write(_INDEX_ENTRY.pack(timestamp, offset))
+            self._index.flush()
+        
+        self._previous = words
+        self._previous_ms = milliseconds
+        self._records += 1
+        self.record_count += 1
+    
+    def _rotate(self, timestamp: float, word_order: str | None) -> None:
+        """Close the current segment and start a new one at timestamp."""
+        self.close()
+        os.makedirs(self.directory, exist_ok=True)
+        name = time.strftime("%Y%m%dT%H%M%S", time.gmtime(timestamp)) + f"{timestamp % 1:.3f}"[1:]
+        path = os.path.join(self.directory, name)
+        
+        header = json.dumps({
+            "format": HISTORY_VERSION,
+            "controller": self.register_map.controller,
+            "word_order": word_order,
+            "start": timestamp,
+            **self.channels.as_dict(),
+        }).encode()
+        self._segment = open(path + SEGMENT_SUFFIX, "ab")
+        self._segment.write(HISTORY_MAGIC + struct.pack("<I", len(header)) + header)
+        self._segment.flush()
+        self._index = open(path + INDEX_SUFFIX, "ab")
+        self._start = timestamp
+        self._word_order = word_order
+        self._previous_ms = 0
+        self._records = 0
+        self._prune()
+    
+    def _prune(self) -> None:
+        """Delete the oldest segments while the directory exceeds max_bytes."""
+        segments = HistoryReader(self.directory).segments()[:-1]  # Never the current one
+        total = sum(os.path.getsize(os.path.join(self.directory, name)) for name in os.listdir(self.directory))
+        for _, path in segments:
+            if total <= self.max_bytes:
+                break
+            for file in (path, path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX):
+                try:
+                    total -= os.path.getsize(file)
+                    os.unlink(file)
+                except FileNotFoundError:
+                    pass
+    
+    def close(self) -> None:
+        """Close the current segment."""
+        for file in (self._segment, self._index):
+            if file is not None:
+                file.close()
+        self._segment = self._index = None
+
+
+class HistoryReader:
+    """Streams records of a history directory (works while the writer appends)."""
+    
+    def __init__(self, directory: str) -> None:
+        """Initialize."""
+        self.directory = directory
+    
+    def segments(self) -> list[tuple[float, str]]:
+        """Return (start time, path) of all segments, oldest first."""
+        segments = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        for name in names:
+            if not name.endswith(SEGMENT_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                segments.append((self._header(path)["start"], path))
+            except (OSError, ValueError, KeyError, struct.error):
+                continue  # Segment being created or foreign file
+        return sorted(segments)
+    
+    @staticmethod
+    def _header(path: str) -> dict:
+        """Return the JSON header of a segment."""
+        with open(path, "rb") as file:
+            magic, length = struct.unpack("<4sI", file.read(8))
+            if magic != HISTORY_MAGIC:
+                raise ValueError(f"Not a history segment: {path}")
+            header = json.loads(file.read(length))
+        if header.get("format") != HISTORY_VERSION:
+            raise ValueError(f"Unsupported history format {header.get('format')}: {path}")
+        header["offset"] = 8 + length
+        return header
+    
+    def read_raw(self, start: float = 0.0, end: float = math.inf) -> Iterator[tuple[float, list[int], dict]]:
+        """Yield (time, record words, segment header) of all records from start to end."""
+        segments = self.segments()
+        starts = [segment_start for segment_start, _ in segments]
+        first = max(0, bisect.bisect_right(starts, start) - 1)
+        for segment_start, path in segments[first:]:
+            if segment_start > end:
+                return
+            header = self._header(path)
+            offset = self._seek(path, header, start)
+            for timestamp, words in self._records(path, header, offset):
+                if timestamp > end:
+                    return
+                if timestamp >= start:
+                    yield timestamp, words, header
+    
+    def read(
+        self,
+        start: float = 0.0,
+        end: float = math.inf,
+        keys: set[str] | None = None,
+    ) -> Iterator[tuple[float, dict]]:
+        """Yield (time, {key: scaled value}) decoded with the register map of the recording controller."""
+        decoder = None
+        for timestamp, words, header in self.read_raw(start, end):
+            if decoder is None or decoder[0] is not header:
+                register_map = load_register_map(header["controller"])
+                channels = HistoryChannels(header["holding"], header["discrete"], header["coils"])
+                writer = SnapshotWriter(None, SnapshotLayout.for_map(register_map), register_map.controller)
+                decoder = (header, register_map, channels, writer)
+            _, register_map, channels, writer = decoder
+            channels.restore(words, writer)
+            writer.publish(header["word_order"])
+            values = decode_snapshot(register_map, writer.view(), (TIER_FAST, TIER_SLOW))
+            if keys is not None:
+                values = {key: value for key, value in values.items() if key in keys}
+            yield timestamp, values
+    
+    @staticmethod
+    def _seek(path: str, header: dict, start: float) -> int:
+        """Return offset of the last keyframe at or before start (first record if none)."""
+        index_path = path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+        try:
+            with open(index_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return header["offset"]
+        entries = [_INDEX_ENTRY.unpack_from(data, position) for position in range(0, len(data) - 15, 16)]
+        position = bisect.bisect_right([timestamp for timestamp, _ in entries], start) - 1
+        return entries[position][1] if position >= 0 else header["offset"]
+    
+    @staticmethod
+    def _records(path: str, header: dict, offset: int) -> Iterator[tuple[float, list[int]]]:
+        """Yield (time, words) of the records from offset (stops at a truncated record)."""
+        with open(path, "rb") as file:
+            file.seek(offset)
+            data = file.read()
+        size = len(header["holding"]) + (len(header["discrete"]) + 15) // 16 + (len(header["coils"]) + 15) // 16
+        mask_size = (size + 7) // 8
+        words = [0] * size
+        milliseconds = 0
+        position = 0
+        while position < len(data):
+            try:
+                length, body = _read_varint(data, position)
+            except IndexError:
+                return
+            position = body + length
+            if position > len(data):
+                return  # Record still being written (or cut off by a crash)
+            flags = data[body]
+            elapsed, cursor = _read_varint(data, body + 1)
+            if flags & _FLAG_KEYFRAME:
+                words = [0] * size
+                milliseconds = elapsed
+            else:
+                milliseconds += elapsed
+            mask = data[cursor:cursor + mask_size]
+            cursor += mask_size
+            words = list(words)
+            for index in range(size):
+                if mask[index >> 3] >> (index & 7) & 1:
+                    zigzag, cursor = _read_varint(data, cursor)
+                    delta = zigzag >> 1 if not zigzag & 1 else -((zigzag + 1) >> 1)
+                    words[index] = (words[index] + delta) & 0xFFFF
+            yield header["start"] + milliseconds / 1000, words
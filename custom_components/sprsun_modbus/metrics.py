@@ -0,0 +1,207 @@
+"""Derived metrics of SPRSUN Heat Pump: electrical power, energy and COP.
+
+Updated once per poll from the decoded values, in constant time:
+electrical power comes from the electric meter (CAREL) or AC voltage x
+AC current (CHICO, apparent power), thermal power from the heating/cooling
+capacity register or electrical power x COP. Energy is integrated with
+the trapezoidal rule between consecutive polls; intervals longer than
+max_gap (failed polls, restarts) are skipped instead of guessed. SCOP is
+thermal over electrical energy of the last 24 hours (hourly buckets), of
+the current day and since the counters started.
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+from .const import METRICS_ROLLING_HOURS
+from .register_map import RegisterMap
+
+STATE_VERSION = 1  # Bumped when as_dict() changes incompatibly
+
+
+def _ratio(thermal: float, electrical: float) -> float | None:
+    """Return thermal / electrical energy (None until there is any electrical energy)."""
+    if electrical <= 0:
+        return None
+    return round(thermal / electrical, 2)
+
+
+class MetricsEngine:
+    """Incremental power, energy and SCOP of one heat pump."""
+    
+    def __init__(self, register_map: RegisterMap, max_gap: float) -> None:
+        """Initialize.
+        
+        Args:
+            max_gap: Longest interval between polls (seconds) that is integrated
+        """
+        keys = set(register_map.by_key)
+        self.meter_key = "meter_power" if "meter_power" in keys else None
+        self.voltage_key = "ac_voltage" if "ac_voltage" in keys else None
+        self.current_key = "ac_current" if "ac_current" in keys else None
+        self.capacity_key = "heating_cooling_capacity" if "heating_cooling_capacity" in keys else None
+        self.cop_key = "cop" if "cop" in keys else None
+        self.compressor_key = "compressor_current" if "compressor_current" in keys else None
+        self.has_electrical = self.meter_key is not None or (
+            self.voltage_key is not None and self.current_key is not None
+        )
+        self.has_thermal = self.has_electrical and (self.capacity_key is not None or self.cop_key is not None)
+        self.max_gap = max_gap
+        self._lock = threading.Lock()  # Polls update in the executor, the store saves from the event loop
+        
+        # Latest poll
+        self.electrical_power: float | None = None
+        self.thermal_power: float | None = None
+        self.running: bool | None = None
+        
+        # Integration baseline and counters (persisted)
+        self._last: tuple[float, float, float] | None = None  # (time, electrical W, thermal W)
+        self.electrical_energy = 0.0  # kWh since the counters started
+        self.thermal_energy = 0.0
+        self.day: int | None = None  # Local date ordinal of the day counters
+        self.day_electrical = 0.0
+        self.day_thermal = 0.0
+        self.yesterday: tuple[float, float] | None = None  # (electrical, thermal) kWh
+        self._hours: deque[list] = deque()  # [hour, electrical kWh, thermal kWh], oldest first
+        self._rolling_electrical = 0.0
+        self._rolling_thermal = 0.0
+    
+    @property
+    def input_keys(self) -> set[str]:
+        """Return cache keys read by update()."""
+        keys = (self.meter_key, self.voltage_key, self.current_key, self.capacity_key, self.cop_key, self.compressor_key)
+        return {key for key in keys if key is not None}
+    
+    def _powers(self, data: dict) -> tuple[float | None, float | None]:
+        """Return electrical and thermal power (W) of one poll (None if an input is missing)."""
+        if self.meter_key is not None:
+            electrical = data.get(self.meter_key)
+        elif self.voltage_key is not None and self.current_key is not None:
+            voltage = data.get(self.voltage_key)
+            current = data.get(self.current_key)
+            electrical = voltage * current if voltage is not None and current is not None else None
+        else:
+            electrical = None
+        if electrical is None:
+            return None, None
+        electrical = max(float(electrical), 0.0)
+        
+        if self.capacity_key is not None:
+            thermal = data.get(self.capacity_key)
+        elif self.cop_key is not None and data.get(self.cop_key) is not None:
+            thermal = electrical * data[self.cop_key]
+        else:
+            thermal = None
+        return electrical, (max(float(thermal), 0.0) if thermal is not None else None)
+    
+    def update(self, timestamp: float, data: dict, day: int) -> None:
+        """Add one poll.
+        
+        Args:
+            timestamp: Unix time of the poll
+            data: Decoded values of the poll
+            day: Local date ordinal (day counters roll over when it changes)
+        """
+        electrical, thermal = self._powers(data)
+        with self._lock:
+            if self.day != day:
+                if self.day is not None:
+                    self.yesterday = (self.day_electrical, self.day_thermal) if day == self.day + 1 else None
+                self.day = day
+                self.day_electrical = self.day_thermal = 0.0
+            
+            self._roll(int(timestamp // 3600))
+            self.electrical_power = electrical
+            self.thermal_power = thermal
+            if self.compressor_key is not None and data.get(self.compressor_key) is not None:
+                self.running = data[self.compressor_key] > 0
+            
+            if electrical is None:
+                self._last = None  # Gap: don't integrate across missing inputs
+                return
+            thermal = thermal or 0.0
+            last = self._last
+            self._last = (timestamp, electrical, thermal)
+            if last is None or not 0 < timestamp - last[0] <= self.max_gap:
+                return
+            
+            hours = (timestamp - last[0]) / 3600
+            electrical_kwh = (last[1] + electrical) / 2 * hours / 1000
+            thermal_kwh = (last[2] + thermal) / 2 * hours / 1000
+            self.electrical_energy += electrical_kwh
+            self.thermal_energy += thermal_kwh
+            self.day_electrical += electrical_kwh
+            self.day_thermal += thermal_kwh
+            bucket = self._hours[-1]
+            bucket[1] += electrical_kwh
+            bucket[2] += thermal_kwh
+            self._rolling_electrical += electrical_kwh
+            self._rolling_thermal += thermal_kwh
+    
+    def _roll(self, hour: int) -> None:
+        """Open the bucket of hour and drop buckets outside the rolling window (caller holds _lock)."""
+        if not self._hours or self._hours[-1][0] != hour:
+            self._hours.append([hour, 0.0, 0.0])
+        while self._hours[0][0] <= hour - METRICS_ROLLING_HOURS:
+            _, old_electrical, old_thermal = self._hours.popleft()
+            self._rolling_electrical -= old_electrical
+            self._rolling_thermal -= old_thermal
+    
+    @property
+    def live_cop(self) -> float | None:
+        """Return thermal / electrical power of the last poll (None while the compressor is off)."""
+        if self.running is False or not self.electrical_power or self.thermal_power is None:
+            return None
+        return round(self.thermal_power / self.electrical_power, 2)
+    
+    @property
+    def scop_rolling(self) -> float | None:
+        """Return SCOP of the last METRICS_ROLLING_HOURS hours."""
+        return _ratio(self._rolling_thermal, self._rolling_electrical)
+    
+    @property
+    def scop_today(self) -> float | None:
+        """Return SCOP of the current day."""
+        return _ratio(self.day_thermal, self.day_electrical)
+    
+    @property
+    def scop_yesterday(self) -> float | None:
+        """Return SCOP of the previous day (None if no poll was integrated that day)."""
+        return _ratio(self.yesterday[1], self.yesterday[0]) if self.yesterday else None
+    
+    @property
+    def scop_total(self) -> float | None:
+        """Return SCOP since the counters started."""
+        return _ratio(self.thermal_energy, self.electrical_energy)
+    
+    def as_dict(self) -> dict:
+        """Return persistent state (JSON serializable)."""
+        with self._lock:
+            return {
+                "version": STATE_VERSION,
+                "last": list(self._last) if self._last is not None else None,
+                "electrical_energy": self.electrical_energy,
+                "thermal_energy": self.thermal_energy,
+                "day": self.day,
+                "day_electrical": self.day_electrical,
+                "day_thermal": self.day_thermal,
+                "yesterday": list(self.yesterday) if self.yesterday is not None else None,
+                "hours": [list(bucket) for bucket in self._hours],
+            }
+    
+    def restore(self, state: dict) -> None:
+        """Restore state saved by as_dict() (ignored if the layout differs)."""
+        if not state or state.get("version") != STATE_VERSION:
+            return
+        with self._lock:
+            self._last = tuple(state["last"]) if state.get("last") else None
+            self.electrical_energy = state["electrical_energy"]
+            self.thermal_energy = state["thermal_energy"]
+            self.day = state["day"]
+            self.day_electrical = state["day_electrical"]
+            self.day_thermal = state["day_thermal"]
+            self.yesterday = tuple(state["yesterday"]) if state.get("yesterday") else None
+            self._hours = deque([list(bucket) for bucket in state["hours"]])
+            self._rolling_electrical = sum(bucket[1] for bucket in self._hours)
+            self._rolling_thermal = sum(bucket[2] for bucket in self._hours)
@@ -3,26 +3,15 @@ import logging
 
 from homeassistant.components.number import NumberEntity, NumberDeviceClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME, CONF_HOST, CONF_PORT
+from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, REGISTERS_NUMBER, CONF_DEVICE_ADDRESS
+from .const import DOMAIN, CONF_DEVICE_ADDRESS
 
 _LOGGER = logging.getLogger(__name__)
 
-# RW registers that should be interpreted as signed int16 (can be negative)
-SIGNED_RW_REGISTERS = {
-    0x0169, 0x016A, 0x016B, 0x016C,  # E01-E04: Economic heat ambient
-    0x016D, 0x016E, 0x016F, 0x0170,  # E05-E08: Economic water ambient
-    0x0171, 0x0172, 0x0173, 0x0174,  # E09-E12: Economic cool ambient
-    0x0183,  # G07: Hotwater heater external temp
-    0x0184,  # G05: Heating heater external temp
-    0x0192,  # G10: Ambient temp switch setpoint
-}
-
-
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -32,7 +21,7 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
     
     entities = []
-    for address, config in REGISTERS_NUMBER.items():
+    for address, config in coordinator.controller.number_registers.items():
         key, name, scale, unit, min_val, max_val, step, device_class = config
         entities.append(
             SPRSUNNumber(
@@ -83,8 +72,6 @@ class SPRSUNNumber(CoordinatorEntity, NumberEntity):
         self._attr_native_max_value = max_val
         self._attr_native_step = step
         
-        self._host = config_entry.data[CONF_HOST]
-        self._port = config_entry.data[CONF_PORT]
         self._device_address = config_entry.data[CONF_DEVICE_ADDRESS]
         
         # Set device class
@@ -142,52 +129,28 @@ class SPRSUNNumber(CoordinatorEntity, NumberEntity):
         # Initial value will be loaded by coordinator on first refresh
         # No need to read directly anymore
     
-    async def _async_read_register(self) -> float:
+    async def _async_read_register(self, max_age: float = 0.0) -> float:
         """Read from Modbus register."""
-        # Use coordinator's persistent connection instead of creating a new one
-        # This avoids connection conflicts when Elfin max_accept=1
-        def _read():
-            client = self.coordinator.client
-            if client is None or not client.connected:
-                if not client.connect():
-                    raise ConnectionError("Cannot connect to Modbus device")
-            
-            result = client.read_holding_registers(
-                address=self._address,
-                count=1,
-                device_id=self._device_address
-            )
-            
-            if result.isError():
-                raise ValueError(f"Modbus read error: {result}")
-            
-            raw_value = result.registers[0]
-            
-            # Convert to signed int16 if this is a signed register
-            if self._address in SIGNED_RW_REGISTERS:
-                if raw_value > 32767:
-                    raw_value = raw_value - 65536
-            
-            scaled_value = raw_value * self._scale
-            
-            _LOGGER.debug(
-                "Read register 0x%04X: raw=%d, scaled=%.2f",
-                self._address, raw_value, scaled_value
-            )
-            
-            return scaled_value
+        # Coalesced with other on-demand reads, served from cache if younger than max_age
+        # Data type (signedness, 32-bit) comes from the register map
+        values = await self.coordinator.async_read_registers([self._address], max_age)
+        raw_value = values[self._address]
         
-        return await self.hass.async_add_executor_job(_read)
+        scaled_value = raw_value * self._scale
+        
+        _LOGGER.debug(
+            "Read register 0x%04X: raw=%d, scaled=%.2f",
+            self._address, raw_value, scaled_value
+        )
+        
+        return scaled_value
     
     async def _async_write_register(self, value: float) -> None:
         """Write to Modbus register."""
         # Convert scaled value back to raw register value
+        # (negative values are encoded by the controller according to the register map)
         raw_value = int(value / self._scale)
         
-        # Convert negative values to unsigned int16 (two's complement) if this is a signed register
-        if self._address in SIGNED_RW_REGISTERS and raw_value < 0:
-            raw_value = raw_value + 65536
-        
         _LOGGER.info(
             "Writing to register 0x%04X: scaled=%.2f, raw=%d",
             self._address, value, raw_value
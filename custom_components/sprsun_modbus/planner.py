@@ -0,0 +1,127 @@
+"""Batch read planning for SPRSUN Heat Pump.
+
+Groups register addresses into as few read transactions as possible.
+Whether a gap between two runs is worth reading as padding is decided by a
+cost model built from the actual RS485 line: character time, inter-frame
+gap and device turnaround (plus gateway overhead for TCP transports).
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from .const import (
+    DEVICE_TURNAROUND,
+    MAX_READ_COUNT,
+    MAX_WRITE_COUNT,
+)
+
+
+class BatchCostModel:
+    """Estimated bus time of one Modbus RTU read transaction."""
+    
+    REQUEST_CHARS = 8  # address + function + start(2) + count(2) + CRC(2)
+    RESPONSE_OVERHEAD_CHARS = 5  # address + function + byte count + CRC(2)
+    
+    def __init__(self, char_time: float, inter_frame_gap: float, overhead: float = 0.0) -> None:
+        """Initialize.
+        
+        Args:
+            char_time: Seconds to transmit one character on the RS485 line
+            inter_frame_gap: Silent interval required between frames (t3.5)
+            overhead: Fixed per-transaction cost outside the RS485 line (network, gateway)
+        """
+        self.char_time = char_time
+        self.inter_frame_gap = inter_frame_gap
+        self.overhead = overhead
+    
+    @classmethod
+    def from_serial(
+        cls,
+        baudrate: int,
+        bytesize: int = 8,
+        parity: str = "N",
+        stopbits: int = 1,
+        overhead: float = 0.0,
+    ) -> BatchCostModel:
+        """Build cost model from serial line settings."""
+        bits_per_char = 1 + bytesize + (0 if parity == "N" else 1) + stopbits
+        char_time = bits_per_char / baudrate
+        # Modbus RTU spec: t3.5 is fixed at 1.75ms above 19200 baud
+        inter_frame_gap = 0.00175 if baudrate > 19200 else 3.5 * char_time
+        return cls(char_time, inter_frame_gap, overhead)
+    
+    def transaction_time(self, count: int) -> float:
+        """Return estimated seconds to read `count` registers in one request."""
+        chars = self.REQUEST_CHARS + self.RESPONSE_OVERHEAD_CHARS + 2 * count
+        return (
+            self.overhead
+            + DEVICE_TURNAROUND
+            + chars * self.char_time
+            + 2 * self.inter_frame_gap
+        )
+    
+    def max_gap(self) -> int:
+        """Return largest gap (in registers) cheaper to pad than a new transaction."""
+        per_register = 2 * self.char_time
+        return int(self.transaction_time(0) / per_register)
+
+
+def plan_batches(
+    addresses: Iterable[int],
+    max_gap: int,
+    max_count: int = MAX_READ_COUNT,
+) -> list[tuple[int, int]]:
+    """Group register addresses into (start, count) read requests.
+    
+    Runs separated by at most `max_gap` unused registers are merged,
+    as long as the request stays within `max_count` registers.
+    """
+    batches: list[tuple[int, int]] = []
+    start = end = None
+    
+    for address in sorted(set(addresses)):
+        if start is not None and address - end - 1 <= max_gap and address - start < max_count:
+            end = address
+            continue
+        if start is not None:
+            batches.append((start, end - start + 1))
+        start = end = address
+    
+    if start is not None:
+        batches.append((start, end - start + 1))
+    
+    return batches
+
+
+def plan_writes(
+    values: dict[int, list[int]],
+    max_count: int = MAX_WRITE_COUNT,
+) -> list[tuple[int, list[int]]]:
+    """Group encoded values (address: words) into (start, words) write requests.
+    
+    Only adjacent values are merged - a write can't pad a gap without
+    overwriting the registers in it. A multi-word value is never split
+    between two requests.
+    """
+    requests: list[tuple[int, list[int]]] = []
+    start = None
+    words: list[int] = []
+    
+    for address in sorted(values):
+        value_words = values[address]
+        if start is not None and address == start + len(words) and len(words) + len(value_words) <= max_count:
+            words.extend(value_words)
+            continue
+        if start is not None:
+            requests.append((start, words))
+        start, words = address, list(value_words)
+    
+    if start is not None:
+        requests.append((start, words))
+    
+    return requests
+
+
+def estimate_plan_time(batches: list[tuple[int, int]], cost_model: BatchCostModel) -> float:
+    """Return estimated bus time in seconds for a list of batches."""
+    return sum(cost_model.transaction_time(count) for _, count in batches)
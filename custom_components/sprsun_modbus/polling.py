@@ -0,0 +1,161 @@
+"""Poll scope of SPRSUN Heat Pump: registers of the enabled entities.
+
+Every register map entry is polled by default. Once entities are disabled
+in the entity registry, a register that only disabled entities read is
+left out of the read plan, so batches shrink or disappear and the bus
+carries fewer words per poll. Registers needed internally are always
+polled: switch control words (read-modify-write of the other bits),
+values read by climate.py, and the inputs of the metrics, analytics and
+fault engines (derived counters must not stall). Registers no entity
+reads are kept as well.
+
+The scope is recomputed whenever an entity of the config entry is
+enabled, disabled, added or removed.
+
+Within the scope, registers are polled per group (temperatures,
+electrical, status bits, CHICO parameter groups P/E/G) at the group's own
+scan interval, other registers at the entry's scan interval. The
+coordinator polls at the shortest interval and reads only the groups that
+are due; the others keep their last values.
+"""
+from __future__ import annotations
+
+import math
+
+from homeassistant.helpers import entity_registry as er
+
+from .const import CLIMATE_KEYS, CONF_GROUP_INTERVALS, ELECTRICAL_DEVICE_CLASSES, SCAN_GROUPS
+from .register_map import Register, RegisterMap
+
+
+def entity_keys(register_map: RegisterMap) -> dict[tuple[str, str], set[str]]:
+    """Return cache keys read by each entity, by (platform, unique_id suffix)."""
+    consumers: dict[tuple[str, str], set[str]] = {}
+    for key, *_ in register_map.sensor_registers.values():
+        consumers[("sensor", key)] = {key}
+    for curve, (_, input_key, ambient_keys, target_keys) in register_map.curves.items():
+        consumers[("sensor", f"{curve}_curve")] = {input_key, *ambient_keys, *target_keys}
+    for key, (address, _, _) in register_map.binary_sensor_bits.items():
+        consumers[("binary_sensor", key)] = {register_map.bit_registers[address]}
+    for key in register_map.discrete_inputs:
+        consumers[("binary_sensor", key)] = {key}
+    for key, *_ in register_map.number_registers.values():
+        consumers[("number", key)] = {key}
+    for key, *_ in register_map.select_registers.values():
+        consumers[("select", key)] = {key}
+    for key in register_map.coil_switches:
+        consumers[("switch", key)] = {key}
+    return consumers
+
+
+def internal_keys(register_map: RegisterMap, *engines) -> set[str]:
+    """Return cache keys polled regardless of the entity registry."""
+    keys = {register_map.by_address[address].key for address, *_ in register_map.switch_registers.values()}
+    keys.update(key for key in CLIMATE_KEYS if key in register_map.by_key)
+    for engine in engines:
+        keys.update(engine.input_keys)
+    return keys
+
+
+def poll_keys(
+    registry: er.EntityRegistry, entry_id: str, register_map: RegisterMap, internal: set[str]
+) -> frozenset[str] | None:
+    """Return cache keys to poll for the enabled entities (None = all registers)."""
+    prefix = f"{entry_id}_"
+    disabled = {
+        (entity.domain, entity.unique_id.removeprefix(prefix))
+        for entity in er.async_entries_for_config_entry(registry, entry_id)
+        if entity.disabled_by is not None
+    }
+    if not disabled:
+        return None
+    
+    needed = set(internal)
+    consumed = set()
+    for entity, keys in entity_keys(register_map).items():
+        consumed.update(keys)
+        if entity not in disabled:
+            needed.update(keys)
+    
+    dropped = consumed - needed
+    if not dropped:
+        return None
+    return frozenset(register.key for register in register_map.registers if register.key not in dropped)
+
+
+def group_intervals(config: dict) -> dict[str, int]:
+    """Return scan interval per group from config entry data (0 = entry scan interval)."""
+    return {group: config.get(option, 0) for group, option in CONF_GROUP_INTERVALS.items()}
+
+
+def scan_group(register_map: RegisterMap, register: Register) -> str | None:
+    """Return the scan group of a register (None = entry scan interval)."""
+    if register.writable and register.code and register.code[0] in "PEG":
+        return f"config_{register.code[0].lower()}"
+    if register.fault or register.key in register_map.bit_registers.values():
+        return "status"
+    if any(register.address == address for address, *_ in register_map.switch_registers.values()):
+        return "status"
+    if register.writable:
+        return None
+    if register.device_class == "temperature":
+        return "temperatures"
+    if register.device_class in ELECTRICAL_DEVICE_CLASSES:
+        return "electrical"
+    return None
+
+
+class PollSchedule:
+    """Scan intervals of the register groups of one register map."""
+    
+    def __init__(self, register_map: RegisterMap, scan_interval: int, intervals: dict[str, int]) -> None:
+        """Initialize.
+        
+        Args:
+            scan_interval: Seconds between polls of ungrouped registers
+            intervals: Seconds between polls per group (0 or missing = scan_interval)
+        """
+        self.groups: dict[str, str | None] = {
+            register.key: scan_group(register_map, register)
+            for register in register_map.registers
+            if register.tier is not None
+        }
+        self.groups.update((key, "status") for key in register_map.discrete_inputs)
+        self.groups.update((key, "status") for key in register_map.coil_switches)
+        self._present = set(self.groups.values())
+        self._last: dict[str | None, float] = {}  # Group -> time of its last successful poll
+        self.configure(scan_interval, intervals)
+    
+    def configure(self, scan_interval: int, intervals: dict[str, int]) -> None:
+        """Set new intervals (takes effect with the next poll)."""
+        self.scan_interval = scan_interval
+        self.intervals = {
+            group: intervals.get(group) or scan_interval for group in SCAN_GROUPS
+        }
+        self.intervals[None] = scan_interval
+    
+    @property
+    def tick(self) -> int:
+        """Return seconds between polls (shortest interval of the groups present)."""
+        return min(self.intervals[group] for group in self._present)
+    
+    def due(self, now: float) -> set[str | None]:
+        """Return groups to poll at now."""
+        # Half a tick of slack, so a 30s group polled every 10s is read every 30s, not 40s
+        slack = self.tick / 2
+        return {
+            group for group in self._present
+            if now - self._last.get(group, -math.inf) >= self.intervals[group] - slack
+        }
+    
+    def mark(self, groups: set[str | None], now: float) -> None:
+        """Record a successful poll of groups."""
+        for group in groups:
+            self._last[group] = now
+    
+    def poll_keys(self, groups: set[str | None], scope: frozenset[str] | None) -> frozenset[str] | None:
+        """Return cache keys to poll for the due groups within scope (None = all registers)."""
+        if groups == self._present:
+            return scope
+        keys = frozenset(key for key, group in self.groups.items() if group in groups)
+        return keys if scope is None else keys & scope
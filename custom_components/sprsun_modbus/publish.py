@@ -0,0 +1,84 @@
+"""Deadband and rate limit of SPRSUN Heat Pump sensor states.
+
+Measurements such as EEV steps, pressures (0.0069 bar per step) or
+compressor frequency jitter by one step from poll to poll. Before the
+coordinator hands a poll to the entities, every measurement sensor is
+compared with the value it last published: changes within the deadband
+keep the published cache entry, so Home Assistant sees an unchanged state
+(no state write, no recorder row, no automation trigger). A value is
+published anyway once max_silence has passed since the last publish.
+
+Rules come from the register map (per register "deadband", "deadband_rel",
+"min_interval", "max_silence"), otherwise from scale and unit: an
+absolute deadband of one raw step, a relative one for units that are
+noisy by nature (PUBLISH_RELATIVE_UNITS). Status words, counters and
+sensors without a unit are always published as read.
+"""
+from __future__ import annotations
+
+from .const import PUBLISH_EXACT_UNITS, PUBLISH_MAX_SILENCE, PUBLISH_RELATIVE_UNITS
+from .register_map import RegisterMap
+
+
+class PublishRule:
+    """Deadband and publish interval of one sensor."""
+    
+    def __init__(self, deadband: float, relative: float, min_interval: float, max_silence: float) -> None:
+        """Initialize.
+        
+        Args:
+            deadband: Changes up to this much (engineering units) are held
+            relative: Changes up to this fraction of the published value are held
+            min_interval: Seconds after a publish during which every change is held
+            max_silence: Seconds after which the current value is published regardless
+        """
+        self.deadband = deadband
+        self.relative = relative
+        self.min_interval = min_interval
+        self.max_silence = max_silence
+    
+    def hold(self, published: float, published_at: float, value: float, now: float) -> bool:
+        """Return True if value should not replace the published value yet."""
+        elapsed = now - published_at
+        if elapsed >= self.max_silence:
+            return False
+        if elapsed < self.min_interval:
+            return True
+        threshold = max(self.deadband, self.relative * abs(published))
+        return abs(value - published) <= threshold * (1 + 1e-9)
+
+
+class PublishFilter:
+    """Published cache entries of the measurement sensors of one register map."""
+    
+    def __init__(self, register_map: RegisterMap) -> None:
+        """Initialize rules for all read-only sensors with a unit (or explicit rule)."""
+        bitfields = set(register_map.bit_registers.values())
+        self.rules: dict[str, PublishRule] = {}
+        for register in register_map.registers:
+            if register.entity != "sensor" or register.writable or register.key in bitfields:
+                continue
+            explicit = register.deadband is not None or register.deadband_rel is not None
+            if not explicit and (register.unit is None or register.unit in PUBLISH_EXACT_UNITS):
+                continue
+            if explicit:
+                deadband, relative = register.deadband or 0.0, register.deadband_rel or 0.0
+            else:
+                deadband, relative = register.scale, PUBLISH_RELATIVE_UNITS.get(register.unit, 0.0)
+            self.rules[register.key] = PublishRule(
+                deadband, relative, register.min_interval or 0.0, register.max_silence or PUBLISH_MAX_SILENCE
+            )
+        self._published: dict[str, dict] = {}  # Key -> cache entry last handed to the entities
+    
+    def apply(self, data: dict, now: float) -> dict:
+        """Replace entries within their deadband by the published ones (modifies data in place)."""
+        for key, rule in self.rules.items():
+            entry = data.get(key)
+            if not isinstance(entry, dict) or not isinstance(entry.get("value"), (int, float)):
+                continue
+            published = self._published.get(key)
+            if published is not None and rule.hold(published["value"], published["updated_at"], entry["value"], now):
+                data[key] = published
+            else:
+                self._published[key] = entry
+        return data
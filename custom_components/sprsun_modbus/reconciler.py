@@ -0,0 +1,109 @@
+"""Desired-state reconciliation for SPRSUN Heat Pump.
+
+Entities describe the device state they want ({key: value}) instead of
+issuing writes. Keys are register cache keys (engineering values) or
+register bitfield switch keys (bools). The reconciler turns that into the
+minimal list of register writes against the cached state: no-op writes are
+dropped, several bits of one control word become one write, and writes are
+ordered so that nothing starts before it is configured - control bits are
+cleared first, configuration registers follow in the order given and
+control bits are set last.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from .const import MAX_WRITE_COUNT
+from .register_map import RegisterMap
+
+
+class ReconcileStep:
+    """One register write of a reconcile plan."""
+    
+    def __init__(
+        self,
+        key: str,
+        address: int,
+        old: int,
+        new: int,
+        encode: Callable[[int, int], list[int]],
+    ) -> None:
+        """Initialize."""
+        self.key = key
+        self.address = address
+        self.old = old  # Raw value before the write (used for rollback)
+        self.new = new
+        self.words = encode(address, new)
+        self.old_words = encode(address, old)
+    
+    def __repr__(self) -> str:
+        """Return debug representation."""
+        return f"{self.key}@0x{self.address:04X}: {self.old} -> {self.new}"
+
+
+def plan_reconcile(
+    register_map: RegisterMap,
+    current: dict[str, int],
+    desired: dict,
+    encode: Callable[[int, int], list[int]],
+) -> list[ReconcileStep]:
+    """Return ordered register writes turning the current into the desired state.
+    
+    Args:
+        register_map: Register map of the controller
+        current: Raw values by register cache key
+        desired: Engineering values by register key, bools by switch key
+        encode: Encodes a raw value into register words (controller.encode_register)
+    
+    Raises:
+        KeyError: Unknown or read-only key, or current value of a register unknown
+    """
+    words: dict[str, int] = {}
+    bits_set: dict[str, int] = {}
+    bits_cleared: dict[str, int] = {}
+    
+    for key, value in desired.items():
+        if key in register_map.switch_registers:
+            address, bit, _, _ = register_map.switch_registers[key]
+            word_key = register_map.by_address[address].key
+            mask = bits_set if value else bits_cleared
+            mask[word_key] = mask.get(word_key, 0) | (1 << bit)
+            continue
+        register = register_map.by_key[key]
+        if not register.writable:
+            raise KeyError(f"{key} is read-only")
+        words[key] = register_map.raw_value(key, value)
+    
+    first, middle, last = [], [], []
+    for key in dict.fromkeys([*bits_cleared, *words, *bits_set]):
+        old = current[key]
+        new = words.get(key, old)
+        new = (new | bits_set.get(key, 0)) & ~bits_cleared.get(key, 0)
+        if new == old:
+            continue
+        step = ReconcileStep(key, register_map.by_key[key].address, old, new, encode)
+        if key in bits_cleared and (new & bits_cleared[key]) != (old & bits_cleared[key]):
+            first.append(step)
+        elif key in bits_set and key not in words:
+            last.append(step)
+        else:
+            middle.append(step)
+    
+    return first + middle + last
+
+
+def merge_steps(steps: list[ReconcileStep], max_count: int = MAX_WRITE_COUNT) -> list[list[ReconcileStep]]:
+    """Group consecutive steps on adjacent registers into one write request each.
+    
+    Steps are never reordered, only neighbours in the plan are merged.
+    """
+    groups: list[list[ReconcileStep]] = []
+    for step in steps:
+        if groups:
+            last = groups[-1][-1]
+            count = sum(len(grouped.words) for grouped in groups[-1])
+            if step.address == last.address + len(last.words) and count + len(step.words) <= max_count:
+                groups[-1].append(step)
+                continue
+        groups.append([step])
+    return groups
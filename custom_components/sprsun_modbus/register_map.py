@@ -0,0 +1,293 @@
+"""Declarative register maps for SPRSUN Heat Pump controllers.
+
+Every controller model is described by one data file, registers/<model>.json:
+holding registers with data type, scale, access, poll tier and entity
+metadata, bitfield entities, discrete inputs, alarms and coils. A map is
+parsed once and compiled into the entity tables used by the platforms, the
+data types used by the codec and cached batch read plans for the planner.
+
+Holding register entry fields (file-level "defaults" apply when omitted):
+    address       Register address (integer or "0x..." string)
+    key           Cache key of the decoded value
+    type          int16, uint16, int32, uint32 or float32 (see codec.DATA_TYPES)
+    scale         Multiplier from raw to engineering value
+    access        "r" or "rw"
+    tier          Poll tier: "fast", "slow" or null (never polled)
+    entity        "sensor", "number", "select" or absent (internal register)
+    name, code, unit, device_class, min, max, step, options  Entity metadata
+    probe         [min, max] plausible range, used to detect 32-bit word order
+    fault         true for status words of fault bits (fault events and log, see faults.py)
+    deadband, deadband_rel, min_interval, max_silence
+                  State publishing of sensors (see publish.py), defaults from scale and unit
+
+Curve entries (economic mode curves) name the registers of their points:
+    key, name     Curve key (service field) and entity name
+    input         Cache key of the value the curve is evaluated at
+    ambient       Keys of the x values (ascending), one per point
+    target        Keys of the y values (not rising with ambient), one per point
+"""
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+from .codec import BatchLayout, type_width
+from .planner import plan_batches
+
+REGISTER_MAP_DIR = Path(__file__).parent / "registers"
+REGISTER_MAP_FORMAT = 1
+
+# Poll tiers
+TIER_FAST = "fast"  # Every poll: measurements and status words
+TIER_SLOW = "slow"  # Full refresh: configuration parameters
+# A tier of null in the map means the register is never polled (read on demand)
+
+# Key subset plans kept (poll scopes/groups and on-demand reads), least recently used are dropped
+KEY_PLAN_CACHE_SIZE = 64
+
+
+def _parse_address(value: int | str) -> int:
+    """Parse an address written as integer or "0x..." string."""
+    return value if isinstance(value, int) else int(value, 0)
+
+
+class Register:
+    """One holding register (or register pair for 32-bit types) of a map."""
+    
+    def __init__(self, spec: dict) -> None:
+        """Initialize from a map entry with defaults already applied."""
+        self.address = _parse_address(spec["address"])
+        self.key = spec["key"]
+        self.data_type = spec["type"]
+        self.width = type_width(self.data_type)
+        self.scale = spec["scale"]
+        self.access = spec["access"]
+        self.tier = spec["tier"]
+        self.code = spec.get("code")  # Parameter code from the manual (P01, E13, G05...)
+        self.fault = spec.get("fault", False)  # Status word of fault bits
+        
+        # State publishing (publish.py), None = default from scale and unit
+        self.deadband = spec.get("deadband")
+        self.deadband_rel = spec.get("deadband_rel")
+        self.min_interval = spec.get("min_interval")
+        self.max_silence = spec.get("max_silence")
+        
+        # Entity metadata
+        self.entity = spec.get("entity")  # "sensor", "number", "select" or None (internal)
+        self.name = spec.get("name")
+        self.unit = spec.get("unit")
+        self.device_class = spec.get("device_class")
+        self.min = spec.get("min")
+        self.max = spec.get("max")
+        self.step = spec.get("step")
+        self.options = {int(value): label for value, label in spec.get("options", {}).items()}
+        
+        # Plausible range of a 32-bit value, used to detect word order
+        self.probe = tuple(spec["probe"]) if "probe" in spec else None
+    
+    @property
+    def writable(self) -> bool:
+        """Return True if the register may be written."""
+        return "w" in self.access
+
+
+class RegisterMap:
+    """Compiled register map of one controller model."""
+    
+    def __init__(self, spec: dict) -> None:
+        """Initialize from a parsed map file."""
+        if spec.get("format") != REGISTER_MAP_FORMAT:
+            raise ValueError(f"Unsupported register map format: {spec.get('format')}")
+        
+        self.controller = spec["controller"]
+        defaults = {"type": "uint16", "scale": 1, "access": "r", "tier": TIER_FAST}
+        defaults.update(spec.get("defaults", {}))
+        self.default_type = defaults["type"]
+        
+        self.registers = [Register({**defaults, **entry}) for entry in spec.get("holding", [])]
+        self.by_key = {register.key: register for register in self.registers}
+        if len(self.by_key) != len(self.registers):
+            raise ValueError(f"{self.controller}: duplicate register keys in map")
+        
+        # address -> register (first declared, for registers read under several keys)
+        self.by_address: dict[int, Register] = {}
+        for register in self.registers:
+            self.by_address.setdefault(register.address, register)
+        
+        # Entity tables (formats as documented on ControllerBase)
+        self.sensor_registers = {}
+        self.number_registers = {}
+        self.select_registers = {}
+        for register in self.registers:
+            if register.entity == "sensor":
+                self.sensor_registers[register.address] = (
+                    register.key, register.name, register.scale, register.unit, register.device_class
+                )
+            elif register.entity == "number":
+                self.number_registers[register.address] = (
+                    register.key, register.name, register.scale, register.unit,
+                    register.min, register.max, register.step, register.device_class
+                )
+            elif register.entity == "select":
+                self.select_registers[register.address] = (register.key, register.name, register.options)
+        
+        # Bitfield entities reference the register (cache key) holding their bit
+        self.binary_sensor_bits = {}
+        self.switch_registers = {}
+        self.button_registers = {}
+        self.bit_registers = {}
+        for entry in spec.get("bits", []):
+            register = self.by_key[entry["register"]]
+            key, bit, name = entry["key"], entry["bit"], entry["name"]
+            if entry["entity"] == "binary_sensor":
+                self.binary_sensor_bits[key] = (register.address, bit, name)
+                self.bit_registers[register.address] = register.key
+            elif entry["entity"] == "switch":
+                coil = _parse_address(entry["coil"]) if "coil" in entry else None
+                self.switch_registers[key] = (register.address, bit, name, coil)
+            elif entry["entity"] == "button":
+                self.button_registers[key] = (register.address, bit, name, entry.get("description"))
+        
+        self.discrete_inputs = {
+            entry["key"]: (_parse_address(entry["address"]), entry["name"])
+            for entry in spec.get("discrete_inputs", [])
+        }
+        self.alarm_inputs = {
+            _parse_address(entry["address"]): (entry["code"], entry["name"])
+            for entry in spec.get("alarms", [])
+        }
+        self.coil_switches = {}
+        self.coil_buttons = {}
+        for entry in spec.get("coils", []):
+            address = _parse_address(entry["address"])
+            if entry["entity"] == "switch":
+                self.coil_switches[entry["key"]] = (address, entry["name"])
+            elif entry["entity"] == "button":
+                self.coil_buttons[entry["key"]] = (address, entry["name"], entry.get("description"))
+        
+        self.curves = {}
+        for entry in spec.get("curves", []):
+            keys = entry["ambient"] + entry["target"]
+            if len(entry["ambient"]) != len(entry["target"]) or not all(
+                key in self.by_key and self.by_key[key].writable for key in keys
+            ):
+                raise ValueError(f"{self.controller}: invalid curve {entry['key']}")
+            self.curves[entry["key"]] = (
+                entry["name"], entry["input"], tuple(entry["ambient"]), tuple(entry["target"])
+            )
+        
+        self.word_order_probes = {
+            register.address: (register.data_type, *register.probe)
+            for register in self.registers
+            if register.probe is not None
+        }
+        
+        # Configuration parameters (number/select entities), as saved by parameter backups
+        self.parameters = [
+            register for register in self.registers
+            if register.writable and register.entity in ("number", "select")
+        ]
+        
+        # (tiers, max gap) -> layouts
+        self._plan_cache: dict[tuple[tuple[str, ...], int], list[BatchLayout]] = {}
+        # (key subset, max gap) -> layouts, bounded (on-demand reads ask for arbitrary subsets)
+        self._key_plan_cache: OrderedDict[tuple[frozenset[str], int], list[BatchLayout]] = OrderedDict()
+        self._key_plan_lock = threading.Lock()  # Plans are requested from several executor threads
+    
+    def data_type(self, address: int) -> str:
+        """Return data type of the register at address."""
+        register = self.by_address.get(address)
+        return register.data_type if register is not None else self.default_type
+    
+    def width(self, address: int) -> int:
+        """Return number of registers occupied by the value at address."""
+        return type_width(self.data_type(address))
+    
+    def read_plan(self, tiers: tuple[str, ...], max_gap: int) -> list[BatchLayout]:
+        """Return batch decode layouts for all registers of the given poll tiers.
+        
+        Compiled once per (tiers, gap). A 32-bit value cut in half by the
+        request size limit is read on its own.
+        """
+        cache_key = (tiers, max_gap)
+        if cache_key not in self._plan_cache:
+            registers = [register for register in self.registers if register.tier in tiers]
+            self._plan_cache[cache_key] = self._compile_plan(registers, max_gap)
+        return self._plan_cache[cache_key]
+    
+    def key_plan(self, keys: frozenset[str], max_gap: int) -> list[BatchLayout]:
+        """Return batch decode layouts for a subset of registers (by cache key).
+        
+        The last KEY_PLAN_CACHE_SIZE subsets are kept compiled.
+        """
+        cache_key = (keys, max_gap)
+        with self._key_plan_lock:
+            layouts = self._key_plan_cache.get(cache_key)
+            if layouts is not None:
+                self._key_plan_cache.move_to_end(cache_key)
+                return layouts
+        
+        registers = [register for register in self.registers if register.key in keys]
+        layouts = self._compile_plan(registers, max_gap)
+        with self._key_plan_lock:
+            self._key_plan_cache[cache_key] = layouts
+            if len(self._key_plan_cache) > KEY_PLAN_CACHE_SIZE:
+                self._key_plan_cache.popitem(last=False)
+        return layouts
+    
+    @staticmethod
+    def _compile_plan(registers: list[Register], max_gap: int) -> list[BatchLayout]:
+        """Group registers into batch decode layouts."""
+        starts = {register.address: register.width for register in registers}
+        addresses = set()
+        for register in registers:
+            addresses.update(range(register.address, register.address + register.width))
+        
+        batches = []
+        for start, count in plan_batches(addresses, max_gap):
+            end = start + count - 1
+            if starts.get(end) == 2:
+                if count > 1:
+                    batches.append((start, count - 1))
+                batches.append((end, 2))
+                continue
+            batches.append((start, count))
+        
+        layouts = []
+        for start, count in batches:
+            fields = [
+                (register.key, register.address, register.data_type)
+                for register in registers
+                if start <= register.address and register.address + register.width <= start + count
+            ]
+            if fields:
+                layouts.append(BatchLayout(start, count, fields))
+        
+        return layouts
+    
+    def decode(self, layout: BatchLayout, registers: list[int], word_order: str) -> dict:
+        """Decode one batch into scaled values by cache key."""
+        data = {}
+        for key, value in layout.decode(registers, word_order).items():
+            data[key] = self.scale_value(key, value)
+        return data
+    
+    def scale_value(self, key: str, raw: int | float) -> int | float:
+        """Return engineering value of a raw register value."""
+        scale = self.by_key[key].scale
+        return raw * scale if scale != 1 else raw
+    
+    def raw_value(self, key: str, value: float) -> int:
+        """Return raw register value of an engineering value."""
+        scale = self.by_key[key].scale
+        return round(value / scale) if scale != 1 else round(value)
+
+
+@lru_cache(maxsize=None)
+def load_register_map(model: str) -> RegisterMap:
+    """Load and compile the register map of a controller model (once per process)."""
+    with open(REGISTER_MAP_DIR / f"{model}.json", encoding="utf-8") as file:
+        return RegisterMap(json.load(file))
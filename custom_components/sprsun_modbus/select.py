@@ -3,12 +3,12 @@ import logging
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME, CONF_HOST, CONF_PORT
+from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, REGISTERS_SELECT, CONF_DEVICE_ADDRESS
+from .const import DOMAIN, CONF_DEVICE_ADDRESS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,7 +22,7 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
     
     entities = []
-    for address, (key, name, options) in REGISTERS_SELECT.items():
+    for address, (key, name, options) in coordinator.controller.select_registers.items():
         entities.append(
             SPRSUNSelect(
                 coordinator,
@@ -59,8 +59,6 @@ class SPRSUNSelect(CoordinatorEntity, SelectEntity):
         self._attr_unique_id = f"{config_entry.entry_id}_{key}"
         self._attr_options = list(options.values())
         
-        self._host = config_entry.data[CONF_HOST]
-        self._port = config_entry.data[CONF_PORT]
         self._device_address = config_entry.data[CONF_DEVICE_ADDRESS]
         
         # Device info
@@ -128,34 +126,18 @@ class SPRSUNSelect(CoordinatorEntity, SelectEntity):
         # Initial value will be loaded by coordinator on first refresh
         # No need to read directly anymore
     
-    async def _async_read_register(self) -> int:
+    async def _async_read_register(self, max_age: float = 0.0) -> int:
         """Read from Modbus register."""
-        # Use coordinator's persistent connection to avoid conflicts
-        def _read():
-            client = self.coordinator.client
-            if client is None or not client.connected:
-                if not client.connect():
-                    raise ConnectionError("Cannot connect to Modbus device")
-            
-            result = client.read_holding_registers(
-                address=self._address,
-                count=1,
-                device_id=self._device_address
-            )
-            
-            if result.isError():
-                raise ValueError(f"Modbus read error: {result}")
-            
-            raw_value = result.registers[0]
-            
-            _LOGGER.debug(
-                "Read register 0x%04X: raw=%d (%s)",
-                self._address, raw_value, self._options_dict.get(raw_value, "Unknown")
-            )
-            
-            return raw_value
+        # Coalesced with other on-demand reads, served from cache if younger than max_age
+        values = await self.coordinator.async_read_registers([self._address], max_age)
+        raw_value = values[self._address]
+        
+        _LOGGER.debug(
+            "Read register 0x%04X: raw=%d (%s)",
+            self._address, raw_value, self._options_dict.get(raw_value, "Unknown")
+        )
         
-        return await self.hass.async_add_executor_job(_read)
+        return raw_value
     
     async def _async_write_register(self, value: int) -> None:
         """Write to Modbus register."""
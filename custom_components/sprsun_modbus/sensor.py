@@ -1,5 +1,6 @@
 """Sensor platform for SPRSUN Heat Pump."""
 import logging
+import time
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -7,15 +8,45 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_NAME,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, REGISTERS_READ_ONLY
+from .const import DOMAIN, CONF_FIRMWARE, STATISTICS_STATE_INTERVAL
+from .curves import curve_points, interpolate
 
 _LOGGER = logging.getLogger(__name__)
 
+# Derived metrics (metrics.py): attribute -> (name, unit, device class, state class, needs thermal power)
+METRIC_SENSORS = {
+    "electrical_power": ("Electrical Power", UnitOfPower.WATT, SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, False),
+    "thermal_power": ("Thermal Power", UnitOfPower.WATT, SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, True),
+    "electrical_energy": ("Electrical Energy", UnitOfEnergy.KILO_WATT_HOUR, SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING, False),
+    "thermal_energy": ("Thermal Energy", UnitOfEnergy.KILO_WATT_HOUR, SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING, True),
+    "live_cop": ("Live COP", None, None, SensorStateClass.MEASUREMENT, True),
+    "scop_rolling": ("SCOP 24h", None, None, SensorStateClass.MEASUREMENT, True),
+    "scop_today": ("SCOP Today", None, None, SensorStateClass.MEASUREMENT, True),
+    "scop_total": ("SCOP Total", None, None, SensorStateClass.MEASUREMENT, True),
+}
+
+# Operating analytics (analytics.py): attribute -> (name, unit, device class, state class, status bit)
+ANALYTICS_SENSORS = {
+    "defrost_count": ("Defrost Count", None, None, SensorStateClass.TOTAL_INCREASING, "defrost"),
+    "defrost_last_duration": ("Last Defrost Duration", UnitOfTime.SECONDS, SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT, "defrost"),
+    "compressor_starts": ("Compressor Starts", None, None, SensorStateClass.TOTAL_INCREASING, "compressor"),
+    "compressor_starts_hour": ("Compressor Starts per Hour", None, None, SensorStateClass.MEASUREMENT, "compressor"),
+    "compressor_last_run": ("Last Compressor Run", UnitOfTime.SECONDS, SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT, "compressor"),
+    "short_cycles": ("Compressor Short Cycles", None, None, SensorStateClass.TOTAL_INCREASING, "compressor"),
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -26,7 +57,7 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
     
     entities = []
-    for address, (key, name, scale, unit, device_class) in REGISTERS_READ_ONLY.items():
+    for address, (key, name, scale, unit, device_class) in coordinator.controller.sensor_registers.items():
         entities.append(
             SPRSUNSensor(
                 coordinator,
@@ -38,6 +69,58 @@ async def async_setup_entry(
             )
         )
     
+    # Economic mode curves (one entity per curve, points as attributes)
+    for curve, (name, input_key, ambient_keys, target_keys) in coordinator.controller.curves.items():
+        entities.append(
+            SPRSUNCurveSensor(
+                coordinator,
+                config_entry,
+                curve,
+                name,
+                input_key,
+                ambient_keys,
+                target_keys,
+            )
+        )
+    
+    # Power, energy and SCOP computed by the coordinator
+    metrics = coordinator.metrics
+    if metrics.has_electrical:
+        for attribute, (name, unit, device_class, state_class, thermal) in METRIC_SENSORS.items():
+            if metrics.has_thermal or not thermal:
+                entities.append(
+                    SPRSUNMetricSensor(
+                        coordinator,
+                        config_entry,
+                        "metrics",
+                        attribute,
+                        name,
+                        unit,
+                        device_class,
+                        state_class,
+                    )
+                )
+    
+    # Defrost and compressor cycle counters
+    analytics = coordinator.analytics
+    for attribute, (name, unit, device_class, state_class, episodes) in ANALYTICS_SENSORS.items():
+        if getattr(analytics, episodes) is not None:
+            entities.append(
+                SPRSUNMetricSensor(
+                    coordinator,
+                    config_entry,
+                    "analytics",
+                    attribute,
+                    name,
+                    unit,
+                    device_class,
+                    state_class,
+                )
+            )
+    
+    # Connection diagnostics
+    entities.append(SPRSUNReconnectSensor(coordinator, config_entry))
+    
     async_add_entities(entities)
 
 
@@ -74,10 +157,21 @@ class SPRSUNSensor(CoordinatorEntity, SensorEntity):
             self._attr_device_class = SensorDeviceClass.FREQUENCY
         elif device_class == "voltage":
             self._attr_device_class = SensorDeviceClass.VOLTAGE
+        elif device_class == "energy":
+            self._attr_device_class = SensorDeviceClass.ENERGY
         
         # Set state class for statistical sensors
         if device_class in ["temperature", "pressure", "power", "current", "frequency", "voltage"]:
             self._attr_state_class = SensorStateClass.MEASUREMENT
+        elif device_class == "energy":
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        
+        # Statistics imported hourly (statistics.py): no state class, fewer state writes
+        self._throttled = key in coordinator.statistics_keys
+        self._last_write = 0.0
+        self._last_available: bool | None = None  # Availability of the last written state
+        if self._throttled:
+            self._attr_state_class = None
         
         # Device info
         self._attr_device_info = {
@@ -87,6 +181,25 @@ class SPRSUNSensor(CoordinatorEntity, SensorEntity):
             "model": "Heat Pump",
         }
     
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state (at most every STATISTICS_STATE_INTERVAL for imported statistics).
+        
+        Availability changes (failed refresh, recovery) are always written.
+        """
+        if self._throttled:
+            now = time.monotonic()
+            available = self.available
+            if (
+                self.coordinator.last_update_success
+                and available == self._last_available
+                and now - self._last_write < STATISTICS_STATE_INTERVAL
+            ):
+                return
+            self._last_write = now
+            self._last_available = available
+        super()._handle_coordinator_update()
+    
     @property
     def native_value(self):
         """Return the state of the sensor."""
@@ -106,3 +219,173 @@ class SPRSUNSensor(CoordinatorEntity, SensorEntity):
             self.coordinator.last_update_success
             and self._key in self.coordinator.data
         )
+
+
+class SPRSUNCurveSensor(CoordinatorEntity, SensorEntity):
+    """Economic mode curve: current target temperature, curve points as attributes."""
+    
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_icon = "mdi:chart-bell-curve-cumulative"
+    
+    def __init__(
+        self,
+        coordinator,
+        config_entry: ConfigEntry,
+        curve: str,
+        name: str,
+        input_key: str,
+        ambient_keys: tuple[str, ...],
+        target_keys: tuple[str, ...],
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        
+        self._curve = curve
+        self._input_key = input_key
+        self._ambient_keys = ambient_keys
+        self._target_keys = target_keys
+        self._attr_name = f"{config_entry.data[CONF_NAME]} {name}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{curve}_curve"
+        
+        # Device info
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": config_entry.data[CONF_NAME],
+            "manufacturer": "SPRSUN",
+            "model": "Heat Pump",
+        }
+    
+    @property
+    def _points(self) -> list[tuple[float, float]] | None:
+        """Return curve points from the coordinator cache."""
+        return curve_points(self.coordinator.data, self._ambient_keys, self._target_keys)
+    
+    @property
+    def native_value(self) -> float | None:
+        """Return curve target temperature at the current ambient temperature."""
+        points = self._points
+        ambient = self.coordinator.data.get(self._input_key)
+        if points is None or not isinstance(ambient, dict):
+            return None
+        return round(interpolate(points, ambient["value"]), 1)
+    
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self.coordinator.last_update_success and self._points is not None
+    
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return curve points (as accepted by the set_heating_curve service)."""
+        points = self._points or []
+        return {
+            "curve": self._curve,
+            "points": [{"ambient": ambient, "target": target} for ambient, target in points],
+        }
+
+
+class SPRSUNMetricSensor(CoordinatorEntity, SensorEntity):
+    """Value derived from the polls (coordinator.metrics or coordinator.analytics)."""
+    
+    def __init__(
+        self,
+        coordinator,
+        config_entry: ConfigEntry,
+        source: str,
+        attribute: str,
+        name: str,
+        unit: str | None,
+        device_class: SensorDeviceClass | None,
+        state_class: SensorStateClass,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        
+        self._source = source
+        self._attribute = attribute
+        self._attr_name = f"{config_entry.data[CONF_NAME]} {name}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{attribute}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+        if device_class == SensorDeviceClass.ENERGY:
+            self._attr_suggested_display_precision = 2
+        
+        # Device info
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": config_entry.data[CONF_NAME],
+            "manufacturer": "SPRSUN",
+            "model": "Heat Pump",
+        }
+    
+    @property
+    def native_value(self) -> float | None:
+        """Return the current value."""
+        value = getattr(getattr(self.coordinator, self._source), self._attribute)
+        if value is None:
+            return None
+        if self._attr_device_class == SensorDeviceClass.ENERGY:
+            return round(value, 3)
+        if self._attr_device_class == SensorDeviceClass.DURATION:
+            return round(value)
+        return value
+    
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Return the previous day's SCOP (daily sensor only)."""
+        if self._attribute != "scop_today":
+            return None
+        return {"yesterday": self.coordinator.metrics.scop_yesterday}
+
+
+class SPRSUNReconnectSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor counting Modbus reconnects (gateway dropped the socket)."""
+    
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:lan-disconnect"
+    
+    def __init__(self, coordinator, config_entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        
+        self._attr_name = f"{config_entry.data[CONF_NAME]} Modbus Reconnects"
+        self._attr_unique_id = f"{config_entry.entry_id}_modbus_reconnects"
+        
+        # Device info (firmware detected during setup, once)
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": config_entry.data[CONF_NAME],
+            "manufacturer": "SPRSUN",
+            "model": "Heat Pump",
+        }
+        if CONF_FIRMWARE in config_entry.data:
+            self._attr_device_info["sw_version"] = config_entry.data[CONF_FIRMWARE]
+    
+    @property
+    def native_value(self) -> int:
+        """Return number of reconnects since integration start."""
+        return self.coordinator.reconnect_count
+    
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return keepalive, latency and circuit breaker statistics."""
+        attributes = {
+            "controller": self.coordinator.controller.name,
+            "firmware": self.coordinator.connection_config.get(CONF_FIRMWARE),
+            "keepalives": self.coordinator.keepalive_count,
+            "breaker_open": self.coordinator.breaker.is_open,
+        }
+        client = self.coordinator.client
+        if client is not None:
+            srtt = client.latency.srtt
+            attributes["latency_ms"] = round(srtt * 1000) if srtt is not None else None
+            attributes["timeout_s"] = round(client.latency.timeout, 2)
+            attributes["timeouts"] = client.timeout_count
+            attributes["transport"] = client.transport
+            if client.transport == "tcp":
+                attributes["framer"] = client.framer
+        return attributes
@@ -0,0 +1,417 @@
+"""Services for SPRSUN Heat Pump.
+
+backup_parameters saves all configuration parameters (number and select
+registers of the register map) to a versioned JSON or CSV file.
+restore_parameters compares a backup with the live device and writes only
+the registers that differ, then verifies them with one read-back.
+set_heating_curve replaces economic mode curves with one block write.
+get_fault_log returns the fault log kept by the coordinator (faults.py).
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+import os
+from datetime import datetime
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    DOMAIN,
+    ATTR_AMBIENT,
+    ATTR_DRY_RUN,
+    ATTR_ENTRY_ID,
+    ATTR_FILENAME,
+    ATTR_FORMAT,
+    ATTR_LIMIT,
+    ATTR_TARGET,
+    BACKUP_DIR,
+    BACKUP_FORMAT_CSV,
+    BACKUP_FORMAT_JSON,
+    BACKUP_FORMATS,
+    BACKUP_VERSION,
+    CONF_FIRMWARE,
+    CURVES,
+    SERVICE_BACKUP_PARAMETERS,
+    SERVICE_GET_FAULT_LOG,
+    SERVICE_RESTORE_PARAMETERS,
+    SERVICE_SET_HEATING_CURVE,
+)
+from .curves import validate_curve
+
+_LOGGER = logging.getLogger(__name__)
+
+CSV_COLUMNS = ["key", "address", "code", "name", "value", "raw"]
+
+BACKUP_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_FORMAT): vol.In(BACKUP_FORMATS),
+    }
+)
+
+RESTORE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_DRY_RUN, default=False): cv.boolean,
+    }
+)
+
+CURVE_POINT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_AMBIENT): vol.Coerce(float),
+        vol.Required(ATTR_TARGET): vol.Coerce(float),
+    }
+)
+
+CURVE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        **{vol.Optional(curve): vol.All(cv.ensure_list, [CURVE_POINT_SCHEMA]) for curve in CURVES},
+    }
+)
+
+FAULT_LOG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration services (once for all config entries)."""
+    if hass.services.has_service(DOMAIN, SERVICE_BACKUP_PARAMETERS):
+        return
+    
+    async def _async_backup(call: ServiceCall) -> ServiceResponse:
+        return await async_backup_parameters(hass, call)
+    
+    async def _async_restore(call: ServiceCall) -> ServiceResponse:
+        return await async_restore_parameters(hass, call)
+    
+    async def _async_set_curve(call: ServiceCall) -> ServiceResponse:
+        return await async_set_heating_curve(hass, call)
+    
+    async def _async_fault_log(call: ServiceCall) -> ServiceResponse:
+        return async_get_fault_log(hass, call)
+    
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKUP_PARAMETERS, _async_backup,
+        schema=BACKUP_SCHEMA, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_RESTORE_PARAMETERS, _async_restore,
+        schema=RESTORE_SCHEMA, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_HEATING_CURVE, _async_set_curve,
+        schema=CURVE_SCHEMA, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_GET_FAULT_LOG, _async_fault_log,
+        schema=FAULT_LOG_SCHEMA, supports_response=SupportsResponse.ONLY
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove integration services after the last config entry is unloaded."""
+    if hass.data.get(DOMAIN):
+        return
+    hass.services.async_remove(DOMAIN, SERVICE_BACKUP_PARAMETERS)
+    hass.services.async_remove(DOMAIN, SERVICE_RESTORE_PARAMETERS)
+    hass.services.async_remove(DOMAIN, SERVICE_SET_HEATING_CURVE)
+    hass.services.async_remove(DOMAIN, SERVICE_GET_FAULT_LOG)
+
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall):
+    """Return coordinator of the targeted config entry."""
+    coordinators = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_ENTRY_ID)
+    if entry_id is not None:
+        if entry_id not in coordinators:
+            raise ServiceValidationError(f"No loaded SPRSUN config entry {entry_id}")
+        return coordinators[entry_id]
+    if len(coordinators) != 1:
+        raise ServiceValidationError("Several SPRSUN heat pumps configured, entry_id is required")
+    return next(iter(coordinators.values()))
+
+
+def _resolve_path(hass: HomeAssistant, filename: str) -> str:
+    """Resolve a filename relative to the backup directory."""
+    if os.path.isabs(filename):
+        return filename
+    return hass.config.path(BACKUP_DIR, filename)
+
+
+def _file_format(filename: str) -> str:
+    """Return backup format from the file extension (JSON unless .csv)."""
+    return BACKUP_FORMAT_CSV if filename.lower().endswith(".csv") else BACKUP_FORMAT_JSON
+
+
+def _render_backup(header: dict, rows: list[dict], file_format: str) -> str:
+    """Render backup contents as JSON or CSV text."""
+    if file_format == BACKUP_FORMAT_JSON:
+        document = {
+            **header,
+            "parameters": {
+                row["key"]: {column: row[column] for column in CSV_COLUMNS if column != "key"}
+                for row in rows
+            },
+        }
+        return json.dumps(document, indent=2, ensure_ascii=False) + "\n"
+    
+    # CSV: header fields in a leading comment line, one parameter per row
+    output = io.StringIO()
+    output.write("# " + ", ".join(f"{field}={value}" for field, value in header.items()) + "\n")
+    writer = csv.DictWriter(output, fieldnames=CSV_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({**row, "address": f"0x{row['address']:04X}"})
+    return output.getvalue()
+
+
+def _parse_backup(text: str) -> tuple[dict, dict[str, int]]:
+    """Parse JSON or CSV backup text into (header, raw values by key)."""
+    if text.lstrip().startswith("{"):
+        document = json.loads(text)
+        parameters = document.pop("parameters", {})
+        return document, {key: row["raw"] for key, row in parameters.items()}
+    
+    lines = text.splitlines()
+    header = {}
+    if lines and lines[0].startswith("#"):
+        for field in lines.pop(0)[1:].split(","):
+            name, _, value = field.strip().partition("=")
+            header[name] = value
+        if "format" in header:
+            header["format"] = int(header["format"])
+    values = {}
+    for row in csv.DictReader(lines):
+        values[row["key"]] = int(row["raw"])
+    return header, values
+
+
+def _write_file(path: str, contents: str) -> None:
+    """Write backup file, creating the backup directory (runs in executor)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write(contents)
+
+
+def _read_file(path: str) -> str:
+    """Read backup file (runs in executor)."""
+    with open(path, encoding="utf-8", newline="") as file:
+        return file.read()
+
+
+async def async_backup_parameters(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Read all configuration parameters and save them to a backup file."""
+    coordinator = _get_coordinator(hass, call)
+    controller = coordinator.controller
+    parameters = controller.register_map.parameters
+    
+    try:
+        raw_values = await hass.async_add_executor_job(
+            coordinator.read_raw_values, [register.key for register in parameters]
+        )
+    except Exception as err:
+        raise HomeAssistantError(f"Reading parameters failed: {err}") from err
+    
+    created = datetime.now().astimezone()
+    filename = call.data.get(ATTR_FILENAME)
+    file_format = call.data.get(ATTR_FORMAT) or (
+        _file_format(filename) if filename else BACKUP_FORMAT_JSON
+    )
+    if not filename:
+        filename = f"{coordinator.controller_type}_{created:%Y%m%d_%H%M%S}.{file_format}"
+    path = _resolve_path(hass, filename)
+    
+    header = {
+        "format": BACKUP_VERSION,
+        "integration": DOMAIN,
+        "controller": coordinator.controller_type,
+        "firmware": coordinator.connection_config.get(CONF_FIRMWARE) or "",
+        "created": created.isoformat(timespec="seconds"),
+    }
+    rows = [
+        {
+            "key": register.key,
+            "address": register.address,
+            "code": register.code or "",
+            "name": register.name,
+            "value": round(controller.register_map.scale_value(register.key, raw_values[register.key]), 6),
+            "raw": raw_values[register.key],
+        }
+        for register in parameters
+        if register.key in raw_values
+    ]
+    
+    await hass.async_add_executor_job(_write_file, path, _render_backup(header, rows, file_format))
+    
+    _LOGGER.info("Saved %d %s parameters to %s", len(rows), controller.name, path)
+    
+    return {"filename": path, "parameters": len(rows)}
+
+
+def _validate_values(register_map, values: dict[str, int]) -> list[str]:
+    """Return problems of backup values against the register map (empty if valid)."""
+    parameters = {register.key: register for register in register_map.parameters}
+    problems = []
+    for key, raw in values.items():
+        register = parameters.get(key)
+        if register is None:
+            problems.append(f"{key}: not a parameter of this controller")
+            continue
+        if not isinstance(raw, int) or isinstance(raw, bool):
+            problems.append(f"{key}: raw value {raw!r} is not an integer")
+            continue
+        if register.options and raw not in register.options:
+            problems.append(f"{key}: {raw} is not a valid option")
+        value = round(register_map.scale_value(key, raw), 6)
+        if register.min is not None and value < register.min:
+            problems.append(f"{key}: {value} below minimum {register.min}")
+        if register.max is not None and value > register.max:
+            problems.append(f"{key}: {value} above maximum {register.max}")
+    return problems
+
+
+async def async_restore_parameters(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Write parameters from a backup file that differ from the device."""
+    coordinator = _get_coordinator(hass, call)
+    register_map = coordinator.controller.register_map
+    path = _resolve_path(hass, call.data[ATTR_FILENAME])
+    
+    try:
+        text = await hass.async_add_executor_job(_read_file, path)
+        header, values = _parse_backup(text)
+    except (OSError, ValueError, KeyError, TypeError) as err:
+        raise ServiceValidationError(f"Cannot read backup {path}: {err}") from err
+    
+    if header.get("format") != BACKUP_VERSION:
+        raise ServiceValidationError(f"Unsupported backup format: {header.get('format')}")
+    if header.get("controller") != coordinator.controller_type:
+        raise ServiceValidationError(
+            f"Backup is for a {header.get('controller')} controller, "
+            f"this heat pump uses {coordinator.controller_type}"
+        )
+    problems = _validate_values(register_map, values)
+    if problems:
+        raise ServiceValidationError("Invalid backup values: " + "; ".join(problems))
+    
+    try:
+        live = await hass.async_add_executor_job(coordinator.read_raw_values, values)
+    except Exception as err:
+        raise HomeAssistantError(f"Reading parameters failed: {err}") from err
+    
+    changes = {key: raw for key, raw in values.items() if live.get(key) != raw}
+    response = {
+        "filename": path,
+        "parameters": len(values),
+        "changed": {
+            key: {
+                "from": round(register_map.scale_value(key, live[key]), 6) if key in live else None,
+                "to": round(register_map.scale_value(key, raw), 6),
+            }
+            for key, raw in changes.items()
+        },
+        "written": 0,
+    }
+    
+    if not changes or call.data[ATTR_DRY_RUN]:
+        return response
+    
+    try:
+        await coordinator.async_write_block(changes)
+    except Exception as err:
+        raise HomeAssistantError(f"Restoring parameters failed: {err}") from err
+    
+    response["written"] = len(changes)
+    _LOGGER.info("Restored %d of %d parameters from %s", len(changes), len(values), path)
+    
+    return response
+
+
+async def async_set_heating_curve(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Replace economic mode curves, writing the whole curve block in one request.
+    
+    Curves not given keep their current points, so the device never runs with
+    a half-written curve and the block stays contiguous (E01-E24 on CHICO).
+    """
+    coordinator = _get_coordinator(hass, call)
+    controller = coordinator.controller
+    register_map = controller.register_map
+    if not controller.curves:
+        raise ServiceValidationError(f"{controller.name} controller has no economic mode curves")
+    
+    given = [curve for curve in CURVES if curve in call.data]
+    if not given:
+        raise ServiceValidationError(f"No curve given (one of: {', '.join(controller.curves)})")
+    
+    problems = []
+    values = {}
+    for curve in given:
+        if curve not in controller.curves:
+            problems.append(f"{curve}: not supported by the {controller.name} controller")
+            continue
+        _, _, ambient_keys, target_keys = controller.curves[curve]
+        curve_problems, curve_values = validate_curve(
+            register_map, curve, ambient_keys, target_keys, call.data[curve]
+        )
+        problems.extend(curve_problems)
+        values.update(curve_values)
+    if problems:
+        raise ServiceValidationError("Invalid curve: " + "; ".join(problems))
+    
+    # Keep the other curves as they are (from cache, read if missing)
+    block_keys = [
+        key
+        for _, _, ambient_keys, target_keys in controller.curves.values()
+        for key in ambient_keys + target_keys
+    ]
+    missing = []
+    for key in block_keys:
+        if key in values:
+            continue
+        cached = coordinator.data.get(key)
+        if isinstance(cached, dict):
+            values[key] = register_map.raw_value(key, cached["value"])
+        else:
+            missing.append(key)
+    
+    try:
+        if missing:
+            values.update(await hass.async_add_executor_job(coordinator.read_raw_values, missing))
+        await coordinator.async_write_block(values)
+    except Exception as err:
+        raise HomeAssistantError(f"Writing curves failed: {err}") from err
+    
+    _LOGGER.info("Wrote %s curve(s) as one block of %d registers", ", ".join(given), len(values))
+    
+    return {
+        curve: [
+            {
+                ATTR_AMBIENT: coordinator.data[ambient_key]["value"],
+                ATTR_TARGET: coordinator.data[target_key]["value"],
+            }
+            for ambient_key, target_key in zip(ambient_keys, target_keys)
+        ]
+        for curve, (_, _, ambient_keys, target_keys) in controller.curves.items()
+    }
+
+
+def async_get_fault_log(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return active faults and the fault log (newest first), served from memory."""
+    coordinator = _get_coordinator(hass, call)
+    return {
+        "active": coordinator.faults.active,
+        "faults": coordinator.faults.entries(call.data.get(ATTR_LIMIT)),
+    }
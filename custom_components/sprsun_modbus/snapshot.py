@@ -0,0 +1,322 @@
+"""Raw register snapshots for SPRSUN Heat Pump.
+
+A snapshot is a fixed binary layout in a memory-mapped file: the raw
+register words and bits of the controller, when each of them was last read
+and a sequence counter. The writer sets the counter to an odd value before
+it touches the buffer and to the next even value afterwards (seqlock), so
+readers in other processes never take a lock - they decode straight from
+the mapping and retry if the counter was odd or moved meanwhile.
+
+Layout (header little-endian, every area starts 8-byte aligned):
+    header      magic "SPRS", layout version, word order (0 unknown,
+                1 big, 2 little), sequence (uint64), publish time (float64),
+                holding/discrete/coil counts (uint32), controller (16 bytes)
+    holding     uint16[holding] raw words, big-endian as in the Modbus frame
+    discrete    uint8[discrete] discrete inputs (0/1)
+    coils       uint8[coils] coils (0/1)
+    timestamps  float64[holding + discrete + coils] unix time of the last
+                read of each entry (0 = never read)
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from collections.abc import Callable, Iterable
+from typing import TypeVar
+
+from .codec import WORD_ORDER_BIG, WORD_ORDER_LITTLE
+from .const import MAX_READ_COUNT, SNAPSHOT_DIR
+from .register_map import RegisterMap
+
+SNAPSHOT_MAGIC = b"SPRS"
+SNAPSHOT_VERSION = 1  # Bumped when the layout changes
+SNAPSHOT_READ_RETRIES = 100  # Seqlock retries before a reader gives up
+SNAPSHOT_PREFIX = "sprsun_modbus_"
+SNAPSHOT_SUFFIX = ".snapshot"  # Published snapshots (private worker snapshots end in .worker)
+
+AREA_HOLDING = "holding"
+AREA_DISCRETE = "discrete"
+AREA_COILS = "coils"
+
+_HEADER = struct.Struct("<4sHBxQdIII16s")
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 8
+HEADER_SIZE = (_HEADER.size + 7) & ~7
+
+_WORD_ORDERS = {None: 0, WORD_ORDER_BIG: 1, WORD_ORDER_LITTLE: 2}
+_WORD_ORDER_CODES = {code: word_order for word_order, code in _WORD_ORDERS.items()}
+
+T = TypeVar("T")
+
+
+def _align(size: int) -> int:
+    """Round a byte size up to the next multiple of 8."""
+    return (size + 7) & ~7
+
+
+def snapshot_directory() -> str:
+    """Return the directory snapshots are created in."""
+    return SNAPSHOT_DIR if os.path.isdir(SNAPSHOT_DIR) else tempfile.gettempdir()
+
+
+def snapshot_path(entry_id: str) -> str:
+    """Return the path of the published snapshot of a config entry."""
+    return os.path.join(snapshot_directory(), f"{SNAPSHOT_PREFIX}{entry_id}{SNAPSHOT_SUFFIX}")
+
+
+class SnapshotLayout:
+    """Byte offsets of the areas of a snapshot."""
+    
+    def __init__(self, holding: int, discrete: int, coils: int) -> None:
+        """Initialize from the number of entries per area."""
+        self.counts = {AREA_HOLDING: holding, AREA_DISCRETE: discrete, AREA_COILS: coils}
+        self.offsets = {AREA_HOLDING: HEADER_SIZE}
+        self.offsets[AREA_DISCRETE] = self.offsets[AREA_HOLDING] + _align(2 * holding)
+        self.offsets[AREA_COILS] = self.offsets[AREA_DISCRETE] + _align(discrete)
+        self.timestamp_offset = self.offsets[AREA_COILS] + _align(coils)
+        # Index of the first timestamp of each area
+        self.timestamp_index = {AREA_HOLDING: 0, AREA_DISCRETE: holding, AREA_COILS: holding + discrete}
+        self.size = self.timestamp_offset + 8 * (holding + discrete + coils)
+    
+    @classmethod
+    def for_map(cls, register_map: RegisterMap) -> SnapshotLayout:
+        """Return the layout covering every address of a register map."""
+        holding = max((register.address + register.width for register in register_map.registers), default=0)
+        inputs = [address for address, _ in register_map.discrete_inputs.values()]
+        inputs.extend(register_map.alarm_inputs)
+        coils = [address for address, _ in register_map.coil_switches.values()]
+        coils.extend(address for address, _, _ in register_map.coil_buttons.values())
+        return cls(holding, max(inputs, default=-1) + 1, max(coils, default=-1) + 1)
+
+
+class SnapshotWriter:
+    """Collects the reads of one connection and publishes them as snapshots.
+    
+    Reads are staged in a private buffer (store_words/store_bits, called by
+    ModbusConnection for every successful read) and copied into the shared
+    mapping in one seqlock-protected pass by publish(). Without a mapping
+    the staged snapshot is only available in-process through view().
+    """
+    
+    def __init__(self, buffer: mmap.mmap | None, layout: SnapshotLayout, controller: str) -> None:
+        """Initialize and publish an empty snapshot into buffer."""
+        self._buffer = buffer
+        self.layout = layout
+        self.controller = controller
+        # Continue the sequence of a previous writer so readers notice the restart
+        self.sequence = 0
+        if buffer is not None and buffer[:4] == SNAPSHOT_MAGIC:
+            self.sequence = _SEQUENCE.unpack_from(buffer, _SEQUENCE_OFFSET)[0] & ~1
+        self._staging = bytearray(layout.size)
+        self._timestamps = memoryview(self._staging)[layout.timestamp_offset:].cast("d")
+        self._view: SnapshotReader | None = None
+        self.publish()
+    
+    @classmethod
+    def open(cls, path: str, layout: SnapshotLayout, controller: str) -> SnapshotWriter:
+        """Create (or resize) a snapshot file and map it for writing."""
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, layout.size)
+            buffer = mmap.mmap(fd, layout.size)
+        finally:
+            os.close(fd)
+        return cls(buffer, layout, controller)
+    
+    def store_words(self, address: int, registers: list[int]) -> None:
+        """Stage holding registers read at address."""
+        count = min(len(registers), self.layout.counts[AREA_HOLDING] - address)
+        if address < 0 or count <= 0:
+            return
+        struct.pack_into(
+            f">{count}H", self._staging, self.layout.offsets[AREA_HOLDING] + 2 * address, *registers[:count]
+        )
+        self._stamp(AREA_HOLDING, address, count)
+    
+    def store_bits(self, area: str, address: int, bits: Iterable[bool]) -> None:
+        """Stage discrete inputs or coils read at address (pymodbus padding beyond the area is dropped)."""
+        values = bytes(1 if bit else 0 for bit in bits)
+        count = min(len(values), self.layout.counts[area] - address)
+        if address < 0 or count <= 0:
+            return
+        offset = self.layout.offsets[area] + address
+        self._staging[offset:offset + count] = values[:count]
+        self._stamp(area, address, count)
+    
+    def _stamp(self, area: str, address: int, count: int) -> None:
+        """Record the read time of staged entries."""
+        index = self.layout.timestamp_index[area] + address
+        self._timestamps[index:index + count] = array("d", [time.time()]) * count
+    
+    def _write_header(self, word_order: str | None, published: float) -> None:
+        """Pack the header into the staging buffer."""
+        _HEADER.pack_into(
+            self._staging, 0,
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, _WORD_ORDERS.get(word_order, 0), self.sequence, published,
+            self.layout.counts[AREA_HOLDING], self.layout.counts[AREA_DISCRETE], self.layout.counts[AREA_COILS],
+            self.controller.encode()[:16],
+        )
+    
+    def publish(self, word_order: str | None = None) -> int:
+        """Copy staged reads into the mapping as one consistent snapshot.
+        
+        Returns:
+            Sequence number of the published snapshot
+        """
+        if self._buffer is None:
+            self.sequence += 2
+            self._write_header(word_order, time.time())
+            return self.sequence
+        
+        self.sequence += 1
+        _SEQUENCE.pack_into(self._buffer, _SEQUENCE_OFFSET, self.sequence)  # Odd: write in progress
+        self._buffer[HEADER_SIZE:] = self._staging[HEADER_SIZE:]
+        self.sequence += 1
+        self._write_header(word_order, time.time())
+        self._buffer[:HEADER_SIZE] = self._staging[:HEADER_SIZE]
+        return self.sequence
+    
+    def view(self) -> SnapshotReader:
+        """Return a reader of the staging buffer (same process, everything staged so far)."""
+        if self._view is None:
+            self._view = SnapshotReader(self._staging)
+        return self._view
+    
+    def close(self) -> None:
+        """Unmap the snapshot."""
+        if self._view is not None:
+            self._view.close()
+        self._timestamps.release()
+        if self._buffer is not None:
+            self._buffer.close()
+
+
+class SnapshotReader:
+    """Lock-free reader of a snapshot mapping (any process)."""
+    
+    def __init__(self, buffer: mmap.mmap | bytearray) -> None:
+        """Initialize from a mapping (or staging buffer) holding a snapshot written by SnapshotWriter."""
+        magic, version, _, _, _, holding, discrete, coils, controller = _HEADER.unpack_from(buffer, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f"Not a SPRSUN snapshot (version {SNAPSHOT_VERSION}): {magic!r} v{version}")
+        self.layout = SnapshotLayout(holding, discrete, coils)
+        if len(buffer) < self.layout.size:
+            raise ValueError(f"Snapshot truncated: {len(buffer)} of {self.layout.size} bytes")
+        self.controller = controller.rstrip(b"\0").decode()
+        self._buffer = buffer
+        
+        view = memoryview(buffer)
+        self._view = view
+        self.holding = view[self.layout.offsets[AREA_HOLDING]:][:2 * holding]
+        self.discrete = view[self.layout.offsets[AREA_DISCRETE]:][:discrete]
+        self.coils = view[self.layout.offsets[AREA_COILS]:][:coils]
+        self.timestamps = view[self.layout.timestamp_offset:self.layout.size].cast("d")
+    
+    @classmethod
+    def open(cls, path: str) -> SnapshotReader:
+        """Map a snapshot file read-only."""
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+    
+    @property
+    def sequence(self) -> int:
+        """Return the current sequence number (odd while the writer is publishing)."""
+        return _SEQUENCE.unpack_from(self._buffer, _SEQUENCE_OFFSET)[0]
+    
+    @property
+    def word_order(self) -> str | None:
+        """Return the word order of 32-bit values published with the snapshot."""
+        return _WORD_ORDER_CODES.get(self._buffer[6])
+    
+    @property
+    def published(self) -> float:
+        """Return unix time of the last publish (0 = nothing published yet)."""
+        return struct.unpack_from("<d", self._buffer, 16)[0]
+    
+    def timestamp(self, area: str, address: int) -> float:
+        """Return unix time an entry was last read (0 = never)."""
+        return self.timestamps[self.layout.timestamp_index[area] + address]
+    
+    def read(self, decode: Callable[[SnapshotReader], T]) -> tuple[T, int]:
+        """Run decode against one consistent snapshot.
+        
+        decode reads the views of this reader directly (no copy) and is
+        repeated if the writer published meanwhile.
+        
+        Returns:
+            (decode result, sequence number of the snapshot it saw)
+        
+        Raises:
+            TimeoutError: The writer kept publishing for SNAPSHOT_READ_RETRIES attempts
+        """
+        for _ in range(SNAPSHOT_READ_RETRIES):
+            sequence = self.sequence
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            result = decode(self)
+            if self.sequence == sequence:
+                return result, sequence
+        raise TimeoutError("Snapshot kept changing while reading")
+    
+    def close(self) -> None:
+        """Release views and unmap the snapshot."""
+        for view in (self.holding, self.discrete, self.coils, self.timestamps, self._view):
+            view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+def decode_snapshot(
+    register_map: RegisterMap,
+    snapshot: SnapshotReader,
+    tiers: tuple[str | None, ...],
+    since: float = 0.0,
+) -> dict:
+    """Decode register map values from a snapshot (call through SnapshotReader.read).
+    
+    Only entries read at or after `since` are returned, so a batch that
+    failed in the last poll doesn't resurface older values.
+    
+    Args:
+        tiers: Poll tiers of the holding registers to decode (None = on demand)
+        since: Unix time - entries last read before it are skipped
+    
+    Returns:
+        Scaled values by cache key, like ControllerBase.read_all_registers
+    """
+    data = {}
+    word_order = snapshot.word_order or WORD_ORDER_BIG
+    
+    def fresh(area: str, address: int) -> bool:
+        stamp = snapshot.timestamp(area, address)
+        return stamp > 0 and stamp >= since
+    
+    # Decoding from memory has no padding cost - one layout per contiguous area
+    for layout in register_map.read_plan(tiers, MAX_READ_COUNT):
+        payload = snapshot.holding[2 * layout.start:2 * (layout.start + layout.count)]
+        for key, value in layout.decode_payload(payload, word_order).items():
+            if fresh(AREA_HOLDING, register_map.by_key[key].address):
+                data[key] = register_map.scale_value(key, value)
+    
+    for key, (address, _) in register_map.discrete_inputs.items():
+        if fresh(AREA_DISCRETE, address):
+            data[key] = bool(snapshot.discrete[address])
+    
+    if register_map.alarm_inputs and all(fresh(AREA_DISCRETE, address) for address in register_map.alarm_inputs):
+        data["active_alarms"] = [
+            register_map.alarm_inputs[address][0]
+            for address in sorted(register_map.alarm_inputs)
+            if snapshot.discrete[address]
+        ]
+    
+    for key, (address, _) in register_map.coil_switches.items():
+        if fresh(AREA_COILS, address):
+            data[key] = bool(snapshot.coils[address])
+    
+    return data
@@ -0,0 +1,184 @@
+"""Read the published register snapshot of SPRSUN Heat Pump from other processes.
+
+With "Publish register snapshot" enabled, the integration writes the raw
+registers of every poll to /dev/shm/sprsun_modbus_<entry id>.snapshot (see
+snapshot.py). This module decodes it with the integration's register map,
+without a Modbus connection and without Home Assistant - the gateway
+accepts only one client, and the snapshot costs nothing to read:
+
+    from snapshot_reader import SnapshotFile, find_snapshots
+    
+    with SnapshotFile(find_snapshots()[0]) as snapshot:
+        sample = snapshot.read()
+        print(sample["values"]["outlet_temp"], sample["published"])
+
+Import it from the integration directory (add that to sys.path) or run it
+directly: python snapshot_reader.py [path] [--watch seconds]
+
+The register history log (history.py) is readable the same way:
+
+    from snapshot_reader import HistoryReader
+    
+    for timestamp, values in HistoryReader(directory).read(start, end, {"outlet_temp"}):
+        ...
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+if __package__:
+    from .history import HistoryReader
+    from .register_map import TIER_FAST, TIER_SLOW, RegisterMap, load_register_map
+    from .snapshot import (
+        AREA_COILS,
+        AREA_DISCRETE,
+        AREA_HOLDING,
+        SNAPSHOT_PREFIX,
+        SNAPSHOT_SUFFIX,
+        SnapshotReader,
+        decode_snapshot,
+        snapshot_directory,
+    )
+else:
+    # Loaded by path: import the Home Assistant free modules of the integration
+    # under a private package name, without running its __init__ (needs HA)
+    import importlib.machinery
+    import importlib.util
+    
+    _PACKAGE = "_sprsun_modbus"
+    if _PACKAGE not in sys.modules:
+        _spec = importlib.machinery.ModuleSpec(_PACKAGE, None, is_package=True)
+        _spec.submodule_search_locations = [str(Path(__file__).parent)]
+        sys.modules[_PACKAGE] = importlib.util.module_from_spec(_spec)
+    
+    from _sprsun_modbus.history import HistoryReader
+    from _sprsun_modbus.register_map import TIER_FAST, TIER_SLOW, RegisterMap, load_register_map
+    from _sprsun_modbus.snapshot import (
+        AREA_COILS,
+        AREA_DISCRETE,
+        AREA_HOLDING,
+        SNAPSHOT_PREFIX,
+        SNAPSHOT_SUFFIX,
+        SnapshotReader,
+        decode_snapshot,
+        snapshot_directory,
+    )
+
+# HistoryReader is re-exported, so readers need only this module
+__all__ = ["ALL_TIERS", "HistoryReader", "SnapshotFile", "find_snapshots", "main"]
+
+# Everything in the map: polled tiers and registers read on demand
+ALL_TIERS = (TIER_FAST, TIER_SLOW, None)
+
+
+def find_snapshots(directory: str | None = None) -> list[str]:
+    """Return paths of the published snapshots (one per config entry)."""
+    pattern = os.path.join(directory or snapshot_directory(), f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}")
+    return sorted(glob.glob(pattern))
+
+
+def _timestamps(register_map: RegisterMap, snapshot: SnapshotReader, keys) -> dict[str, float]:
+    """Return unix time each decoded key was last read."""
+    timestamps = {}
+    for key in keys:
+        if key in register_map.by_key:
+            timestamps[key] = snapshot.timestamp(AREA_HOLDING, register_map.by_key[key].address)
+        elif key in register_map.discrete_inputs:
+            timestamps[key] = snapshot.timestamp(AREA_DISCRETE, register_map.discrete_inputs[key][0])
+        elif key in register_map.coil_switches:
+            timestamps[key] = snapshot.timestamp(AREA_COILS, register_map.coil_switches[key][0])
+        elif key == "active_alarms":
+            timestamps[key] = min(
+                snapshot.timestamp(AREA_DISCRETE, address) for address in register_map.alarm_inputs
+            )
+    return timestamps
+
+
+class SnapshotFile:
+    """Published snapshot of one heat pump, decoded with its register map."""
+    
+    def __init__(self, path: str) -> None:
+        """Initialize (maps the file read-only)."""
+        self.path = path
+        self.snapshot = SnapshotReader.open(path)
+        self.register_map = load_register_map(self.snapshot.controller)
+    
+    def __enter__(self) -> SnapshotFile:
+        """Enter context."""
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        """Exit context."""
+        self.close()
+    
+    @property
+    def sequence(self) -> int:
+        """Return the current sequence number (changes with every publish)."""
+        return self.snapshot.sequence
+    
+    def read(self, tiers: tuple[str | None, ...] = ALL_TIERS) -> dict:
+        """Decode one consistent snapshot.
+        
+        Returns:
+            {"sequence", "published", "controller", "word_order",
+             "values": {key: scaled value}, "updated": {key: unix time of the read}}
+            Entries never read are missing from values and updated.
+        """
+        def decode(snapshot: SnapshotReader) -> dict:
+            values = decode_snapshot(self.register_map, snapshot, tiers)
+            return {
+                "published": snapshot.published,
+                "controller": snapshot.controller,
+                "word_order": snapshot.word_order,
+                "values": values,
+                "updated": _timestamps(self.register_map, snapshot, values),
+            }
+        
+        sample, sequence = self.snapshot.read(decode)
+        sample["sequence"] = sequence
+        return sample
+    
+    def wait(self, sequence: int, timeout: float, interval: float = 0.05) -> bool:
+        """Wait until a snapshot newer than sequence is published (polls the counter)."""
+        deadline = time.monotonic() + timeout
+        while self.snapshot.sequence == sequence or self.snapshot.sequence & 1:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+        return True
+    
+    def close(self) -> None:
+        """Unmap the file."""
+        self.snapshot.close()
+
+
+def main() -> None:
+    """Print the snapshot as JSON (once, or on every publish with --watch)."""
+    parser = argparse.ArgumentParser(description="Print the SPRSUN Heat Pump register snapshot as JSON")
+    parser.add_argument("path", nargs="?", help="Snapshot file (default: the first one found)")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="Print every new snapshot, give up after SECONDS without one")
+    args = parser.parse_args()
+    
+    path = args.path
+    if path is None:
+        paths = find_snapshots()
+        if not paths:
+            parser.error(f"no snapshot in {snapshot_directory()} - enable 'Publish register snapshot' in the integration options")
+        path = paths[0]
+    
+    with SnapshotFile(path) as snapshot:
+        while True:
+            sample = snapshot.read()
+            print(json.dumps(sample), flush=True)
+            if args.watch is None or not snapshot.wait(sample["sequence"], args.watch):
+                break
+
+
+if __name__ == "__main__":
+    main()
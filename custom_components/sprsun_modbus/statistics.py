@@ -0,0 +1,97 @@
+"""Long-term statistics import for high-rate SPRSUN Heat Pump sensors.
+
+With "Import long-term statistics" enabled, temperature, pressure and
+frequency sensors polled every scan interval write their state only once
+per STATISTICS_STATE_INTERVAL, without a state class, so the recorder
+neither stores every poll nor compiles statistics from the thinned
+states. Instead, shortly after every full hour the mean, min and max of
+the previous hour are computed from the coordinator's in-memory time
+series (every poll, see timeseries.py) and imported into each entity's
+own long-term statistics, so existing charts continue seamlessly.
+
+The recorder accepts imported statistics per hour only; finer history
+(the last day at 1 minute) stays available from coordinator.timeseries.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, STATISTICS_DEVICE_CLASSES, STATISTICS_IMPORT_MINUTE
+from .register_map import TIER_FAST, RegisterMap
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def statistics_keys(register_map: RegisterMap) -> set[str]:
+    """Return keys of the high-rate sensors handled by the statistics import."""
+    return {
+        register.key for register in register_map.registers
+        if register.tier == TIER_FAST and register.entity == "sensor"
+        and register.device_class in STATISTICS_DEVICE_CLASSES
+    }
+
+
+class StatisticsImporter:
+    """Hourly import of mean/min/max of the high-rate sensors of one config entry."""
+    
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, coordinator) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.entry = entry
+        self.coordinator = coordinator
+        self._imported: datetime | None = None  # Start of the last imported hour
+    
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Import every hour from now on, return the unsubscribe callback."""
+        return async_track_time_change(
+            self.hass, self._async_import, minute=STATISTICS_IMPORT_MINUTE, second=0
+        )
+    
+    async def _async_import(self, now: datetime) -> None:
+        """Import statistics of the hour that ended before now."""
+        if "recorder" not in self.hass.config.components:
+            return
+        from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+        from homeassistant.components.recorder.statistics import async_import_statistics
+        
+        end = dt_util.as_utc(now).replace(minute=0, second=0, microsecond=0)
+        start = end - timedelta(hours=1)
+        if self._imported == start:
+            return
+        self._imported = start
+        
+        registry = er.async_get(self.hass)
+        register_map = self.coordinator.controller.register_map
+        imported = 0
+        for key in sorted(self.coordinator.statistics_keys):
+            entity_id = registry.async_get_entity_id("sensor", DOMAIN, f"{self.entry.entry_id}_{key}")
+            # Polls stamped exactly at the end belong to the next hour
+            aggregate = self.coordinator.timeseries.aggregate(key, start.timestamp(), end.timestamp() - 0.001)
+            if entity_id is None or aggregate is None:
+                continue
+            metadata = StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=None,
+                source="recorder",
+                statistic_id=entity_id,
+                unit_of_measurement=register_map.by_key[key].unit,
+            )
+            statistic = StatisticData(
+                start=start,
+                mean=aggregate["mean"],
+                min=aggregate["min"],
+                max=aggregate["max"],
+            )
+            async_import_statistics(self.hass, metadata, [statistic])
+            imported += 1
+        
+        _LOGGER.debug("Imported %d hourly statistics for %s", imported, start.isoformat())
@@ -8,7 +8,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, REGISTERS_SWITCH
+from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,8 +21,10 @@ async def async_setup_entry(
     """Set up SPRSUN switches."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
     
+    controller = coordinator.controller
+    
     entities = []
-    for key, (address, bit, name, _) in REGISTERS_SWITCH.items():
+    for key, (address, bit, name, _) in controller.switch_registers.items():
         entities.append(
             SPRSUNSwitch(
                 coordinator,
@@ -34,6 +36,18 @@ async def async_setup_entry(
             )
         )
     
+    # Controllers with coils (CAREL) - one coil per switch
+    for key, (address, name) in controller.coil_switches.items():
+        entities.append(
+            SPRSUNCoilSwitch(
+                coordinator,
+                config_entry,
+                key,
+                name,
+                address,
+            )
+        )
+    
     async_add_entities(entities)
 
 
@@ -109,55 +123,67 @@ class SPRSUNSwitch(CoordinatorEntity, SwitchEntity):
     
     async def _async_write_bit(self, value: bool) -> None:
         """Write bit to Modbus register (safe bit manipulation)."""
-        import time
+        # Fresh read, modify and write in one locked sequence - other bits of the word stay intact
+        reg_key = f"_control_{self._address:04x}"
+        current_value, new_value = await self.coordinator.async_write_bit(self._address, self._bit, value, reg_key)
+        if new_value == current_value:
+            return
         
-        def _write():
-            # Use coordinator's client for writes
-            client = self.coordinator.client
-            
-            # Ensure connection (auto-reconnect if needed)
-            if not self.coordinator._ensure_connection(client, "client"):
-                raise ConnectionError("Cannot connect to Modbus device")
-            
-            # Read current register value
-            result = client.read_holding_registers(
-                address=self._address,
-                count=1,
-                device_id=self.coordinator.device_address
-            )
-            
-            if result.isError():
-                raise ValueError(f"Modbus read error: {result}")
-            
-            current_value = result.registers[0]
-            
-            # Modify only our bit
-            if value:
-                new_value = current_value | (1 << self._bit)  # Set bit
-            else:
-                new_value = current_value & ~(1 << self._bit)  # Clear bit
-            
-            # Write back if changed
-            if new_value != current_value:
-                result = client.write_register(
-                    address=self._address,
-                    value=new_value,
-                    device_id=self.coordinator.device_address
-                )
-                
-                if result.isError():
-                    raise ValueError(f"Modbus write error: {result}")
-                
-                _LOGGER.info(
-                    "Wrote bit %d=%s to register 0x%04X (was 0x%04X, now 0x%04X)",
-                    self._bit, value, self._address, current_value, new_value
-                )
-            
-            # Update cached value with timestamp using register-based key
-            reg_key = f"_control_{self._address:04x}"
-            self.coordinator.data[reg_key] = {
-                "value": new_value,
-                "updated_at": time.time()
-            }
+        _LOGGER.info(
+            "Wrote bit %d=%s to register 0x%04X (was 0x%04X, now 0x%04X)",
+            self._bit, value, self._address, current_value, new_value
+        )
+
+
+class SPRSUNCoilSwitch(CoordinatorEntity, SwitchEntity):
+    """Representation of a SPRSUN switch backed by a coil."""
+    
+    def __init__(
+        self,
+        coordinator,
+        config_entry: ConfigEntry,
+        key: str,
+        name: str,
+        address: int,
+    ) -> None:
+        """Initialize the switch."""
+        super().__init__(coordinator)
         
-        await self.hass.async_add_executor_job(_write)
+        self._key = key
+        self._address = address
+        self._attr_name = f"{config_entry.data[CONF_NAME]} {name}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{key}"
+        
+        # Device info
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": config_entry.data[CONF_NAME],
+            "manufacturer": "SPRSUN",
+            "model": "Heat Pump",
+        }
+    
+    @property
+    def is_on(self) -> bool:
+        """Return true if coil is set."""
+        cache_entry = self.coordinator.data.get(self._key)
+        if isinstance(cache_entry, dict):
+            return bool(cache_entry.get("value"))
+        return bool(cache_entry)
+    
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return (
+            self.coordinator.last_update_success
+            and self._key in self.coordinator.data
+        )
+    
+    async def async_turn_on(self, **kwargs) -> None:
+        """Turn the switch on."""
+        await self.coordinator.async_write_coil(self._address, True, self._key)
+        self.async_write_ha_state()
+    
+    async def async_turn_off(self, **kwargs) -> None:
+        """Turn the switch off."""
+        await self.coordinator.async_write_coil(self._address, False, self._key)
+        self.async_write_ha_state()
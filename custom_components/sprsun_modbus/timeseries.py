@@ -0,0 +1,214 @@
+"""Bounded in-memory time series of SPRSUN Heat Pump telemetry.
+
+Every poll adds one sample per measurement to preallocated ring arrays.
+Besides the raw tier, coarser tiers keep min/max/mean per fixed bucket
+(1 min for the last day, 15 min for the last week by default), all fed
+from the raw samples as they arrive. Nothing is allocated after start-up:
+tier capacities are scaled down if the arrays would exceed the memory
+ceiling. Queries pick the finest tier that still reaches back far enough.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+
+from .const import TIMESERIES_MAX_BYTES, TIMESERIES_TIERS
+from .register_map import TIER_FAST, RegisterMap
+
+_NAN = math.nan
+
+
+class TimeSeriesTier:
+    """Ring of samples (resolution 0) or min/max/mean buckets of all series."""
+    
+    def __init__(self, resolution: float, capacity: int, keys: list[str]) -> None:
+        """Initialize (allocates all arrays)."""
+        self.resolution = resolution
+        self.capacity = capacity
+        self.times = array("d", [_NAN]) * capacity
+        self.mean = {key: array("d", [_NAN]) * capacity for key in keys}
+        if resolution:
+            self.minimum = {key: array("d", [_NAN]) * capacity for key in keys}
+            self.maximum = {key: array("d", [_NAN]) * capacity for key in keys}
+            # Open bucket: start time and [min, max, sum, count] per key
+            self._bucket: float | None = None
+            self._open = {key: [math.inf, -math.inf, 0.0, 0] for key in keys}
+        self.head = 0  # Next slot to write
+        self.count = 0
+    
+    @property
+    def nbytes(self) -> int:
+        """Return bytes held by the arrays."""
+        arrays = [self.times, *self.mean.values()]
+        if self.resolution:
+            arrays += [*self.minimum.values(), *self.maximum.values()]
+        return sum(len(values) * values.itemsize for values in arrays)
+    
+    @property
+    def oldest(self) -> float | None:
+        """Return time of the oldest entry (None if empty)."""
+        if not self.count:
+            return None
+        return self.times[(self.head - self.count) % self.capacity]
+    
+    def add(self, timestamp: float, values: dict[str, float]) -> None:
+        """Add one raw sample (closes the open bucket when timestamp leaves it)."""
+        if not self.resolution:
+            self._push(timestamp, {key: (value, value, value) for key, value in values.items()})
+            return
+        
+        bucket = timestamp - timestamp % self.resolution
+        if self._bucket is not None and bucket != self._bucket:
+            self._close()
+        self._bucket = bucket
+        for key, value in values.items():
+            state = self._open[key]
+            state[0] = min(state[0], value)
+            state[1] = max(state[1], value)
+            state[2] += value
+            state[3] += 1
+    
+    def _close(self) -> None:
+        """Store the open bucket as one entry."""
+        entry = {}
+        for key, state in self._open.items():
+            if state[3]:
+                entry[key] = (state[0], state[1], state[2] / state[3])
+            state[:] = [math.inf, -math.inf, 0.0, 0]
+        self._push(self._bucket, entry)
+    
+    def _push(self, timestamp: float, entry: dict[str, tuple[float, float, float]]) -> None:
+        """Write one entry into the ring (keys missing from entry become NaN)."""
+        slot = self.head
+        self.times[slot] = timestamp
+        for key, values in self.mean.items():
+            minimum, maximum, mean = entry.get(key, (_NAN, _NAN, _NAN))
+            values[slot] = mean
+            if self.resolution:
+                self.minimum[key][slot] = minimum
+                self.maximum[key][slot] = maximum
+        self.head = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+    
+    def rows(self, key: str, start: float, end: float) -> list[tuple[float, float, float, float]]:
+        """Return (time, min, max, mean) of the entries from start to end, oldest first."""
+        rows = []
+        mean = self.mean[key]
+        for offset in range(1, self.count + 1):
+            slot = (self.head - offset) % self.capacity
+            timestamp = self.times[slot]
+            if timestamp < start:
+                break
+            if timestamp > end or math.isnan(mean[slot]):
+                continue
+            if self.resolution:
+                rows.append((timestamp, self.minimum[key][slot], self.maximum[key][slot], mean[slot]))
+            else:
+                rows.append((timestamp, mean[slot], mean[slot], mean[slot]))
+        rows.reverse()
+        return rows
+
+
+class TimeSeriesStore:
+    """Recent history of the polled measurements of one coordinator."""
+    
+    def __init__(
+        self,
+        keys: list[str],
+        scan_interval: float,
+        tiers: tuple[tuple[float, float], ...] = TIMESERIES_TIERS,
+        max_bytes: int = TIMESERIES_MAX_BYTES,
+    ) -> None:
+        """Initialize.
+        
+        Args:
+            keys: Cache keys of the numeric values to keep
+            scan_interval: Poll interval in seconds (sizes the raw tier)
+            tiers: (resolution, span) in seconds, resolution 0 = raw samples
+            max_bytes: Memory ceiling of all arrays
+        """
+        self.keys = list(keys)
+        self._lock = threading.Lock()  # Polls add in the executor, queries come from the event loop
+        
+        # One extra entry so a full ring still covers its whole span
+        capacities = [math.ceil(span / (resolution or scan_interval)) + 1 for resolution, span in tiers]
+        # Estimate per entry: timestamp + mean (+ min/max) per key, 8 bytes each
+        needed = sum(
+            capacity * 8 * (1 + len(self.keys) * (3 if resolution else 1))
+            for (resolution, _), capacity in zip(tiers, capacities)
+        )
+        if needed > max_bytes:
+            scale = max_bytes / needed
+            capacities = [max(1, int(capacity * scale)) for capacity in capacities]
+        
+        self.tiers = [
+            TimeSeriesTier(resolution, capacity, self.keys)
+            for (resolution, _), capacity in zip(tiers, capacities)
+        ]
+    
+    @classmethod
+    def for_map(cls, register_map: RegisterMap, scan_interval: float, **kwargs) -> TimeSeriesStore:
+        """Return a store for the measurements (fast tier sensors) of a register map."""
+        keys = [
+            register.key for register in register_map.registers
+            if register.tier == TIER_FAST and register.entity == "sensor"
+        ]
+        return cls(keys, scan_interval, **kwargs)
+    
+    @property
+    def nbytes(self) -> int:
+        """Return bytes held by all tiers."""
+        return sum(tier.nbytes for tier in self.tiers)
+    
+    def add(self, timestamp: float, data: dict) -> None:
+        """Add the values of one poll (non-numeric and missing values are skipped)."""
+        values = {}
+        for key in self.keys:
+            value = data.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[key] = float(value)
+        with self._lock:
+            for tier in self.tiers:
+                tier.add(timestamp, values)
+    
+    def _tier(self, start: float, resolution: float | None) -> TimeSeriesTier:
+        """Return the finest tier (at least `resolution`) that reaches back to start."""
+        candidates = [tier for tier in self.tiers if resolution is None or tier.resolution >= resolution]
+        if not candidates:
+            candidates = self.tiers[-1:]
+        for tier in candidates:
+            oldest = tier.oldest
+            if tier.count < tier.capacity or (oldest is not None and oldest <= start):
+                return tier
+        return candidates[-1]
+    
+    def window(
+        self,
+        key: str,
+        start: float,
+        end: float = math.inf,
+        resolution: float | None = None,
+    ) -> list[tuple[float, float, float, float]]:
+        """Return (time, min, max, mean) rows of one series between start and end.
+        
+        Raw samples have min = max = mean. Bucket rows are stamped with the
+        bucket start; the bucket still being filled is not included.
+        
+        Args:
+            resolution: Minimum row spacing in seconds (None = finest available)
+        """
+        with self._lock:
+            return self._tier(start, resolution).rows(key, start, end)
+    
+    def aggregate(self, key: str, start: float, end: float = math.inf) -> dict | None:
+        """Return min, max, mean and number of rows of one series between start and end (None if empty)."""
+        rows = self.window(key, start, end)
+        if not rows:
+            return None
+        return {
+            "min": min(row[1] for row in rows),
+            "max": max(row[2] for row in rows),
+            "mean": sum(row[3] for row in rows) / len(rows),
+            "count": len(rows),
+        }
@@ -0,0 +1,371 @@
+"""Dedicated I/O worker process for SPRSUN Heat Pump.
+
+In worker mode the Modbus connection of a config entry lives in a spawned
+subprocess. The worker serializes every transaction of the gateway (polls,
+on-demand reads, writes, keepalives), decodes the poll with the controller
+(word order detection) and publishes the raw registers into a snapshot
+mapping (see snapshot.py). The coordinator decodes values straight from
+that mapping and sends commands over a pipe.
+
+WorkerClient stands in for ModbusConnection on the coordinator side, so
+the write, reconcile and keepalive paths work unchanged. A gateway that
+stalls the worker only blocks the worker: after WORKER_CALL_TIMEOUT the
+process is killed and the next call starts a fresh one.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from typing import Any
+
+from pymodbus.exceptions import ConnectionException, ModbusException, ModbusIOException
+
+from .const import (
+    RETRY_BUDGET,
+    WORKER_CALL_TIMEOUT,
+    WORKER_START_TIMEOUT,
+)
+from .register_map import TIER_FAST, TIER_SLOW
+from .snapshot import (
+    SNAPSHOT_PREFIX,
+    SnapshotLayout,
+    SnapshotReader,
+    SnapshotWriter,
+    decode_snapshot,
+    snapshot_directory,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Exceptions re-raised on the coordinator side with their original type
+_EXCEPTIONS = {
+    "ModbusIOException": ModbusIOException,
+    "ConnectionException": ConnectionException,
+    "ConnectionError": ConnectionError,
+    "ValueError": ValueError,
+}
+
+# ModbusConnection methods callable through the pipe
+_CLIENT_METHODS = {
+    "connect",
+    "close",
+    "begin_cycle",
+    "read_holding_registers",
+    "read_input_registers",
+    "read_coils",
+    "read_discrete_inputs",
+    "write_register",
+    "write_registers",
+    "write_coil",
+}
+
+
+class WorkerResponse:
+    """Picklable stand-in for a pymodbus response."""
+    
+    def __init__(self, registers: list[int] | None = None, bits: list[bool] | None = None, error: str | None = None) -> None:
+        """Initialize."""
+        self.registers = registers
+        self.bits = bits
+        self._error = error
+    
+    def isError(self) -> bool:  # noqa: N802 - pymodbus response API
+        """Return True for exception responses."""
+        return self._error is not None
+    
+    def __str__(self) -> str:
+        """Return error text (as logged for pymodbus exception responses)."""
+        return self._error or "WorkerResponse"
+
+
+def _to_response(result: Any) -> Any:
+    """Convert a pymodbus response into a WorkerResponse (other results pass through)."""
+    if not hasattr(result, "isError"):
+        return result
+    if result.isError():
+        return WorkerResponse(error=str(result))
+    return WorkerResponse(getattr(result, "registers", None), getattr(result, "bits", None))
+
+
+def _stats(client) -> tuple:
+    """Return connection statistics mirrored by WorkerClient."""
+    return (
+        client.connected,
+        client.reconnect_count,
+        client.timeout_count,
+        client.latency.srtt,
+        client.latency.timeout,
+    )
+
+
+def run_worker(
+    connection_config: dict,
+    controller_type: str,
+    device_address: int,
+    word_order: str | None,
+    snapshot_path: str,
+    conn,
+) -> None:
+    """Worker process main loop: execute commands from the coordinator until "stop"."""
+    from .connection import create_client
+    from .controllers import get_controller
+    
+    client = create_client(connection_config, "worker")
+    controller = get_controller(controller_type)
+    controller.word_order = word_order
+    writer = SnapshotWriter.open(
+        snapshot_path, SnapshotLayout.for_map(controller.register_map), controller.register_map.controller
+    )
+    client.recorder = writer
+    conn.send(("ready", (client.transport, client.framer, client.cost_model, client.needs_keepalive)))
+    
+    try:
+        while True:
+            try:
+                command, args, kwargs = conn.recv()
+            except EOFError:
+                break  # Coordinator gone
+            if command == "stop":
+                break
+            try:
+                if command == "poll":
+                    started = time.time()
+                    controller.poll_keys = kwargs.pop("poll_keys", None)
+                    controller.read_all_registers(client, device_address, **kwargs)
+                    writer.publish(controller.word_order)
+                    result = (started, controller.word_order)
+                elif command in _CLIENT_METHODS:
+                    result = _to_response(getattr(client, command)(*args, **kwargs))
+                    if command.startswith("read_"):
+                        writer.publish(controller.word_order)
+                else:
+                    raise ValueError(f"Unknown worker command: {command}")
+            except Exception as err:
+                conn.send(("raise", (type(err).__name__, str(err)), _stats(client)))
+                continue
+            conn.send(("ok", result, _stats(client)))
+    finally:
+        client.close()
+        writer.close()
+
+
+class _LatencyView:
+    """Latency statistics of the worker connection (as LatencyEstimator)."""
+    
+    def __init__(self) -> None:
+        """Initialize."""
+        self.srtt: float | None = None
+        self.timeout = 0.0
+
+
+class IOWorker:
+    """Coordinator-side handle of the worker process of one config entry."""
+    
+    def __init__(
+        self,
+        connection_config: dict,
+        controller_type: str,
+        device_address: int,
+        register_map,
+        word_order: str | None = None,
+        snapshot_path: str | None = None,
+    ) -> None:
+        """Initialize (the process is started by the first call, in the executor).
+        
+        Args:
+            snapshot_path: Published snapshot file to write (None = private temporary file)
+        """
+        self.connection_config = connection_config
+        self.controller_type = controller_type
+        self.device_address = device_address
+        self.register_map = register_map
+        self.word_order = word_order
+        self.client = WorkerClient(self)
+        self.restart_count = 0
+        
+        self.snapshot_path = snapshot_path
+        if snapshot_path is None:
+            fd, self.snapshot_path = tempfile.mkstemp(prefix=SNAPSHOT_PREFIX, suffix=".worker", dir=snapshot_directory())
+            os.close(fd)
+        
+        self._lock = threading.Lock()  # One command in flight on the pipe
+        self._process = None
+        self._conn = None
+        self.snapshot: SnapshotReader | None = None
+    
+    def _start(self) -> None:
+        """Spawn the worker process and map its snapshot (caller holds _lock)."""
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=run_worker,
+            args=(
+                self.connection_config, self.controller_type, self.device_address,
+                self.word_order, self.snapshot_path, child_conn,
+            ),
+            name="sprsun_modbus I/O worker",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        
+        try:
+            ready = self._conn.recv() if self._conn.poll(WORKER_START_TIMEOUT) else None
+        except EOFError:
+            ready = None  # Worker died during start (see its traceback in the log)
+        if ready is None:
+            self._kill()
+            raise ConnectionError("I/O worker did not start")
+        _, (transport, framer, cost_model, needs_keepalive) = ready
+        self.client.transport = transport
+        self.client.framer = framer
+        self.client.cost_model = cost_model
+        self.client.needs_keepalive = needs_keepalive
+        if self.snapshot is None:
+            self.snapshot = SnapshotReader.open(self.snapshot_path)
+        _LOGGER.debug("I/O worker started (pid %s, snapshot %s)", self._process.pid, self.snapshot_path)
+    
+    def _kill(self) -> None:
+        """Terminate the worker process (caller holds _lock)."""
+        if self._process is not None:
+            self._process.kill()
+            self._process.join(5)
+            self._process = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def call(self, command: str, *args, **kwargs) -> Any:
+        """Run one command in the worker and return its result (blocking, runs in executor).
+        
+        Raises:
+            ModbusIOException: The worker didn't answer within WORKER_CALL_TIMEOUT (it is restarted)
+        """
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                if self._process is not None:
+                    _LOGGER.warning("I/O worker exited (code %s), restarting", self._process.exitcode)
+                    self._kill()
+                    self.restart_count += 1
+                self._start()
+            
+            try:
+                self._conn.send((command, args, kwargs))
+                reply = self._conn.recv() if self._conn.poll(WORKER_CALL_TIMEOUT) else None
+            except (EOFError, OSError):
+                reply = None  # Worker died mid-command
+            if reply is None:
+                _LOGGER.error("I/O worker failed or stalled in %s, killing it", command)
+                self._kill()
+                self.restart_count += 1
+                raise ModbusIOException(f"I/O worker failed in {command}")
+            status, result, stats = reply
+        
+        self.client.update_stats(stats)
+        if status == "raise":
+            name, message = result
+            raise _EXCEPTIONS.get(name, ModbusException)(message)
+        return result
+    
+    def read_all_registers(self, initial_read: bool = False, poll_keys: frozenset[str] | None = None) -> dict:
+        """Poll in the worker and decode the published snapshot (runs in executor).
+        
+        Args:
+            poll_keys: Cache keys to poll (None = every register of the map)
+        """
+        started, self.word_order = self.call("poll", initial_read=initial_read, poll_keys=poll_keys)
+        tiers = (TIER_FAST, TIER_SLOW) if initial_read else (TIER_FAST,)
+        # Entries older than the poll belong to batches that failed this time
+        data, _ = self.snapshot.read(
+            lambda snapshot: decode_snapshot(self.register_map, snapshot, tiers, started)
+        )
+        return data
+    
+    def stop(self) -> None:
+        """Stop the worker process and remove the snapshot (runs in executor)."""
+        with self._lock:
+            if self._process is not None and self._process.is_alive():
+                try:
+                    self._conn.send(("stop", (), {}))
+                    self._process.join(10)
+                except (OSError, ValueError):
+                    pass
+            self._kill()
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+        try:
+            os.unlink(self.snapshot_path)
+        except FileNotFoundError:
+            pass
+
+
+class WorkerClient:
+    """ModbusConnection stand-in that forwards transactions to the I/O worker."""
+    
+    def __init__(self, worker: IOWorker) -> None:
+        """Initialize."""
+        self._worker = worker
+        self.name = "worker"
+        # Filled in when the worker starts
+        self.transport = None
+        self.framer = None
+        self.cost_model = None
+        self.needs_keepalive = False
+        self.latency = _LatencyView()
+        self.reconnect_count = 0
+        self.timeout_count = 0
+        self._connected = False
+    
+    def update_stats(self, stats: tuple) -> None:
+        """Mirror connection statistics of the worker (sent with every reply)."""
+        self._connected, self.reconnect_count, self.timeout_count, self.latency.srtt, self.latency.timeout = stats
+    
+    @property
+    def connected(self) -> bool:
+        """Return True if the worker connection was open after the last transaction."""
+        return self._connected
+    
+    def connect(self) -> bool:
+        """Connect (or reconnect) the worker connection."""
+        return self._worker.call("connect")
+    
+    def close(self) -> None:
+        """Close the worker connection (the process keeps running)."""
+        self._worker.call("close")
+    
+    def begin_cycle(self, budget: int = RETRY_BUDGET) -> None:
+        """Reset retry budget of the worker connection."""
+        self._worker.call("begin_cycle", budget)
+    
+    def read_holding_registers(self, address: int, count: int = 1, device_id: int = 1):
+        """Read holding registers (FC03)."""
+        return self._worker.call("read_holding_registers", address, count=count, device_id=device_id)
+    
+    def read_input_registers(self, address: int, count: int = 1, device_id: int = 1):
+        """Read input registers (FC04)."""
+        return self._worker.call("read_input_registers", address, count=count, device_id=device_id)
+    
+    def read_coils(self, address: int, count: int = 1, device_id: int = 1):
+        """Read coils (FC01)."""
+        return self._worker.call("read_coils", address, count=count, device_id=device_id)
+    
+    def read_discrete_inputs(self, address: int, count: int = 1, device_id: int = 1):
+        """Read discrete inputs (FC02)."""
+        return self._worker.call("read_discrete_inputs", address, count=count, device_id=device_id)
+    
+    def write_register(self, address: int, value: int, device_id: int = 1):
+        """Write single register (FC06)."""
+        return self._worker.call("write_register", address, value, device_id=device_id)
+    
+    def write_registers(self, address: int, values: list[int], device_id: int = 1):
+        """Write multiple registers (FC16)."""
+        return self._worker.call("write_registers", address, values, device_id=device_id)
+    
+    def write_coil(self, address: int, value: bool, device_id: int = 1):
+        """Write single coil (FC05)."""
+        return self._worker.call("write_coil", address, value, device_id=device_id)